@@ -0,0 +1 @@
+"""Benchmarks for Robot Framework Historic Parser."""
@@ -0,0 +1,153 @@
+"""Synthetic result files of configurable size for benchmarking the parser."""
+import json
+import os
+import random
+from xml.sax.saxutils import escape, quoteattr
+
+STATUSES = ("PASS", "PASS", "PASS", "PASS", "PASS", "PASS", "PASS", "FAIL", "FAIL", "SKIP")
+FAILURE = ("Expected status 200 but got 500: {'error': 'Internal Server Error', "
+           "'trace': 'Traceback (most recent call last): File \"app.py\", line 42'}")
+
+
+def suite_layout(tests, depth, width):
+    """Splits tests over width ** depth leaf suites, returning a nested layout
+
+    Every node is ``(name, children, test_count)``; only leaves hold tests.
+    """
+    leaves = width ** depth
+
+    def build(level, index, first_leaf):
+        name = "Suite %s-%s" % (level, index)
+        if level == depth:
+            count = tests // leaves + (1 if first_leaf < tests % leaves else 0)
+            return name, [], count
+        span = width ** (depth - level - 1)
+        children = [build(level + 1, child, first_leaf + child * span) for child in range(width)]
+        return name, children, 0
+
+    return build(0, 0, 0)
+
+
+def write_output_xml(path, tests, depth=2, width=4, keywords=3, schema=5, seed=1):
+    """Writes a Robot Framework output.xml with the given number of tests
+
+    ``schema`` 5 writes RF 7 style ``start``/``elapsed`` statuses, anything
+    lower writes RF 6 style ``starttime``/``endtime`` statuses.
+    """
+    rnd = random.Random(seed)
+    counter = [0]
+
+    def status(value, message=""):
+        if schema >= 5:
+            attrs = 'status="%s" start="2024-01-31T07:40:17.000000" elapsed="%.6f"' % (
+                value, rnd.random())
+        else:
+            attrs = 'status="%s" starttime="20240131 07:40:17.000" ' \
+                    'endtime="20240131 07:40:17.%03d"' % (value, rnd.randrange(1000))
+        if message:
+            return "<status %s>%s</status>\n" % (attrs, escape(message))
+        return "<status %s/>\n" % attrs
+
+    def write_suite(f, node, suite_id):
+        name, children, count = node
+        f.write('<suite id="%s" name=%s source="/tests">\n' % (suite_id, quoteattr(name)))
+        for index, child in enumerate(children):
+            write_suite(f, child, "%s-s%s" % (suite_id, index + 1))
+        for index in range(count):
+            counter[0] += 1
+            result = rnd.choice(STATUSES)
+            message = FAILURE if result == "FAIL" else "Skipped" if result == "SKIP" else ""
+            f.write('<test id="%s-t%s" name="Test Case %s" line="%s">\n'
+                    % (suite_id, index + 1, counter[0], index + 1))
+            for keyword in range(keywords):
+                f.write('<kw name="Keyword %s" owner="BuiltIn">\n' % keyword)
+                f.write('<msg time="2024-01-31T07:40:17.000000" level="INFO">%s</msg>\n'
+                        % escape("Step %s of test %s" % (keyword, counter[0])))
+                f.write("<arg>argument %s</arg>\n" % keyword)
+                f.write(status("PASS"))
+                f.write("</kw>\n")
+            f.write("<tag>tag-%s</tag>\n<tag>smoke</tag>\n" % (counter[0] % 10))
+            f.write(status(result, message))
+            f.write("</test>\n")
+        f.write(status("FAIL"))
+        f.write("</suite>\n")
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<robot generator="Robot 7.0 (benchmark)" rpa="false" schemaversion="%s">\n'
+                % schema)
+        write_suite(f, suite_layout(tests, depth, width), "s1")
+        f.write("<statistics>\n</statistics>\n<errors>\n</errors>\n</robot>\n")
+    return path
+
+
+def write_junit_xml(path, tests, suites=10, seed=1):
+    """Writes a JUnit report with the tests spread over several testsuites"""
+    rnd = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n')
+        for suite in range(suites):
+            count = tests // suites + (1 if suite < tests % suites else 0)
+            results = [rnd.choice(STATUSES) for _ in range(count)]
+            f.write('<testsuite name="suite_%s" tests="%s" failures="%s" errors="0" skipped="%s" '
+                    'time="%.3f">\n' % (suite, count, results.count("FAIL"),
+                                        results.count("SKIP"), count * 0.5))
+            for index, result in enumerate(results):
+                f.write('<testcase classname="tests.suite_%s" name="test_%s" time="0.5">'
+                        % (suite, index))
+                if result == "FAIL":
+                    f.write('<failure message=%s>%s</failure>' % (quoteattr(FAILURE),
+                                                                   escape(FAILURE)))
+                elif result == "SKIP":
+                    f.write('<skipped message="skipped"/>')
+                f.write("</testcase>\n")
+            f.write("</testsuite>\n")
+        f.write("</testsuites>\n")
+    return path
+
+
+def write_allure_summary(path, tests, seed=1):
+    """Writes an Allure summary.json for the given number of tests"""
+    rnd = random.Random(seed)
+    results = [rnd.choice(STATUSES) for _ in range(tests)]
+    summary = {"reportName": "Allure Report",
+               "statistic": {"failed": results.count("FAIL"), "broken": 0,
+                             "skipped": results.count("SKIP"), "passed": results.count("PASS"),
+                             "unknown": 0, "total": tests},
+               "time": {"duration": tests * 500}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f)
+    return path
+
+
+def write_allure_results(directory, tests, suites=10, seed=1):
+    """Writes an allure-results directory holding one result file per test"""
+    rnd = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    statuses = {"PASS": "passed", "FAIL": "failed", "SKIP": "skipped"}
+    for index in range(tests):
+        result = rnd.choice(STATUSES)
+        start = 1700000000000 + index * 500
+        data = {"uuid": "%032x" % index, "name": "test_%s" % index, "status": statuses[result],
+                "statusDetails": {"message": FAILURE} if result == "FAIL" else {},
+                "start": start, "stop": start + 500,
+                "labels": [{"name": "parentSuite", "value": "tests"},
+                           {"name": "suite", "value": "suite_%s" % (index % suites)},
+                           {"name": "tag", "value": "smoke"}]}
+        with open(os.path.join(directory, "%032x-result.json" % index), "w",
+                  encoding="utf-8") as f:
+            json.dump(data, f)
+    return directory
+
+
+def write_statistics_json(path, tests, seed=1):
+    """Writes a statistics report for the given number of tests"""
+    rnd = random.Random(seed)
+    results = [rnd.choice(STATUSES) for _ in range(tests)]
+    properties = [{"name": "PassedTestCount", "value": str(results.count("PASS"))},
+                  {"name": "FailedTestCount", "value": str(results.count("FAIL"))},
+                  {"name": "SkippedTestCount", "value": str(results.count("SKIP"))},
+                  {"name": "TotalTestCount", "value": str(tests)}]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"property": properties}, f)
+    return path
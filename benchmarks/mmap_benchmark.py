@@ -0,0 +1,91 @@
+"""Compares stream engine throughput of memory-mapped and buffered reads.
+
+Usage::
+
+    python -m benchmarks.mmap_benchmark --megabytes 1024
+
+Generates an output.xml and a JUnit report of about the given size, then parses
+each with the ``stream`` engine reading through file buffers and through a
+memory mapping. The first round warms the page cache, so the timings compare
+the reads rather than the disk.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.generators import write_junit_xml, write_output_xml
+from robotframework_historic_parser.junitparser import parse_junit_stream
+from robotframework_historic_parser.streamparser import parse_output_stream
+
+CALIBRATION_TESTS = 1000
+
+
+def write_sized(writer, path, megabytes):
+    """Writes a file of about the given size, scaling the test count from a small one"""
+    size = os.path.getsize(writer(path, CALIBRATION_TESTS))
+    tests = max(1, int(megabytes * 1024 * 1024 * CALIBRATION_TESTS / size))
+    return writer(path, tests)
+
+
+def time_parse(parse, path, use_mmap, rounds):
+    """Returns the best time of parsing the file in seconds"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        parse(path, use_mmap=use_mmap)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(args):
+    workdir = args.workdir or tempfile.mkdtemp(prefix="rfhistoric-mmap-")
+    files = (("output.xml", parse_output_stream, write_output_xml),
+             ("JUnit", parse_junit_stream, write_junit_xml))
+    rows = []
+    try:
+        for name, parse, writer in files:
+            path = write_sized(writer, os.path.join(workdir, name.lower() + ".xml"),
+                               args.megabytes)
+            megabytes = os.path.getsize(path) / (1024 * 1024)
+            parse(path)
+            buffered = time_parse(parse, path, "False", args.rounds)
+            mapped = time_parse(parse, path, "True", args.rounds)
+            rows.append({"file": name, "megabytes": megabytes,
+                         "buffered_mb_s": megabytes / buffered,
+                         "mmap_mb_s": megabytes / mapped})
+            os.remove(path)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return rows
+
+
+def print_results(rows):
+    print("{:<12}{:>10}{:>16}{:>14}{:>10}".format("file", "MB", "buffered MB/s", "mmap MB/s",
+                                                   "speedup"))
+    for row in rows:
+        print("{:<12}{:>10.1f}{:>16.1f}{:>14.1f}{:>9.2f}x".format(
+            row["file"], row["megabytes"], row["buffered_mb_s"], row["mmap_mb_s"],
+            row["mmap_mb_s"] / row["buffered_mb_s"] if row["buffered_mb_s"] else 0))
+
+
+def parse_options(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--megabytes', type=float, default=1024, help="Size of the generated files")
+    parser.add_argument('--rounds', type=int, default=3, help="Runs per variant, the best is kept")
+    parser.add_argument('--workdir', default=None,
+                        help="Directory for generated files, a temporary one by default")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    rows = run(parse_options(argv))
+    print_results(rows)
+    return rows
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Measures the per-test cost of building suite and test names from the result model.
+
+Usage::
+
+    python -m benchmarks.name_benchmark --tests 100000 --suites 100
+
+Compares ExecutionMetrics with the former name handling, which parsed the
+RF 7 ``str()`` repr of every test and its parent suite.
+"""
+import argparse
+import time
+
+from robot.result import TestSuite
+
+from robotframework_historic_parser.resultparser import ExecutionMetrics
+
+
+class LegacyExecutionMetrics(ExecutionMetrics):
+    """ExecutionMetrics naming tests the way the parser did before"""
+
+    def visit_test(self, test):
+        if self.full_suite_name == "True":
+            full_suite_name = test.longname.split("." + test.name)
+            name = str(full_suite_name[0]) + " - " + str(test)
+        else:
+            suite_name = str(test.parent)
+            suite_check_string = "robot.result.TestSuite(name='"
+            if suite_check_string in suite_name:
+                suite_name = suite_name.split(suite_check_string)[1].split("')")[0]
+            test_name = str(test)
+            test_check_string = "robot.result.TestCase(name='"
+            if test_check_string in test_name:
+                test_name = test_name.split(test_check_string)[1].split("')")[0]
+            name = suite_name + " - " + test_name
+
+        status = str(test.status)
+        self.suites[-1].add_status(status)
+        self.records.add_test(name, status, test.elapsedtime, str(test.message), test.tags)
+
+
+def build_result(tests, suites):
+    """Returns a result suite with the tests spread over child suites"""
+    root = TestSuite(name="Benchmark")
+    for index in range(suites):
+        suite = root.suites.create(name="Suite %d" % index)
+        for number in range(index, tests, suites):
+            suite.tests.create(name="Test %d" % number, status="PASS", tags=["smoke"])
+    return root
+
+
+def time_visit(metrics_class, result, full_suite_name, rounds):
+    """Returns the best time of visiting the result in seconds"""
+    best = None
+    for _ in range(rounds):
+        metrics = metrics_class(full_suite_name)
+        start = time.perf_counter()
+        result.visit(metrics)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(args):
+    result = build_result(args.tests, args.suites)
+    rows = []
+    for full_suite_name in ("False", "True"):
+        before = time_visit(LegacyExecutionMetrics, result, full_suite_name, args.rounds)
+        after = time_visit(ExecutionMetrics, result, full_suite_name, args.rounds)
+        rows.append({"fullsuitename": full_suite_name,
+                     "before_us": before * 1e6 / args.tests,
+                     "after_us": after * 1e6 / args.tests})
+    return rows
+
+
+def print_results(rows):
+    print("{:<14}{:>18}{:>18}{:>10}".format("fullsuitename", "before (us/test)",
+                                            "after (us/test)", "speedup"))
+    for row in rows:
+        print("{:<14}{:>18.2f}{:>18.2f}{:>9.1f}x".format(
+            row["fullsuitename"], row["before_us"], row["after_us"],
+            row["before_us"] / row["after_us"] if row["after_us"] else 0))
+
+
+def parse_options(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tests', type=int, default=100000, help="Tests in the result")
+    parser.add_argument('--suites', type=int, default=100, help="Suites the tests are spread over")
+    parser.add_argument('--rounds', type=int, default=3, help="Runs per variant, the best is kept")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    rows = run(parse_options(argv))
+    print_results(rows)
+    return rows
+
+
+if __name__ == '__main__':
+    main()
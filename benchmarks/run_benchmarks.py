@@ -0,0 +1,170 @@
+"""Measures parse time, peak memory and rows/sec of the parser on synthetic results.
+
+Usage::
+
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 100000
+
+Rows are written to an in-memory database of the SQLite storage backend,
+so no MySQL server is needed.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from argparse import Namespace
+from unittest.mock import patch
+
+from benchmarks.generators import (
+    write_output_xml,
+    write_junit_xml,
+    write_allure_results,
+    write_allure_summary,
+    write_statistics_json,
+)
+from robotframework_historic_parser import rfhistoricparser
+from robotframework_historic_parser.storage import SQLiteConnection
+
+
+def make_opts(filename, **kwargs):
+    options = dict(ignoreresult="False", path=os.path.dirname(filename),
+                   output=os.path.basename(filename), report_type="RF", engine="rf", workers=1,
+                   backend="sqlite", batch_size=rfhistoricparser.DEFAULT_BATCH_SIZE, host="localhost",
+                   port=3306, username="benchmark", password="benchmark",
+                   projectname="benchmark", executionname="benchmark", fullsuitename="False")
+    options.update(kwargs)
+    return Namespace(**options)
+
+
+def measure(function, *args):
+    """Returns the result, seconds and peak traced memory in MB of a call
+
+    The call runs twice: timed without tracemalloc, then traced for memory.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        gc.collect()
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        tracemalloc.start()
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def count_rows(database, table):
+    return database.connection.execute("SELECT COUNT(*) FROM " + table).fetchone()[0]
+
+
+def write_records(records, opts):
+    database = SQLiteConnection(":memory:", opts.projectname)
+    rfhistoricparser.write_execution_records(database, opts, records)
+    return count_rows(database, "TB_SUITE") + count_rows(database, "TB_TEST")
+
+
+def process_report(function, opts):
+    database = SQLiteConnection(":memory:", opts.projectname)
+    # report functions close their connection, keep it open to count the rows
+    with patch.object(rfhistoricparser, "connect_to_project_db", return_value=database), \
+            patch.object(database, "close"):
+        function(opts)
+    return sum(count_rows(database, table) for table in ("TB_EXECUTION", "TB_SUITE", "TB_TEST"))
+
+
+def benchmark_rf(workdir, size, args):
+    output = write_output_xml(os.path.join(workdir, "output_%s.xml" % size), size,
+                              depth=args.depth, width=args.width, keywords=args.keywords)
+    results = []
+    for engine in args.engines:
+        opts = make_opts(output, engine=engine)
+        records, elapsed, peak = measure(rfhistoricparser.parse_output_files, opts, [output])
+        rows = len(records.suites) + len(records.tests)
+        results.append(result_row("RF parse (%s)" % engine, size, elapsed, peak, rows))
+    rows, elapsed, peak = measure(write_records, records, opts)
+    results.append(result_row("RF write", size, elapsed, peak, rows))
+    return results
+
+
+def benchmark_reports(workdir, size, args):
+    junit = write_junit_xml(os.path.join(workdir, "junit_%s.xml" % size), size)
+    reports = (
+        ("JUnit", "JUnit", rfhistoricparser.process_junit_report, junit, "rf"),
+        ("JUnit (stream)", "JUnit", rfhistoricparser.process_junit_report, junit, "stream"),
+        ("Allure", "Allure", rfhistoricparser.process_allure_report,
+         write_allure_summary(os.path.join(workdir, "summary_%s.json" % size), size), "rf"),
+        ("Allure (results)", "Allure", rfhistoricparser.process_allure_report,
+         write_allure_results(os.path.join(workdir, "allure_results_%s" % size), size), "rf"),
+        ("Statistics", "Statistics", rfhistoricparser.process_statistics_report,
+         write_statistics_json(os.path.join(workdir, "statistics_%s.json" % size), size), "rf"),
+    )
+    results = []
+    for name, report_type, function, output, engine in reports:
+        if report_type.lower() not in args.report_types:
+            continue
+        opts = make_opts(output, report_type=report_type, output=output, engine=engine)
+        rows, elapsed, peak = measure(process_report, function, opts)
+        results.append(result_row(name, size, elapsed, peak, rows))
+    return results
+
+
+def result_row(name, size, elapsed, peak, rows):
+    return {"benchmark": name, "tests": size, "seconds": round(elapsed, 4),
+            "peak_mb": round(peak, 2), "rows": rows,
+            "rows_per_sec": round(rows / elapsed) if elapsed else 0}
+
+
+def run(args):
+    results = []
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        for size in args.sizes:
+            if "rf" in args.report_types:
+                results.extend(benchmark_rf(workdir, size, args))
+            results.extend(benchmark_reports(workdir, size, args))
+    return results
+
+
+def print_results(results):
+    print("%-22s %8s %10s %10s %8s %12s" % ("benchmark", "tests", "seconds", "peak MB",
+                                             "rows", "rows/sec"))
+    for row in results:
+        print("%-22s %8s %10.4f %10.2f %8s %12s" % (row["benchmark"], row["tests"],
+                                                      row["seconds"], row["peak_mb"],
+                                                      row["rows"], row["rows_per_sec"]))
+
+
+def parse_options(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Number of tests per generated result file")
+    parser.add_argument('--depth', type=int, default=2, help="Levels of nested suites")
+    parser.add_argument('--width', type=int, default=4, help="Child suites per suite")
+    parser.add_argument('--keywords', type=int, default=3, help="Keywords per test")
+    parser.add_argument('--engines', nargs='+', default=['rf', 'stream'],
+                        help="RF engines to benchmark")
+    parser.add_argument('--report-types', dest='report_types', type=str.lower, nargs='+',
+                        default=['rf', 'junit', 'allure', 'statistics'],
+                        help="Report types to benchmark")
+    parser.add_argument('--workdir', default=None,
+                        help="Directory for generated files, defaults to the system temp dir")
+    parser.add_argument('--json', dest='json_file', help="Also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_options(argv)
+    results = run(args)
+    print_results(results)
+    if args.json_file:
+        with open(args.json_file, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Parser of allure-results directories, reading the result file of every test."""
+import json
+import os
+
+from .records import ExecutionRecords, SuiteFrame, get_suite_status
+from .streamparser import normalize_tags
+
+RESULT_SUFFIX = "-result.json"
+# labels Allure builds its Suites tree from, outermost first
+SUITE_LABELS = ("parentSuite", "suite", "subSuite")
+DEFAULT_SUITE = "Allure"
+
+ALLURE_STATUSES = {"passed": "PASS", "failed": "FAIL", "broken": "FAIL"}
+
+
+def find_allure_results(directory):
+    """Method for listing the test result files of an allure-results directory in name order"""
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.endswith(RESULT_SUFFIX))
+
+
+def get_json_loads():
+    """Returns orjson.loads when it is installed, json.loads otherwise"""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads
+    return orjson.loads
+
+
+def read_allure_result(path, loads=json.loads):
+    """Reads the fields stored for one test from its result file
+
+    Returns ``(start, suite_path, name, status, elapsed_ms, message, tags)``,
+    or None for files that are not test results. Only this tuple outlives the
+    call, the decoded document is dropped right away.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        result = loads(data)
+    except ValueError as e:
+        # a run killed while writing leaves truncated files behind
+        print("WARNING: Skipping unreadable Allure result {}: {}".format(path, e))
+        return None
+    if not isinstance(result, dict) or "status" not in result:
+        return None
+    suites = {}
+    tags = []
+    for label in result.get("labels") or ():
+        name, value = label.get("name"), label.get("value")
+        if name in SUITE_LABELS and value:
+            suites[name] = value
+        elif name == "tag" and value:
+            tags.append(value)
+    suite_path = tuple(suites[name] for name in SUITE_LABELS if name in suites)
+    start = result.get("start") or 0
+    stop = result.get("stop") or start
+    details = result.get("statusDetails") or {}
+    return (start, suite_path or (DEFAULT_SUITE,), result.get("name") or "",
+            ALLURE_STATUSES.get(result["status"], "SKIP"), max(0, stop - start),
+            details.get("message") or "", normalize_tags(tags))
+
+
+class AllureResults:
+    """Groups test results into suites by their Allure suite labels
+
+    Tests are ordered by start time. A suite row is written for every suite
+    path holding tests, its elapsed time spans its first start to its last
+    stop, and the execution spans all of them.
+    """
+
+    def __init__(self, full_suite_name="False"):
+        self.full_suite_name = full_suite_name
+        self.records = ExecutionRecords()
+        self.suites = {}
+        self.spans = {}
+
+    def build(self, results):
+        results = sorted(result for result in results if result is not None)
+        for start, suite_path, name, status, elapsedtime, message, tags in results:
+            suite = self.get_suite(suite_path)
+            suite.add_status(status)
+            self.add_span(suite_path, start, start + elapsedtime)
+            self.add_span(None, start, start + elapsedtime)
+            suite_name = suite.longname if self.full_suite_name == "True" else suite.name
+            self.records.add_test(suite_name + " - " + name, status, elapsedtime, message, tags)
+        for suite_path, suite in self.suites.items():
+            first, last = self.spans[suite_path]
+            name = suite.longname if self.full_suite_name == "True" else suite.name
+            self.records.set_suite(suite.index, name, get_suite_status(suite), suite.total,
+                                   suite.passed, suite.failed, last - first, suite.skipped)
+        if self.spans:
+            first, last = self.spans[None]
+            self.records.elapsedtime = last - first
+            self.records.name = results[0][1][0]
+        return self.records
+
+    def get_suite(self, suite_path):
+        suite = self.suites.get(suite_path)
+        if suite is None:
+            suite = SuiteFrame(suite_path[-1], ".".join(suite_path))
+            suite.index = self.records.reserve_suite()
+            self.suites[suite_path] = suite
+        return suite
+
+    def add_span(self, key, start, stop):
+        first, last = self.spans.get(key, (start, stop))
+        self.spans[key] = (min(first, start), max(last, stop))
+
+
+def parse_allure_results(result_files, full_suite_name="False", workers=None):
+    """Method for reading allure result files concurrently into ExecutionRecords
+
+    Files are read and decoded on a thread pool, ``workers`` threads or the
+    ThreadPoolExecutor default, which overlaps the many small file reads.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from functools import partial
+    read = partial(read_allure_result, loads=get_json_loads())
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(read, result_files))
+    return AllureResults(full_suite_name).build(results)
@@ -0,0 +1,129 @@
+"""Bulk loading of suite and test rows with LOAD DATA LOCAL INFILE."""
+import os
+import re
+import shutil
+import tempfile
+import weakref
+
+from .rfhistoricparser import BatchWriter
+
+# errors of a server or client that does not allow loading local files
+LOCAL_INFILE_ERRORS = (1148, 2068, 3948)
+
+INSERT_PATTERN = re.compile(r"INSERT INTO (\S+) \(([^)]*)\) VALUES")
+
+LOAD_DATA_SQL = "LOAD DATA LOCAL INFILE %s INTO TABLE {0} CHARACTER SET utf8mb4 " \
+                "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({1})"
+
+ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"})
+UNESCAPES = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r", "0": "\0"}
+
+
+class BulkLoadWriter:
+    """Writes rows to tab separated files and loads each one with a single statement
+
+    Rows go to one temporary file per insert statement as they arrive, so
+    memory stays flat however large the execution is, and ``flush`` loads the
+    files with ``LOAD DATA LOCAL INFILE``, which skips parsing an INSERT per
+    batch. When the server refuses local files the rows already written are
+    read back and, like every later row, inserted by a BatchWriter instead.
+    """
+
+    def __init__(self, db, batch_size, prepared=False):
+        self.db = db
+        self.batch_size = batch_size
+        self.prepared = prepared
+        self.fallback = None
+        self.directory = tempfile.mkdtemp(prefix="rfhistoric-")
+        # an aborted writer is never closed, its files go when it is collected
+        self.cleanup = weakref.finalize(self, shutil.rmtree, self.directory, True)
+        self.files = {}
+
+    def insert(self, sql, val):
+        if self.fallback is not None:
+            self.fallback.insert(sql, val)
+            return
+        if sql not in self.files:
+            path = os.path.join(self.directory, "rows%d.tsv" % len(self.files))
+            self.files[sql] = (path, open(path, "w", encoding="utf-8", newline="\n"))
+        self.files[sql][1].write("\t".join([format_field(value) for value in val]) + "\n")
+
+    def flush(self):
+        files, self.files = self.files, {}
+        for sql, (path, rows_file) in files.items():
+            rows_file.close()
+            try:
+                if self.fallback is None:
+                    self.load(sql, path)
+                else:
+                    self.insert_rows(sql, path)
+            finally:
+                os.unlink(path)
+        if self.fallback is not None:
+            self.fallback.flush()
+
+    def load(self, sql, path):
+        table, columns = INSERT_PATTERN.match(sql).groups()
+        cursor_obj = self.db.cursor()
+        try:
+            cursor_obj.execute(LOAD_DATA_SQL.format(table, columns), (path,))
+        except Exception as e:
+            if getattr(e, 'errno', None) not in LOCAL_INFILE_ERRORS:
+                raise
+            print("INFO: LOAD DATA LOCAL INFILE is not allowed ({}), inserting rows in "
+                  "batches".format(e))
+            self.fallback = BatchWriter(self.db, self.batch_size, self.prepared)
+            self.insert_rows(sql, path)
+        finally:
+            cursor_obj.close()
+
+    def insert_rows(self, sql, path):
+        with open(path, "r", encoding="utf-8", newline="\n") as rows_file:
+            for line in rows_file:
+                self.fallback.insert(sql, tuple(parse_field(field)
+                                                for field in line[:-1].split("\t")))
+
+    def close(self):
+        try:
+            self.flush()
+            if self.fallback is not None:
+                self.fallback.close()
+        finally:
+            for _, rows_file in self.files.values():
+                rows_file.close()
+            self.cleanup()
+
+
+def format_field(value):
+    """Formats a value for LOAD DATA, escaping the characters it treats specially"""
+    if value is None:
+        return "\\N"
+    return str(value).translate(ESCAPES)
+
+
+def parse_field(field):
+    """Reads back a field written by format_field"""
+    if field == "\\N":
+        return None
+    if "\\" not in field:
+        return field
+    return re.sub(r"\\(.)", lambda match: UNESCAPES.get(match.group(1), match.group(1)), field)
+
+
+def probe_local_infile(mydb):
+    """Method for checking whether the server accepts LOAD DATA LOCAL INFILE"""
+    cursor_obj = mydb.cursor()
+    try:
+        cursor_obj.execute("SELECT @@GLOBAL.local_infile;")
+        row = cursor_obj.fetchone()
+    finally:
+        cursor_obj.close()
+    return bool(row and int(row[0]))
+
+
+def create_bulk_writer(mydb, batch_size, prepared=False):
+    """Method for creating a BulkLoadWriter, or a BatchWriter when the server disallows it"""
+    if not probe_local_infile(mydb):
+        print("INFO: local_infile is disabled on the server, inserting rows in batches")
+        return BatchWriter(mydb, batch_size, prepared)
+    return BulkLoadWriter(mydb, batch_size, prepared)
@@ -0,0 +1,91 @@
+"""On-disk cache of parsed execution records, shared by ingests of the same files."""
+import hashlib
+import json
+import os
+import tempfile
+
+from .records import ExecutionRecords
+
+# bump when the records or the cache file layout change
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".jsonl"
+
+
+class ParseCache:
+    """Directory of ExecutionRecords stored as JSON lines, one file per parse
+
+    The first line holds the execution name and elapsed time, every other
+    line a suite row ``["S", ...]`` or a test row ``["T", ...]``. Reading a
+    file refreshes its modification time and the least recently used files
+    are removed once the directory grows beyond ``max_bytes``.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(content_hash, engine, full_suite_name):
+        """Returns the cache key of output files parsed with the given options"""
+        options = json.dumps([CACHE_VERSION, content_hash, engine, full_suite_name])
+        return hashlib.sha256(options.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def load(self, key):
+        """Returns the cached ExecutionRecords, or None when they are not cached"""
+        path = self.path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                records = ExecutionRecords(header["name"], header["elapsedtime"])
+                for line in f:
+                    row = json.loads(line)
+                    if row[0] == "S":
+                        records.suites.append(tuple(row[1:]))
+                    else:
+                        records.tests.append(tuple(row[1:5]) + (tuple(row[5]),))
+            os.utime(path)
+        except (OSError, ValueError, KeyError, IndexError):
+            # missing, evicted meanwhile or unreadable, the files are parsed again
+            return None
+        return records
+
+    def store(self, key, records):
+        """Writes records to the cache, then evicts the least recently used files"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"name": records.name, "elapsedtime": records.elapsedtime}))
+                f.write("\n")
+                for suite in records.suites:
+                    f.write(json.dumps(("S",) + suite))
+                    f.write("\n")
+                for test in records.tests:
+                    f.write(json.dumps(("T",) + test))
+                    f.write("\n")
+            # concurrent ingests of the same files write the same content
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(CACHE_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
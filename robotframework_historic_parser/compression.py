@@ -0,0 +1,39 @@
+"""Reading of compressed result files without inflating them on disk."""
+import gzip
+import lzma
+
+COMPRESSED_SUFFIXES = (".gz", ".xz", ".zst")
+
+
+def open_input(name):
+    """Method for opening a result file for binary reading
+
+    Files ending with ``.gz``, ``.xz`` or ``.zst`` are decompressed while they
+    are read, so parsers consume them chunk by chunk. Reading ``.zst`` files
+    requires the zstandard package.
+    """
+    if name.endswith(".gz"):
+        return gzip.open(name, "rb")
+    if name.endswith(".xz"):
+        return lzma.open(name, "rb")
+    if name.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            exit("reading .zst files requires the zstandard package: pip install zstandard")
+        # zstd -T and pzstd write several frames, which are read as one stream
+        return zstandard.ZstdDecompressor().stream_reader(open(name, "rb"),
+                                                          read_across_frames=True)
+    return open(name, "rb")
+
+
+def is_compressed(name):
+    return name.endswith(COMPRESSED_SUFFIXES)
+
+
+def get_content_name(name):
+    """Returns the name without its compression suffix, whose suffix tells the content type"""
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
@@ -0,0 +1,157 @@
+"""Live ingestion of an output.xml that Robot Framework is still writing."""
+import datetime
+import os
+import time
+import xml.etree.ElementTree as ET
+
+from .records import ExecutionRecords, SuiteCounts
+from .rfhistoricparser import (
+    DEFAULT_FOLLOW_INTERVAL,
+    commit_and_close_db,
+    create_batch_writer,
+    get_elapsed_minutes,
+    insert_provisional_execution,
+    rollback_and_close_db,
+    update_execution_table,
+    update_project_table,
+    write_suite_rows,
+    write_test_rows,
+)
+from .interning import create_interner
+from .sanitizer import create_message_sanitizer
+from .streamparser import OutputStreamParser
+
+FOLLOW_CHUNK_SIZE = 1024 * 1024
+
+
+class FollowRecords(ExecutionRecords):
+    """ExecutionRecords holding only the rows that have not been written yet
+
+    Suite rows are written when their suite ends, so they are stored in end
+    order rather than in the start order of a regular ingestion.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.counts = SuiteCounts()
+        self.new_suites = []
+        self.new_tests = []
+
+    def set_suite(self, index, name, status, total, passed, failed, elapsedtime, skipped):
+        super().set_suite(index, name, status, total, passed, failed, elapsedtime, skipped)
+        self.new_suites.append(self.suites[index])
+
+    def add_test(self, name, status, elapsedtime, message, tags):
+        self.counts.add_status(status)
+        self.new_tests.append((name, status, elapsedtime, message, tuple(tags)))
+
+    def test_totals(self):
+        return self.counts.total, self.counts.passed, self.counts.failed, self.counts.skipped
+
+    def take_rows(self):
+        """Returns and forgets the suite and test rows added since the last call"""
+        suites, tests = self.new_suites, self.new_tests
+        self.new_suites, self.new_tests = [], []
+        return suites, tests
+
+
+class OutputFollower:
+    """Tails a growing output.xml and writes every completed test right away
+
+    The execution is inserted and committed up front, then each poll commits
+    the tests and suites closed since the previous one together with the
+    totals so far. TB_PROJECT counts the execution only once it is finalised,
+    when ``</robot>`` is written or nothing was appended for ``timeout``
+    seconds.
+    """
+
+    def __init__(self, mydb, opts, output_name):
+        self.mydb = mydb
+        self.opts = opts
+        self.output_name = output_name
+        self.interval = float(getattr(opts, 'follow_interval', DEFAULT_FOLLOW_INTERVAL))
+        self.timeout = float(getattr(opts, 'follow_timeout', 0) or 0)
+        self.sanitize = create_message_sanitizer(opts)
+        self.records = FollowRecords()
+        self.parser = OutputStreamParser(opts.fullsuitename, self.records)
+        self.xml = ET.XMLPullParser(events=("start", "end"))
+        self.result_id = None
+        self.writer = None
+        self.interner = None
+        self.complete = False
+
+    def run(self):
+        try:
+            self.interner = create_interner(self.mydb, self.opts)
+            self.result_id = insert_provisional_execution(self.mydb, self.opts.executionname)
+            self.mydb.commit()
+            self.writer = create_batch_writer(self.mydb, self.opts)
+            self.follow()
+            self.finalise()
+        except BaseException:
+            rollback_and_close_db(self.mydb)
+            raise
+        commit_and_close_db(self.mydb)
+        return self.result_id
+
+    def follow(self):
+        """Reads the output as it grows until the root element is closed"""
+        idle_since = time.monotonic()
+        source = None
+        try:
+            while not self.complete:
+                if source is None and os.path.exists(self.output_name):
+                    source = open(self.output_name, "rb")
+                chunk = source.read(FOLLOW_CHUNK_SIZE) if source else b""
+                if chunk:
+                    idle_since = time.monotonic()
+                    self.xml.feed(chunk)
+                    self.parser.handle_events(self.read_events())
+                    self.write_rows()
+                    continue
+                if self.timeout and time.monotonic() - idle_since >= self.timeout:
+                    print("WARNING: {} did not grow for {} seconds, finalising the execution "
+                          "with the tests seen so far".format(self.output_name, self.timeout))
+                    return
+                time.sleep(self.interval)
+        finally:
+            if source:
+                source.close()
+
+    def read_events(self):
+        for event, elem in self.xml.read_events():
+            yield event, elem
+            if event == "end" and elem.tag == "robot":
+                self.complete = True
+
+    def write_rows(self):
+        """Commits the rows closed since the previous call and the totals so far"""
+        suites, tests = self.records.take_rows()
+        if not suites and not tests:
+            return
+        write_test_rows(self.writer, self.result_id, tests, self.sanitize, self.interner)
+        write_suite_rows(self.writer, self.result_id, suites)
+        self.writer.flush()
+        self.update_totals()
+        self.mydb.commit()
+        print("INFO: Captured {} tests".format(self.records.counts.total))
+
+    def update_totals(self):
+        stotal, spass, sfail, sskip = self.records.suite_totals()
+        total, passed, failed, skipped = self.records.test_totals()
+        update_execution_table(self.mydb, self.result_id, total, passed, failed,
+                               get_elapsed_minutes(self.records.elapsedtime), stotal, spass,
+                               sfail, skipped, sskip)
+        return total, passed
+
+    def finalise(self):
+        self.write_rows()
+        self.writer.close()
+        total, passed = self.update_totals()
+        update_project_table(self.mydb, datetime.datetime.utcnow(), passed, total,
+                             self.opts.projectname)
+
+
+def follow_output(mydb, opts, output_name):
+    """Method for ingesting an output.xml while the execution is still running"""
+    return OutputFollower(mydb, opts, output_name).run()
@@ -0,0 +1,58 @@
+"""Discovery of the result files named by --inputpath and --output."""
+import glob
+import os
+
+from .compression import COMPRESSED_SUFFIXES
+
+GLOB_CHARACTERS = "*?["
+
+# files a directory named as output contributes, searched recursively and compressed
+# ones included; an Allure directory is an allure-results directory read as a whole
+DIRECTORY_PATTERNS = {
+    "rf": ("output*.xml", "output*.json"),
+    "junit": ("*.xml",),
+    "statistics": ("*.json",),
+}
+
+
+def discover_inputs(path, output, report_type="RF"):
+    """Method for resolving the comma separated output names to result files
+
+    Names are relative to ``path`` unless absolute. Globs match in ``path``
+    rather than in the working directory and ``**`` matches any depth of
+    directories. Directories are searched recursively for the files of the
+    report type. Names that do not exist are kept, so they are reported as
+    missing.
+    """
+    report_type = report_type.lower()
+    names = []
+    for entry in output.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name = os.path.join(path, entry)
+        if any(character in entry for character in GLOB_CHARACTERS):
+            names.extend(sorted(match for match in glob.glob(name, recursive=True)
+                                if is_input(match, report_type)))
+        elif report_type in DIRECTORY_PATTERNS and os.path.isdir(name):
+            names.extend(find_directory_inputs(name, DIRECTORY_PATTERNS[report_type]))
+        else:
+            names.append(name)
+    # the same file named twice would be counted twice
+    return list(dict.fromkeys(names))
+
+
+def is_input(name, report_type):
+    if report_type == "allure":
+        return os.path.isfile(name) or os.path.isdir(name)
+    return os.path.isfile(name)
+
+
+def find_directory_inputs(directory, patterns):
+    """Returns the files below directory matching any of the patterns, in path order"""
+    names = set()
+    for pattern in patterns:
+        for suffix in ("",) + COMPRESSED_SUFFIXES:
+            names.update(name for name in glob.glob(os.path.join(directory, "**", pattern + suffix),
+                                                    recursive=True) if os.path.isfile(name))
+    return sorted(names)
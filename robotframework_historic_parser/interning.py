@@ -0,0 +1,112 @@
+"""Normalized storage of test messages and tags, each distinct value stored once."""
+import hashlib
+
+# hashes looked up per SELECT, keeping the IN list well below placeholder limits
+LOOKUP_SIZE = 1000
+
+ERROR_TABLE_SQL = "CREATE TABLE IF NOT EXISTS TB_ERROR (Error_Id INTEGER NOT NULL AUTO_INCREMENT PRIMARY KEY, " \
+                  "Error_Hash CHAR(64) NOT NULL UNIQUE, Error_Text LONGTEXT);"
+
+TAG_TABLE_SQL = "CREATE TABLE IF NOT EXISTS TB_TAG (Tag_Id INTEGER NOT NULL AUTO_INCREMENT PRIMARY KEY, " \
+                "Tag_Hash CHAR(64) NOT NULL UNIQUE, Tag_Text LONGTEXT);"
+
+TEST_REFERENCE_COLUMNS = ("Test_Error_Id", "Test_Tag_Id")
+
+UNKNOWN_COLUMN_ERRNO = 1054  # ER_BAD_FIELD_ERROR
+
+
+class InternTable:
+    """Lookup table of distinct texts keyed by their sha256, with the ids known in this run
+
+    Texts seen before in the run cost a dict lookup. New ones are looked up
+    by hash and the missing ones inserted, a few statements per batch of tests
+    rather than per test. ``INSERT IGNORE`` lets concurrent uploads add the
+    same text, the second one then reads the id of the first. That read has to
+    lock, a plain one would only see the snapshot taken by the first lookup.
+    """
+
+    def __init__(self, table, prefix):
+        self.select_sql = "SELECT {0}_Hash, {0}_Id FROM {1} WHERE {0}_Hash IN ".format(prefix, table)
+        self.insert_sql = "INSERT IGNORE INTO {1} ({0}_Hash, {0}_Text) VALUES (%s, %s)".format(
+            prefix, table)
+        self.ids = {}
+
+    def __getitem__(self, text):
+        return self.ids[text]
+
+    def resolve(self, db, texts):
+        """Makes the ids of texts available, storing the ones not in the table yet"""
+        new = {}
+        for text in texts:
+            if text not in self.ids and text not in new:
+                new[text] = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if not new:
+            return
+        cursor_obj = db.cursor()
+        found = self.select(cursor_obj, list(new.values()))
+        missing = [(text_hash, text) for text, text_hash in new.items() if text_hash not in found]
+        if missing:
+            cursor_obj.executemany(self.insert_sql, missing)
+            found.update(self.select(cursor_obj, [text_hash for text_hash, _ in missing],
+                                     locking=True))
+        cursor_obj.close()
+        for text, text_hash in new.items():
+            self.ids[text] = found[text_hash]
+
+    def select(self, cursor_obj, hashes, locking=False):
+        # LOCK IN SHARE MODE rather than FOR SHARE, which MySQL 5.7 and MariaDB lack
+        suffix = ") LOCK IN SHARE MODE;" if locking else ");"
+        found = {}
+        for start in range(0, len(hashes), LOOKUP_SIZE):
+            chunk = hashes[start:start + LOOKUP_SIZE]
+            cursor_obj.execute(self.select_sql + "(" + ", ".join(["%s"] * len(chunk)) + suffix, chunk)
+            found.update(cursor_obj.fetchall())
+        return found
+
+
+class MessageInterner:
+    """Ids of the distinct messages in TB_ERROR and tag sets in TB_TAG of one run"""
+
+    def __init__(self, db):
+        self.db = db
+        self.errors = InternTable("TB_ERROR", "Error")
+        self.tags = InternTable("TB_TAG", "Tag")
+
+    def resolve(self, messages, tags):
+        self.errors.resolve(self.db, messages)
+        self.tags.resolve(self.db, tags)
+
+
+def prepare_normalized_tables(mydb):
+    """Method for creating the lookup tables and TB_TEST reference columns when missing
+
+    Schema changes end a MySQL transaction, so this runs and commits before an
+    execution is written.
+    """
+    cursor_obj = mydb.cursor()
+    cursor_obj.execute(ERROR_TABLE_SQL)
+    cursor_obj.execute(TAG_TABLE_SQL)
+    for column in TEST_REFERENCE_COLUMNS:
+        try:
+            cursor_obj.execute("SELECT " + column + " FROM TB_TEST LIMIT 0;")
+            cursor_obj.fetchall()
+        except Exception as e:
+            if not is_missing_column(e):
+                raise
+            # first normalized ingestion into this project database
+            cursor_obj.execute("ALTER TABLE TB_TEST ADD COLUMN " + column + " INTEGER;")
+    mydb.commit()
+
+
+def is_missing_column(error):
+    """Returns whether a statement failed because a column it reads does not exist"""
+    # sqlite3 reports a missing column by its message only
+    return getattr(error, 'errno', None) == UNKNOWN_COLUMN_ERRNO or "no such column" in str(error)
+
+
+def create_interner(mydb, opts):
+    """Method for creating the MessageInterner of a normalized ingestion, None otherwise"""
+    if getattr(opts, 'normalize', "False") != "True":
+        return None
+    prepare_normalized_tables(mydb)
+    return MessageInterner(mydb)
@@ -0,0 +1,143 @@
+"""Incremental JUnit XML parser emitting a row per testsuite and testcase."""
+import xml.etree.ElementTree as ET
+
+from .compression import is_compressed, open_input
+from .mmapreader import iterparse_mapped
+from .records import ExecutionRecords, SuiteFrame, get_suite_status
+
+# children of a testcase that decide its status, in order of precedence
+FAILED_RESULTS = ("failure", "error")
+SKIPPED_RESULTS = ("skipped",)
+
+
+class JUnitStreamParser:
+    """Parses JUnit XML with iterparse, emitting suite and test rows
+
+    Every ``<testsuite>`` with test cases becomes a suite row, nested ones
+    included, and counts are taken from the test cases rather than from the
+    suite attributes, so reports aggregating many suites get correct totals.
+    Test cases are dropped once closed, so memory does not grow with the size
+    of the report.
+    """
+
+    def __init__(self, full_suite_name="False", records=None):
+        self.full_suite_name = full_suite_name
+        self.records = ExecutionRecords() if records is None else records
+        self.suites = []
+        self.stack = []
+        self.root_elapsedtime = None
+        self.test_status = "PASS"
+        self.test_message = ""
+
+    def parse(self, source):
+        """Parses a file name or file object and returns ExecutionRecords"""
+        return self.parse_events(ET.iterparse(source, events=("start", "end")))
+
+    def parse_events(self, events):
+        """Parses the start and end events of a whole file and returns ExecutionRecords"""
+        self.stack = []
+        self.handle_events(events)
+        if self.root_elapsedtime is not None:
+            self.records.elapsedtime = self.root_elapsedtime
+        return self.records
+
+    def handle_events(self, events):
+        stack = self.stack
+        for event, elem in events:
+            if event == "start":
+                parent = stack[-1].tag if stack else None
+                if elem.tag == "testsuite":
+                    self.start_suite(elem)
+                elif elem.tag == "testcase" and parent == "testsuite":
+                    self.start_test()
+                elif elem.tag == "testsuites" and parent is None:
+                    self.records.name = elem.get("name", "")
+                stack.append(elem)
+                continue
+            stack.pop()
+            parent = stack[-1].tag if stack else None
+            if parent == "testcase":
+                self.end_test_result(elem)
+            elif elem.tag == "testcase" and parent == "testsuite":
+                self.end_test(elem)
+            elif elem.tag == "testsuite":
+                self.end_suite(elem)
+            elif elem.tag == "testsuites" and parent is None and elem.get("time"):
+                self.root_elapsedtime = get_time_millis(elem)
+            # earlier siblings have been handled already, so drop them all
+            elem.clear()
+            if stack:
+                del stack[-1][:]
+
+    def start_suite(self, elem):
+        name = elem.get("name", "")
+        parent = self.suites[-1] if self.suites else None
+        longname = parent.longname + "." + name if parent else name
+        if not self.records.name:
+            self.records.name = name
+        self.suites.append(SuiteFrame(name, longname))
+
+    def end_suite(self, elem):
+        suite = self.suites.pop()
+        if elem.get("time"):
+            suite.elapsedtime = get_time_millis(elem)
+        if suite.index is not None:
+            name = suite.longname if self.full_suite_name == "True" else suite.name
+            self.records.set_suite(suite.index, name, get_suite_status(suite), suite.total,
+                                   suite.passed, suite.failed, suite.elapsedtime, suite.skipped)
+        if self.suites:
+            self.suites[-1].add_counts(suite)
+            self.suites[-1].elapsedtime += suite.elapsedtime
+        else:
+            self.records.elapsedtime += suite.elapsedtime
+
+    def start_test(self):
+        self.test_status = "PASS"
+        self.test_message = ""
+
+    def end_test_result(self, elem):
+        if elem.tag in FAILED_RESULTS:
+            status = "FAIL"
+        elif elem.tag in SKIPPED_RESULTS and self.test_status != "FAIL":
+            status = "SKIP"
+        else:
+            return
+        if self.test_status != status:
+            self.test_status = status
+            self.test_message = elem.get("message") or elem.text or ""
+
+    def end_test(self, elem):
+        suite = self.suites[-1]
+        if suite.index is None:
+            suite.index = self.records.reserve_suite()
+        suite.add_status(self.test_status)
+        elapsedtime = get_time_millis(elem)
+        suite.elapsedtime += elapsedtime
+        test_name = elem.get("name", "")
+        if elem.get("classname"):
+            test_name = elem.get("classname") + "." + test_name
+        if self.full_suite_name == "True":
+            name = suite.longname + " - " + test_name
+        else:
+            name = suite.name + " - " + test_name
+        self.records.add_test(name, self.test_status, elapsedtime, self.test_message, ())
+
+
+def parse_junit_stream(source, full_suite_name="False", records=None, use_mmap="False"):
+    """Method for parsing a JUnit report into suite and test rows"""
+    parser = JUnitStreamParser(full_suite_name, records)
+    if isinstance(source, str):
+        if use_mmap == "True" and not is_compressed(source):
+            return parser.parse_events(iterparse_mapped(source))
+        # compressed files are inflated while they are parsed
+        with open_input(source) as f:
+            return parser.parse(f)
+    return parser.parse(source)
+
+
+def get_time_millis(elem):
+    """Returns the time attribute in seconds of a JUnit element as milliseconds"""
+    try:
+        return round(float(elem.get("time", "0").replace(",", "")) * 1000)
+    except ValueError:
+        return 0
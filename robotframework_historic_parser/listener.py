@@ -0,0 +1,133 @@
+"""Robot Framework listener writing results to Historic while tests run."""
+import datetime
+from argparse import Namespace
+
+from .pipeline import PipelineRecords, PipelineWriter
+from .resultparser import ExecutionMetrics
+from .rfhistoricparser import (
+    DEFAULT_BATCH_SIZE,
+    commit_and_close_db,
+    connect_to_project_db,
+    create_batch_writer,
+    get_elapsed_minutes,
+    insert_provisional_execution,
+    rollback_and_close_db,
+    update_execution_table,
+    update_project_table,
+    write_suite_rows,
+)
+from .interning import create_interner
+from .sanitizer import create_message_sanitizer
+
+
+class HistoricListener:
+    """Listener version 3 that replaces parsing output.xml after the run
+
+    Usage::
+
+        robot --listener robotframework_historic_parser.listener.HistoricListener:projectname=demo:executionname=nightly tests
+
+    Arguments are the options of the parser: ``host``, ``port``, ``username``,
+    ``password``, ``fullsuitename``, ``backend``, ``database_file``,
+    ``batch_size``, ``max_error_length``, ``keep_unicode``, ``normalize`` and
+    ``bulk_load``. Test rows are the ones ExecutionMetrics produces from
+    output.xml and are inserted on a background thread as tests end. The
+    execution is committed as one transaction when the top level suite ends,
+    so an interrupted run leaves nothing behind.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, projectname, executionname, host="localhost", port=3306,
+                 username="superuser", password="passw0rd", fullsuitename="False",
+                 backend="mysql", database_file=None, batch_size=DEFAULT_BATCH_SIZE,
+                 max_error_length=0, keep_unicode="False", normalize="False",
+                 bulk_load="False"):
+        self.opts = Namespace(projectname=projectname, executionname=executionname, host=host,
+                              port=int(port), username=username, password=password,
+                              fullsuitename=fullsuitename, backend=backend.lower(),
+                              database_file=database_file, batch_size=int(batch_size),
+                              max_error_length=int(max_error_length), keep_unicode=keep_unicode,
+                              normalize=normalize, bulk_load=bulk_load)
+        self.mydb = None
+        self.result_id = None
+        self.writer = None
+        self.metrics = None
+        self.disabled = False
+
+    def start_suite(self, data, result):
+        if self.disabled:
+            return
+        if self.metrics is None and not self.start_execution():
+            return
+        self.metrics.open_suite(result, bool(data.tests))
+
+    def end_test(self, data, result):
+        if self.metrics is not None:
+            self.guard(self.metrics.visit_test, result)
+
+    def end_suite(self, data, result):
+        if self.metrics is None:
+            return
+        self.guard(self.metrics.end_suite, result)
+        if self.metrics is not None and not self.metrics.suites:
+            self.guard(self.finish_execution)
+
+    def close(self):
+        # the top level suite never ended, nothing of the run is kept
+        if self.metrics is not None:
+            self.abort()
+
+    def start_execution(self):
+        try:
+            self.mydb = connect_to_project_db(self.opts)
+            interner = create_interner(self.mydb, self.opts)
+            self.mydb.start_transaction()
+            self.result_id = insert_provisional_execution(self.mydb, self.opts.executionname)
+            self.writer = PipelineWriter(create_batch_writer(self.mydb, self.opts),
+                                         self.result_id, self.opts.batch_size,
+                                         create_message_sanitizer(self.opts), interner)
+            self.writer.start()
+            self.metrics = ExecutionMetrics(self.opts.fullsuitename, PipelineRecords(self.writer))
+            return True
+        except Exception as e:
+            print("WARNING: Robot Framework Historic listener disabled: {}".format(e))
+            self.disabled = True
+            if self.mydb is not None:
+                mydb, self.mydb = self.mydb, None
+                rollback_and_close_db(mydb)
+            return False
+
+    def finish_execution(self):
+        records = self.metrics.records
+        self.writer.finish()
+        stotal, spass, sfail, sskip = records.suite_totals()
+        total, passed, failed, skipped = records.test_totals()
+        batch_writer = create_batch_writer(self.mydb, self.opts)
+        write_suite_rows(batch_writer, self.result_id, records.suites)
+        batch_writer.close()
+        update_execution_table(self.mydb, self.result_id, total, passed, failed,
+                               get_elapsed_minutes(records.elapsedtime), stotal, spass, sfail,
+                               skipped, sskip)
+        update_project_table(self.mydb, datetime.datetime.utcnow(), passed, total,
+                             self.opts.projectname)
+        self.metrics = None
+        mydb, self.mydb = self.mydb, None
+        commit_and_close_db(mydb)
+
+    def guard(self, function, *args):
+        """Runs a listener step, a database failure must not fail the tests"""
+        try:
+            function(*args)
+        except Exception as e:
+            print("WARNING: Robot Framework Historic listener disabled: {}".format(e))
+            self.abort()
+
+    def abort(self):
+        self.metrics = None
+        self.disabled = True
+        if self.writer is not None and self.writer.is_alive():
+            self.writer.abort()
+        if self.mydb is not None:
+            mydb, self.mydb = self.mydb, None
+            rollback_and_close_db(mydb)
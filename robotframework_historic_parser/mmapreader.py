@@ -0,0 +1,34 @@
+"""Feeding the incremental XML parsers from memory-mapped result files."""
+import mmap
+import os
+import xml.etree.ElementTree as ET
+
+# larger slices build more elements before the parsers get to clear them, which
+# costs more than the extra feed calls save
+MMAP_CHUNK_SIZE = 64 * 1024
+
+
+def iterparse_mapped(filename, chunk_size=MMAP_CHUNK_SIZE):
+    """Method for generating the start and end events of a file read through a memory mapping
+
+    Slices of the mapping are handed to the parser without copying them into
+    read buffers first. The events match those of ``ET.iterparse``, so the
+    stream parsers handle either.
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # an empty file cannot be mapped, iterparse reports it as invalid XML
+            yield from ET.iterparse(f, events=("start", "end"))
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            if hasattr(mapping, "madvise"):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+            parser = ET.XMLPullParser(events=("start", "end"))
+            # views must be released before the mapping can be closed
+            with memoryview(mapping) as view:
+                for offset in range(0, len(view), chunk_size):
+                    with view[offset:offset + chunk_size] as chunk:
+                        parser.feed(chunk)
+                    yield from parser.read_events()
+            parser.close()
+            yield from parser.read_events()
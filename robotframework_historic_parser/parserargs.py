@@ -1,11 +1,20 @@
 import os
 import argparse
-from .rfhistoricparser import rfhistoric_parser
+from .rfhistoricparser import (rfhistoric_parser, DEFAULT_BATCH_SIZE, DEFAULT_CACHE_SIZE,
+                               DEFAULT_FOLLOW_INTERVAL, DEFAULT_POOL_SIZE, DEFAULT_QUEUE_SIZE)
 
 
 def parse_options():
     parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
+    parser.add_argument(
+        'command',
+        nargs='?',
+        choices=['parse', 'serve'],
+        default='parse',
+        help="'parse' ingests the given results once, 'serve' runs an HTTP ingestion service"
+    )
+
     general = parser.add_argument_group("Parser")
 
     general.add_argument(
@@ -59,7 +68,8 @@ def parse_options():
         '-o', '--output',
         dest='output',
         default="output.xml",
-        help="Name of output.xml"
+        help="Name of output.xml. Comma separated names, globs matched in the input path and "
+             "directories searched recursively are read into one execution"
     )
 
     general.add_argument(
@@ -80,7 +90,187 @@ def parse_options():
         '--report_type',
         dest='report_type',
         default="RF",
-        help="Sets the report type to import, defaults to RF. Other options: Allure, JUnit, Statistics"
+        help="Sets the report type to import, defaults to RF. Other options: Allure, JUnit, "
+             "Statistics. Allure reads a summary.json, an XML report or an allure-results directory"
+    )
+
+    general.add_argument(
+        '--batch-size',
+        dest='batch_size',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Number of suite/test rows sent to MySQL per insert statement"
+    )
+
+    general.add_argument(
+        '--engine',
+        dest='engine',
+        type=str.lower,
+        choices=['rf', 'stream'],
+        default='rf',
+        help="RF output parser: 'rf' builds the robot result model, 'stream' reads suite and "
+             "test data incrementally with bounded memory. With JUnit reports 'stream' stores a "
+             "row for every testsuite and testcase instead of the first testsuite's totals"
+    )
+
+    general.add_argument(
+        '--mmap',
+        dest='mmap',
+        default="False",
+        help="Flag to memory-map uncompressed XML files read by the 'stream' engine instead of "
+             "reading them through file buffers"
+    )
+
+    general.add_argument(
+        '--backend',
+        dest='backend',
+        type=str.lower,
+        choices=['mysql', 'sqlite'],
+        default='mysql',
+        help="Storage backend: the Historic MySQL server or a local SQLite file"
+    )
+
+    general.add_argument(
+        '--database-file',
+        dest='database_file',
+        help="SQLite file used by the sqlite backend, defaults to <projectname>.db"
+    )
+
+    general.add_argument(
+        '--workers',
+        dest='workers',
+        type=int,
+        default=1,
+        help="Number of processes used to parse multiple output files in parallel, or threads "
+             "reading an allure-results directory"
+    )
+
+    general.add_argument(
+        '--pipeline',
+        dest='pipeline',
+        default="False",
+        help="Flag to insert test rows on a writer thread while the output is still being "
+             "parsed, used when --workers is 1"
+    )
+
+    general.add_argument(
+        '--follow',
+        dest='follow',
+        default="False",
+        help="Flag to ingest an output.xml that is still being written, tests are committed "
+             "as they finish and the execution is finalised when the run ends"
+    )
+
+    general.add_argument(
+        '--follow-interval',
+        dest='follow_interval',
+        type=float,
+        default=DEFAULT_FOLLOW_INTERVAL,
+        help="Seconds between checks for new output in follow mode"
+    )
+
+    general.add_argument(
+        '--follow-timeout',
+        dest='follow_timeout',
+        type=float,
+        default=0,
+        help="Seconds without new output after which follow mode finalises the execution, "
+             "0 waits for the run to end"
+    )
+
+    general.add_argument(
+        '--skip-duplicates',
+        dest='skip_duplicates',
+        default="False",
+        help="Flag to skip result files whose content was ingested before, e.g. by a retried CI "
+             "job. Reports holding only counts are identical for runs with the same results, so "
+             "only enable it for result files that differ between runs, such as output.xml"
+    )
+
+    general.add_argument(
+        '--replace',
+        dest='replace',
+        default="False",
+        help="Flag to replace the execution stored earlier for the same result files"
+    )
+
+    general.add_argument(
+        '--cache-dir',
+        dest='cache_dir',
+        help="Directory caching parsed output.xml results, so ingesting the same files into "
+             "other projects skips parsing"
+    )
+
+    general.add_argument(
+        '--cache-size',
+        dest='cache_size',
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help="Size in MB the parse cache is trimmed to, least recently used results first"
+    )
+
+    general.add_argument(
+        '--max-error-length',
+        dest='max_error_length',
+        type=int,
+        default=0,
+        help="Number of characters of a test message stored, 0 stores the whole message"
+    )
+
+    general.add_argument(
+        '--keep-unicode',
+        dest='keep_unicode',
+        default="False",
+        help="Flag to keep non-ASCII letters and digits in stored test messages"
+    )
+
+    general.add_argument(
+        '--normalize',
+        dest='normalize',
+        default="False",
+        help="Flag to store each distinct test message and tag set once, in TB_ERROR and "
+             "TB_TAG, with TB_TEST referencing them by id"
+    )
+
+    general.add_argument(
+        '--bulk-load',
+        dest='bulk_load',
+        default="False",
+        help="Flag to write suite and test rows to temporary files loaded with LOAD DATA LOCAL "
+             "INFILE, falling back to batched inserts when the MySQL server does not allow it"
+    )
+
+    service = parser.add_argument_group("Service")
+
+    service.add_argument(
+        '--serve-host',
+        dest='serve_host',
+        default='127.0.0.1',
+        help="Address the ingestion service listens on"
+    )
+
+    service.add_argument(
+        '--serve-port',
+        dest='serve_port',
+        type=int,
+        default=8765,
+        help="Port the ingestion service listens on"
+    )
+
+    service.add_argument(
+        '--pool-size',
+        dest='pool_size',
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help="Number of pooled MySQL connections kept open by the ingestion service"
+    )
+
+    service.add_argument(
+        '--queue-size',
+        dest='queue_size',
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help="Number of uploads the ingestion service accepts before rejecting new ones"
     )
 
     return parser.parse_args()
@@ -88,4 +278,9 @@ def parse_options():
 
 def main():
     args = parse_options()
-    rfhistoric_parser(args)
+    if args.command == 'serve':
+        # http.server and its email dependencies are only needed by the service
+        from .server import serve
+        serve(args)
+    else:
+        rfhistoric_parser(args)
@@ -0,0 +1,172 @@
+"""Ingestion pipeline overlapping result parsing and database writes."""
+import datetime
+import queue
+import threading
+
+from .records import ExecutionRecords, SuiteCounts, combine_records
+from .rfhistoricparser import (
+    DEFAULT_BATCH_SIZE,
+    check_engine_outputs,
+    create_batch_writer,
+    get_elapsed_minutes,
+    insert_provisional_execution,
+    update_execution_table,
+    update_project_table,
+    write_suite_rows,
+    write_test_rows,
+)
+from .sanitizer import create_message_sanitizer
+
+# chunks of test rows the parser may get ahead of the writer by
+PIPELINE_CHUNKS = 4
+
+
+class PipelineRecords(ExecutionRecords):
+    """ExecutionRecords handing test rows to a PipelineWriter as they are parsed
+
+    Only the test counts are kept. Suite rows are few and complete only when
+    their suite ends, so they stay in memory and are written last.
+    """
+
+    def __init__(self, writer, prefix=""):
+        super().__init__()
+        self.writer = writer
+        self.prefix = prefix
+        self.counts = SuiteCounts()
+
+    def set_suite(self, index, name, status, total, passed, failed, elapsedtime, skipped):
+        super().set_suite(index, self.prefix + name, status, total, passed, failed, elapsedtime,
+                          skipped)
+
+    def add_test(self, name, status, elapsedtime, message, tags):
+        self.counts.add_status(status)
+        self.writer.add((self.prefix + name, status, elapsedtime, message, tuple(tags)))
+
+    def test_totals(self):
+        return self.counts.total, self.counts.passed, self.counts.failed, self.counts.skipped
+
+
+class PipelineWriter(threading.Thread):
+    """Writes test rows on its own thread while the parser produces more
+
+    Rows travel in chunks of the batch size through a bounded queue, so the
+    parser blocks instead of buffering when the database falls behind. The
+    connection is only used by this thread until ``finish`` or ``abort``
+    returns.
+    """
+
+    def __init__(self, batch_writer, result_id, chunk_size=DEFAULT_BATCH_SIZE, sanitize=None,
+                 interner=None):
+        super().__init__(name="rfhistoric-writer", daemon=True)
+        self.batch_writer = batch_writer
+        self.result_id = result_id
+        self.sanitize = sanitize
+        self.interner = interner
+        self.chunk_size = max(1, int(chunk_size))
+        self.chunk = []
+        self.chunks = queue.Queue(PIPELINE_CHUNKS)
+        self.aborted = False
+        self.error = None
+
+    def add(self, row):
+        if self.error is not None:
+            raise self.error
+        self.chunk.append(row)
+        if len(self.chunk) >= self.chunk_size:
+            self.chunks.put(self.chunk)
+            self.chunk = []
+
+    def run(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                break
+            # after a failure keep draining, so the parser never blocks on a full queue
+            if self.error is None and not self.aborted:
+                try:
+                    write_test_rows(self.batch_writer, self.result_id, chunk, self.sanitize,
+                                    self.interner)
+                except BaseException as e:
+                    self.error = e
+        if self.error is None and not self.aborted:
+            try:
+                self.batch_writer.close()
+            except BaseException as e:
+                self.error = e
+
+    def finish(self):
+        """Writes the remaining rows and waits for the thread, re-raising its error"""
+        if self.chunk:
+            self.chunks.put(self.chunk)
+            self.chunk = []
+        self.chunks.put(None)
+        self.join()
+        if self.error is not None:
+            raise self.error
+
+    def abort(self):
+        """Stops the thread without writing the rows still queued"""
+        self.aborted = True
+        self.chunk = []
+        self.chunks.put(None)
+        self.join()
+
+
+def write_execution_pipeline(mydb, opts, output_names, interner=None):
+    """Method for parsing output files while their test rows are being inserted
+
+    The execution row is inserted first so test rows can reference it, and its
+    results are filled in once parsing is complete. Run it inside
+    execution_transaction, the provisional row is never committed on its own.
+    """
+    engine = getattr(opts, 'engine', 'rf')
+    check_engine_outputs(engine, output_names)
+
+    result_id = insert_provisional_execution(mydb, opts.executionname)
+    writer = PipelineWriter(create_batch_writer(mydb, opts), result_id,
+                            getattr(opts, 'batch_size', DEFAULT_BATCH_SIZE),
+                            create_message_sanitizer(opts), interner)
+    print("INFO: Capturing test results")
+    writer.start()
+    try:
+        records = parse_into_pipeline(writer, engine, output_names, opts.fullsuitename,
+                                      getattr(opts, 'mmap', "False"))
+    except BaseException:
+        writer.abort()
+        raise
+    writer.finish()
+
+    combined = combine_records(records)
+    counts = SuiteCounts()
+    for item in records:
+        counts.add_counts(item.counts)
+    stotal, spass, sfail, sskip = combined.suite_totals()
+
+    print("INFO: Capturing suite results")
+    batch_writer = create_batch_writer(mydb, opts)
+    write_suite_rows(batch_writer, result_id, combined.suites)
+    batch_writer.close()
+
+    update_execution_table(mydb, result_id, counts.total, counts.passed, counts.failed,
+                           get_elapsed_minutes(combined.elapsedtime), stotal, spass, sfail,
+                           counts.skipped, sskip)
+    update_project_table(mydb, datetime.datetime.utcnow(), counts.passed, counts.total,
+                         opts.projectname)
+    return result_id
+
+
+def parse_into_pipeline(writer, engine, output_names, full_suite_name, use_mmap="False"):
+    """Method for parsing output files into PipelineRecords feeding one writer"""
+    if engine == "stream":
+        from .streamparser import parse_output_stream, read_root_suite_name
+        prefix = ""
+        if full_suite_name == "True" and len(output_names) > 1:
+            # combined outputs put the joined root suite names in front of every
+            # full name, see combine_records; they are needed before any row is sent
+            prefix = " & ".join(read_root_suite_name(name) for name in output_names) + "."
+        return [parse_output_stream(name, full_suite_name, PipelineRecords(writer, prefix),
+                                    use_mmap)
+                for name in output_names]
+
+    from .resultparser import parse_output_result
+    return [parse_output_result(output_names, full_suite_name, PipelineRecords(writer))]
@@ -0,0 +1,128 @@
+"""Compact execution records shared by the result parsers."""
+
+
+class ExecutionRecords:
+    """Suite and test rows extracted from a result file, ready to be written
+
+    Suite rows are ``(name, status, total, passed, failed, elapsed_ms, skipped)``
+    and test rows are ``(name, status, elapsed_ms, message, tags)``. Messages are
+    kept raw and tags as a sequence so formatting happens once, when writing.
+    """
+
+    def __init__(self, name="", elapsedtime=0):
+        self.name = name
+        self.elapsedtime = elapsedtime
+        self.suites = []
+        self.tests = []
+
+    def add_suite(self, name, status, total, passed, failed, elapsedtime, skipped):
+        self.suites.append((name, status, total, passed, failed, elapsedtime, skipped))
+
+    def reserve_suite(self):
+        """Keeps a suite row in start order until its statistics are known"""
+        self.suites.append(None)
+        return len(self.suites) - 1
+
+    def set_suite(self, index, name, status, total, passed, failed, elapsedtime, skipped):
+        self.suites[index] = (name, status, total, passed, failed, elapsedtime, skipped)
+
+    def add_test(self, name, status, elapsedtime, message, tags):
+        self.tests.append((name, status, elapsedtime, message, tuple(tags)))
+
+    def suite_totals(self):
+        """Returns total, passed, failed and skipped counts of the finished suites"""
+        passed = failed = skipped = 0
+        suites = [suite for suite in self.suites if suite is not None]
+        for suite in suites:
+            if suite[1] == "PASS":
+                passed += 1
+            elif suite[1] == "FAIL":
+                failed += 1
+            else:
+                skipped += 1
+        return len(suites), passed, failed, skipped
+
+    def test_totals(self):
+        """Returns total, passed, failed and skipped test counts"""
+        passed = failed = skipped = 0
+        for test in self.tests:
+            if test[1] == "PASS":
+                passed += 1
+            elif test[1] == "FAIL":
+                failed += 1
+            elif test[1] == "SKIP":
+                skipped += 1
+        return len(self.tests), passed, failed, skipped
+
+
+class SuiteCounts:
+    """Test counts of a suite including its child suites"""
+
+    def __init__(self):
+        self.index = None
+        self.total = 0
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def add_status(self, status):
+        self.total += 1
+        if status == "PASS":
+            self.passed += 1
+        elif status == "FAIL":
+            self.failed += 1
+        elif status == "SKIP":
+            self.skipped += 1
+
+    def add_counts(self, other):
+        self.total += other.total
+        self.passed += other.passed
+        self.failed += other.failed
+        self.skipped += other.skipped
+
+
+class SuiteFrame(SuiteCounts):
+    """State of a suite whose end has not been seen yet
+
+    The names are worked out once per suite and reused for each of its tests.
+    """
+
+    def __init__(self, name, longname):
+        super().__init__()
+        self.name = name
+        self.longname = longname
+        self.status = ""
+        self.elapsedtime = 0
+
+
+def get_suite_status(counts):
+    """Returns the status of a suite from its test counts, for reports without one"""
+    if counts.failed:
+        return "FAIL"
+    if counts.passed:
+        return "PASS"
+    return "SKIP"
+
+
+def combine_records(records, full_suite_name="False"):
+    """Merges records of several result files into one execution
+
+    Mirrors Robot Framework combining outputs under a parent suite named
+    ``first & second``, which becomes part of every full suite name.
+    """
+    if len(records) == 1:
+        return records[0]
+    combined = ExecutionRecords(" & ".join(item.name for item in records))
+    prefix = combined.name + "." if full_suite_name == "True" else ""
+    for item in records:
+        combined.elapsedtime += item.elapsedtime
+        for suite in item.suites:
+            combined.suites.append((prefix + suite[0],) + suite[1:])
+        for test in item.tests:
+            combined.tests.append((prefix + test[0],) + test[1:])
+    return combined
+
+
+def format_tags(tags):
+    """Formats tags the way Robot Framework prints them"""
+    return "[" + ", ".join(tags) + "]"
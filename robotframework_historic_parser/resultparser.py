@@ -0,0 +1,77 @@
+"""Output file parser built on the robot.api result model."""
+from contextlib import ExitStack
+
+from robot.api import ExecutionResult, ResultVisitor
+
+from .compression import get_content_name, is_compressed, open_input
+from .records import ExecutionRecords, SuiteFrame
+
+
+def parse_output_result(output_names, full_suite_name="False", records=None):
+    """Method for reading output files with robot.api.ExecutionResult"""
+    with ExitStack() as stack:
+        sources = [open_result_source(name, stack) for name in output_names]
+        result = ExecutionResult(*sources)
+    metrics = ExecutionMetrics(full_suite_name, records)
+    result.visit(metrics)
+    return metrics.records
+
+
+def open_result_source(output_name, stack):
+    """Returns a source ExecutionResult reads, decompressing compressed files as they are read"""
+    if not is_compressed(output_name):
+        return output_name
+    source = stack.enter_context(open_input(output_name))
+    if get_content_name(output_name).endswith(".json"):
+        # JSON is detected from the name or the content, and is loaded whole anyway
+        return source.read()
+    return source
+
+
+class ExecutionMetrics(ResultVisitor):
+    """Method for collecting suite and test results in a single pass"""
+
+    def __init__(self, full_suite_name, records=None):
+        self.full_suite_name = full_suite_name
+        self.records = ExecutionRecords() if records is None else records
+        self.suites = []
+
+    def start_suite(self, suite):
+        self.open_suite(suite, bool(suite.tests))
+
+    def open_suite(self, suite, has_tests):
+        """Reserves the row of a suite, listeners tell from the running model if it has tests"""
+        if not self.suites:
+            self.records.name = suite.name
+        frame = SuiteFrame(suite.name, get_full_name(suite))
+        if has_tests:
+            frame.index = self.records.reserve_suite()
+        self.suites.append(frame)
+
+    def end_suite(self, suite):
+        frame = self.suites.pop()
+        if frame.index is not None:
+            suite_name = frame.longname if self.full_suite_name == "True" else frame.name
+            self.records.set_suite(frame.index, suite_name, str(suite.status), frame.total,
+                                   frame.passed, frame.failed, suite.elapsedtime, frame.skipped)
+        if self.suites:
+            self.suites[-1].add_counts(frame)
+        else:
+            self.records.elapsedtime = suite.elapsedtime
+
+    def visit_test(self, test):
+        frame = self.suites[-1]
+        if self.full_suite_name == "True":
+            name = frame.longname + " - " + test.name
+        else:
+            name = frame.name + " - " + test.name
+
+        status = str(test.status)
+        frame.add_status(status)
+        self.records.add_test(name, status, test.elapsedtime, str(test.message), test.tags)
+
+
+def get_full_name(suite):
+    """Returns the dotted name of a suite, full_name in RF 7 and longname before"""
+    full_name = getattr(suite, "full_name", None)
+    return full_name if full_name is not None else suite.longname
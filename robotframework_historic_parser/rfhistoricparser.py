@@ -1,11 +1,36 @@
 """Tool for parsing robot framework output.xml files."""
 import os
-import re
 import json
+import hashlib
 import datetime
-import mysql.connector
-from robot.api import ExecutionResult, ResultVisitor
-import xml.etree.ElementTree as ET
+import threading
+from contextlib import contextmanager
+from functools import partial
+from itertools import repeat
+from .records import combine_records, format_tags
+from .interning import create_interner
+from .inputs import discover_inputs
+from .compression import get_content_name, is_compressed, open_input
+from .sanitizer import MessageSanitizer, create_message_sanitizer
+
+# robot.api, mysql.connector, xml.etree and the process pool are imported where they
+# are used, so that report types and options which do not need them start quickly
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_POOL_SIZE = 5
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_FOLLOW_INTERVAL = 1.0
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_CACHE_SIZE = 512
+# MySQL allows at most 65535 placeholders in one prepared statement
+MAX_PREPARED_PARAMETERS = 65535
+ROOT_DB = 'robothistoric'
+# ER_NO_SUCH_TABLE
+MISSING_TABLE_ERRNO = 1146
+
+# connection pools kept warm across rfhistoric_parser calls, keyed by server and user
+_connection_pools = {}
+_connection_pools_lock = threading.Lock()
 
 
 def rfhistoric_parser(opts):
@@ -16,16 +41,22 @@ def rfhistoric_parser(opts):
 
     path = os.path.abspath(os.path.expanduser(opts.path))
 
-    output_names = []
-    # support "*.xml" and "*.json" output files
-    if opts.output in ["*.xml", "*.json"]:
-        for item in os.listdir(path):
-            if os.path.isfile(item) and (item.endswith('.xml') or item.endswith('.json')):
-                output_names.append(item)
-    else:
-        for curr_name in opts.output.split(","):
-            curr_path = os.path.join(path, curr_name)
-            output_names.append(curr_path)
+    output_names = discover_inputs(path, opts.output, opts.report_type)
+    if not output_names:
+        exit("no result files match {} in {}".format(opts.output, path))
+
+    if opts.report_type == "RF" and getattr(opts, 'follow', "False") == "True":
+        if len(output_names) != 1:
+            exit("follow mode reads a single output file: {}".format(", ".join(output_names)))
+        if is_compressed(output_names[0]):
+            exit("follow mode cannot read compressed output: {}".format(output_names[0]))
+        from .follow import follow_output
+        # the output may not have been created yet, so it is not required to exist
+        mydb = connect_to_project_db(opts)
+        print("Following execution results until the execution ends...")
+        follow_output(mydb, opts, output_names[0])
+        print("INFO: Writing execution results")
+        return
 
     required_files = list(output_names)
     missing_files = [filename for filename in required_files if not os.path.exists(filename)]
@@ -35,147 +66,179 @@ def rfhistoric_parser(opts):
 
     if opts.report_type == "RF":
         # connect to database
-        mydb = connect_to_mysql_db(opts.host, opts.port, opts.username, opts.password, opts.projectname)
-        rootdb = connect_to_mysql_db(opts.host, opts.port, opts.username, opts.password, 'robothistoric')
-
-        # Read output.xml file
-        result = ExecutionResult(*output_names)
-        result.configure(stat_config={'suite_stat_level': 2,
-                                      'tag_stat_combine': 'tagANDanother'})
-
-        print("Capturing execution results, This may take few minutes...")
-
-        test_stats = SuiteStats()
-        result.visit(test_stats)
-
-        test_stats_obj = test_stats.all if hasattr(test_stats, 'all') else test_stats
-        stotal = test_stats_obj.total_suite
-        spass = test_stats_obj.passed_suite
-        sfail = test_stats_obj.failed_suite
-        sskip = test_stats_obj.skipped_suite if hasattr(test_stats_obj, 'skipped_suite') else 0
-
-
-        stats = result.statistics
-        stats_obj = stats.total.all if hasattr(stats.total, 'all') else stats.total
-        total = stats_obj.total
-        passed = stats_obj.passed
-        failed = stats_obj.failed
-        skipped = stats_obj.skipped if hasattr(stats_obj, 'skipped') else 0
-
-        elapsedtime = datetime.datetime(1970, 1, 1) + \
-            datetime.timedelta(milliseconds=result.suite.elapsedtime)
-        elapsedtime = get_time_in_min(elapsedtime.strftime("%X"))
-        elapsedtime = float("{0:.2f}".format(elapsedtime))
+        mydb = connect_to_project_db(opts)
+        with close_on_error(mydb):
+            ingestion = check_ingestion(mydb, opts, output_names)
+            if ingestion and ingestion.skip:
+                mydb.close()
+                return
+            interner = create_interner(mydb, opts)
+
+            print("Capturing execution results, This may take few minutes...")
+            pipeline = getattr(opts, 'pipeline', "False") == "True" and getattr(opts, 'workers', 1) <= 1
+            if not pipeline:
+                records = load_output_records(opts, output_names,
+                                              ingestion.content_hash if ingestion else None)
+
+        if pipeline:
+            from .pipeline import write_execution_pipeline
+            # parse and insert test results info into db at the same time
+            with execution_transaction(mydb):
+                result_id = write_execution_pipeline(mydb, opts, output_names, interner)
+                record_ingestion(mydb, ingestion, result_id, opts.projectname)
+                print("INFO: Writing execution results")
+            return
 
         # insert test results info into db
-        result_id = insert_into_execution_table(mydb, rootdb, opts.executionname, total, passed,
-                                                failed, elapsedtime, stotal, spass, sfail, skipped,
-                                                sskip, opts.projectname)
-
-        print("INFO: Capturing suite results")
-        result.visit(SuiteResults(mydb, result_id, opts.fullsuitename))
-        print("INFO: Capturing test results")
-        result.visit(TestMetrics(mydb, result_id, opts.fullsuitename))
-
-        print("INFO: Writing execution results")
-        commit_and_close_db(mydb)
+        with execution_transaction(mydb):
+            result_id = write_execution_records(mydb, opts, records, interner)
+            record_ingestion(mydb, ingestion, result_id, opts.projectname)
+            update_project_records(mydb, opts, records)
+            print("INFO: Writing execution results")
 
     elif opts.report_type.lower() == "allure":
-        process_allure_report(opts)
+        process_allure_report(opts, output_names)
     elif opts.report_type.lower() == "junit":
-        process_junit_report(opts)
+        process_junit_report(opts, output_names)
     elif opts.report_type.lower() == "statistics":
-        process_statistics_report(opts)
+        process_statistics_report(opts, output_names)
     else:
         exit(f"report_type of {opts.report_type} is not supported.")
 
 
-# other useful methods
-class SuiteStats(ResultVisitor):
-    """Method for parsing Suite Stats"""
-    total_suite = 0
-    passed_suite = 0
-    failed_suite = 0
-    skipped_suite = 0
-
-    def start_suite(self, suite):
-        suite_test_list = suite.tests
-        if not suite_test_list:
-            pass
-        else:
-            self.total_suite += 1
-
-            if suite.status == "PASS":
-                self.passed_suite += 1
-            elif suite.status == "FAIL":
-                self.failed_suite += 1
-            else:
-                self.skipped_suite += 1
-
-
-class SuiteResults(ResultVisitor):
-    """Method for parsing Suite Results"""
-
-    def __init__(self, db, id, full_suite_name):
-        self.db = db
-        self.id = id
-        self.full_suite_name = full_suite_name
-
-    def start_suite(self, suite):
-
-        suite_test_list = suite.tests
-        if not suite_test_list:
-            pass
-        else:
-            if self.full_suite_name == "True":
-                suite_name = suite.longname
-            else:
-                suite_name = suite
-                suite_name = str(suite_name)
-                # Check for rf7
-                check_string = "robot.result.TestSuite(name='"
-                if check_string in suite_name:
-                    suite_name = suite_name.split(check_string)[1].split("')")[0]
-
-            stats = suite.statistics.all if hasattr(suite.statistics, 'all') else suite.statistics
-            time = float("{0:.2f}".format(suite.elapsedtime / float(60000)))
-            suite_skipped = stats.skipped if hasattr(stats, 'skipped') else 0
-            insert_into_suite_table(self.db, self.id, str(suite_name), str(suite.status),
-                                    int(stats.total), int(stats.passed), int(stats.failed),
-                                    float(time), int(suite_skipped))
-
-
-class TestMetrics(ResultVisitor):
-    """Method for parsing Suite Metrics"""
-
-    def __init__(self, db, id, full_suite_name):
-        self.db = db
-        self.id = id
-        self.full_suite_name = full_suite_name
-
-    def visit_test(self, test):
-        if self.full_suite_name == "True":
-            full_suite_name = test.longname.split("." + test.name)
-            name = str(full_suite_name[0]) + " - " + str(test)
-        else:
-            suite_name = str(test.parent)
-            # handle for rf7.0 + formatting
-            suite_check_string = "robot.result.TestSuite(name='"
-            if suite_check_string in suite_name:
-                suite_name = suite_name.split(suite_check_string)[1].split("')")[0]
-            test_name = str(test)
-            # handle for rf7.0 + formatting
-            test_check_string = "robot.result.TestCase(name='"
-            if test_check_string in test_name:
-                test_name = test_name.split(test_check_string)[1].split("')")[0]
-            name = suite_name + " - " + test_name
-
-        time = float("{0:.2f}".format(test.elapsedtime / float(60000)))
-        error = remove_special_characters(str(test.message))
-        insert_into_test_table(self.db, self.id, str(name), str(test.status), time, error,
-                               str(test.tags))
+def parse_output_files(opts, output_names):
+    """Method for reading output files into one set of ExecutionRecords"""
+    engine = getattr(opts, 'engine', 'rf')
+    workers = getattr(opts, 'workers', 1)
+    use_mmap = getattr(opts, 'mmap', "False")
+    check_engine_outputs(engine, output_names)
+
+    if workers > 1 and len(output_names) > 1:
+        # parse every file in its own process and merge the compact records
+        records = map_output_files(parse_output_file, output_names, workers,
+                                   engine, opts.fullsuitename, use_mmap)
+        return combine_records(records, opts.fullsuitename)
+
+    if engine == "stream":
+        from .streamparser import parse_output_stream
+        return combine_records([parse_output_stream(name, opts.fullsuitename, use_mmap=use_mmap)
+                                for name in output_names], opts.fullsuitename)
+
+    # Read output.xml file
+    from .resultparser import parse_output_result
+    return parse_output_result(output_names, opts.fullsuitename)
+
+
+def map_output_files(function, output_names, workers, *args):
+    """Method for calling function on every output file, in worker processes when workers > 1"""
+    if len(output_names) > 1 and workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(output_names))) as executor:
+            return list(executor.map(function, output_names, *[repeat(arg) for arg in args]))
+    return [function(name, *args) for name in output_names]
+
+
+def check_engine_outputs(engine, output_names):
+    """Method for exiting when the engine cannot read some of the output files"""
+    if engine == "stream":
+        not_xml = [name for name in output_names if not get_content_name(name).endswith('.xml')]
+        if not_xml:
+            exit("stream engine supports only .xml outputs: {}".format(", ".join(not_xml)))
+
+
+def load_output_records(opts, output_names, content_hash=None):
+    """Method for reading output files through the parse cache when a cache dir is set"""
+    cache_dir = getattr(opts, 'cache_dir', None)
+    if not cache_dir:
+        return parse_output_files(opts, output_names)
+    from .cache import ParseCache
+    cache = ParseCache(cache_dir, getattr(opts, 'cache_size', DEFAULT_CACHE_SIZE) * 1024 * 1024)
+    if content_hash is None:
+        content_hash = hash_output_files(opts.report_type, output_names)
+    key = cache.key(content_hash, getattr(opts, 'engine', 'rf'), opts.fullsuitename)
+    records = cache.load(key)
+    if records is not None:
+        print("INFO: Using cached results of {}".format(", ".join(output_names)))
+        return records
+    records = parse_output_files(opts, output_names)
+    cache.store(key, records)
+    return records
+
+
+def parse_output_file(output_name, engine, full_suite_name, use_mmap="False"):
+    """Method for reading a single output file, used by worker processes"""
+    if engine == "stream":
+        from .streamparser import parse_output_stream
+        return parse_output_stream(output_name, full_suite_name, use_mmap=use_mmap)
+    from .resultparser import parse_output_result
+    return parse_output_result([output_name], full_suite_name)
+
+
+def write_execution_records(mydb, opts, records, interner=None):
+    """Method for inserting ExecutionRecords into tb_execution, tb_suite and tb_test"""
+    stotal, spass, sfail, sskip = records.suite_totals()
+    total, passed, failed, skipped = records.test_totals()
+    elapsedtime = get_elapsed_minutes(records.elapsedtime)
+
+    result_id = insert_into_execution_table(mydb, mydb, opts.executionname, total, passed,
+                                            failed, elapsedtime, stotal, spass, sfail, skipped,
+                                            sskip, opts.projectname)
+
+    writer = create_batch_writer(mydb, opts)
+    print("INFO: Capturing suite results")
+    write_suite_rows(writer, result_id, records.suites)
+    print("INFO: Capturing test results")
+    write_test_rows(writer, result_id, records.tests, create_message_sanitizer(opts), interner)
+    writer.close()
+    return result_id
+
+
+def update_project_records(mydb, opts, records):
+    """Method for counting the execution of the records in robothistoric.TB_PROJECT"""
+    total, passed = records.test_totals()[:2]
+    update_project_table(mydb, datetime.datetime.utcnow(), passed, total, opts.projectname)
+
+
+def create_batch_writer(mydb, opts):
+    """Method for creating the BatchWriter suited to the storage backend"""
+    from .storage import get_backend
+    backend = get_backend(getattr(opts, 'backend', 'mysql'))
+    batch_size = getattr(opts, 'batch_size', DEFAULT_BATCH_SIZE)
+    if getattr(opts, 'bulk_load', "False") == "True" and backend.bulk_load:
+        from .bulkload import create_bulk_writer
+        return create_bulk_writer(mydb, batch_size, backend.prepared_statements)
+    return BatchWriter(mydb, batch_size, backend.prepared_statements)
+
+
+def write_suite_rows(writer, result_id, suites):
+    """Method for inserting ExecutionRecords suite rows into tb_suite"""
+    for name, status, stotal, spass, sfail, duration, sskip in suites:
+        insert_into_suite_table(writer, result_id, name, status, stotal, spass, sfail,
+                                get_duration_in_min(duration), sskip)
+
+
+def write_test_rows(writer, result_id, tests, sanitize=None, interner=None):
+    """Method for inserting ExecutionRecords test rows into tb_test
+
+    With an interner, messages and tags are stored once in TB_ERROR and
+    TB_TAG and the test rows reference them by id.
+    """
+    if sanitize is None:
+        sanitize = remove_special_characters
+    if interner is None:
+        for name, status, duration, message, tags in tests:
+            insert_into_test_table(writer, result_id, name, status, get_duration_in_min(duration),
+                                   sanitize(message), format_tags(tags))
+        return
+    rows = [(name, status, get_duration_in_min(duration), sanitize(message), format_tags(tags))
+            for name, status, duration, message, tags in tests]
+    interner.resolve([row[3] for row in rows], [row[4] for row in rows])
+    for name, status, duration, message, tags in rows:
+        insert_into_normalized_test_table(writer, result_id, name, status, duration,
+                                          interner.errors[message], interner.tags[tags])
 
 
+# other useful methods
 def get_time_in_min(time_str):
     """Method converting time to minutes"""
     h, m, s = time_str.split(':')
@@ -183,67 +246,259 @@ def get_time_in_min(time_str):
     return float("{0:.2f}".format(ctime / 60))
 
 
-def connect_to_mysql_db(host, port, user, pwd, db):
+def get_elapsed_minutes(milliseconds):
+    """Method converting execution time to minutes, ignoring milliseconds"""
+    elapsedtime = datetime.datetime(1970, 1, 1) + datetime.timedelta(milliseconds=milliseconds)
+    elapsedtime = get_time_in_min(elapsedtime.strftime("%X"))
+    return float("{0:.2f}".format(elapsedtime))
+
+
+def get_duration_in_min(milliseconds):
+    """Method converting suite and test time to minutes"""
+    return float("{0:.2f}".format(milliseconds / float(60000)))
+
+
+def connect_to_mysql_db(host, port, user, pwd, db, allow_local_infile=False):
     """Method for connection to db"""
+    import mysql.connector
+    # LOAD DATA LOCAL INFILE is refused unless the client allows it
+    options = {'allow_local_infile': True} if allow_local_infile else {}
     try:
         mydb = mysql.connector.connect(
             host=host,
             port=port,
             user=user,
             passwd=pwd,
-            database=db
+            database=db,
+            **options
         )
         return mydb
     except Exception as e:
         print(e)
 
 
+def connect_to_project_db(opts):
+    """Method for connecting to the project db of the configured storage backend"""
+    from .storage import get_backend
+    return get_backend(getattr(opts, 'backend', 'mysql')).connect(opts)
+
+
+def connect_to_project_mysql_db(opts):
+    """Method for connecting to the project db, pooled when opts.pool is True
+
+    The robothistoric tables are addressed with fully qualified names, so a
+    single connection serves both the project and the root database.
+    """
+    allow_local_infile = getattr(opts, 'bulk_load', "False") == "True"
+    if getattr(opts, 'pool', "False") == "True":
+        return get_pooled_connection(opts.host, opts.port, opts.username, opts.password,
+                                     opts.projectname,
+                                     getattr(opts, 'pool_size', DEFAULT_POOL_SIZE),
+                                     allow_local_infile)
+    return connect_to_mysql_db(opts.host, opts.port, opts.username, opts.password,
+                               opts.projectname, allow_local_infile)
+
+
+def get_pooled_connection(host, port, user, pwd, db, pool_size=DEFAULT_POOL_SIZE,
+                          allow_local_infile=False):
+    """Method for borrowing a connection from a pool shared by all calls
+
+    Closing the connection returns it to the pool instead of disconnecting.
+    """
+    import mysql.connector.pooling
+    key = (host, str(port), user, pwd, allow_local_infile)
+    options = {'allow_local_infile': True} if allow_local_infile else {}
+    with _connection_pools_lock:
+        pool = _connection_pools.get(key)
+        if pool is None:
+            pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name="rfhistoric_%s" % len(_connection_pools),
+                pool_size=pool_size,
+                host=host,
+                port=port,
+                user=user,
+                passwd=pwd,
+                **options
+            )
+            _connection_pools[key] = pool
+    try:
+        connection = pool.get_connection()
+    except Exception as e:
+        print(e)
+        return None
+    try:
+        # the pooled wrapper has no database setter, so select it on the connection
+        connection.cmd_init_db(db)
+    except Exception as e:
+        connection.close()
+        print(e)
+        return None
+    return connection
+
+
+def close_connection_pools():
+    """Method for disconnecting every pooled connection"""
+    with _connection_pools_lock:
+        for pool in _connection_pools.values():
+            pool._remove_connections()
+        _connection_pools.clear()
+
+
+# ids are left to AUTO_INCREMENT / INTEGER PRIMARY KEY of every backend
+EXECUTION_INSERT_SQL = "INSERT INTO TB_EXECUTION (Execution_Date, Execution_Desc, Execution_Total, " \
+                       "Execution_Pass, Execution_Fail, Execution_Time, Execution_STotal, " \
+                       "Execution_SPass, Execution_SFail, Execution_Skip, Execution_SSkip) VALUES " \
+                       "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
+
+EXECUTION_UPDATE_SQL = "UPDATE TB_EXECUTION SET Execution_Total = %s, Execution_Pass = %s, " \
+                       "Execution_Fail = %s, Execution_Time = %s, Execution_STotal = %s, " \
+                       "Execution_SPass = %s, Execution_SFail = %s, Execution_Skip = %s, " \
+                       "Execution_SSkip = %s WHERE Execution_Id = %s;"
+
+
 def insert_into_execution_table(con, ocon, name, total, passed, failed, ctime, stotal, spass,
                                 sfail, skipped, sskipped, projectname):
-    """Method for inserting parsed data into tb_execution"""
+    """Method for inserting parsed data into tb_execution
+
+    Nothing is committed here, the caller commits the execution as a whole
+    (see execution_transaction). robothistoric.TB_PROJECT is left alone, call
+    update_project_table last, so its row stays locked for as short as possible.
+    """
     cursor_obj = con.cursor()
-    root_cursor_obj = ocon.cursor()
     utc = datetime.datetime.utcnow()
-    sql = "INSERT INTO TB_EXECUTION (Execution_Id, Execution_Date, Execution_Desc, " \
-          "Execution_Total, Execution_Pass, Execution_Fail, Execution_Time, Execution_STotal, " \
-          "Execution_SPass, Execution_SFail, Execution_Skip, Execution_SSkip) VALUES (0, %s, " \
-          "%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
     val = (utc, name, total, passed, failed, ctime, stotal, spass, sfail, skipped, sskipped)
-    cursor_obj.execute(sql, val)
-    con.commit()
-    cursor_obj.execute(
-        "SELECT Execution_Id, Execution_Pass, Execution_Total FROM TB_EXECUTION ORDER BY "
-        "Execution_Id DESC LIMIT 1;")
-    rows = cursor_obj.fetchone()
-    cursor_obj.execute("SELECT COUNT(*) FROM TB_EXECUTION;")
-    execution_rows = cursor_obj.fetchone()
-    # update robothistoric.TB_PROJECT table
-    root_cursor_obj.execute(
-        "UPDATE TB_PROJECT SET Last_Updated = '%s', Total_Executions = %s, Recent_Pass_Perc = %s "
-        "WHERE Project_Name='%s';" % (utc, execution_rows[0],
-                                      float("{0:.2f}".format((rows[1] / rows[2] * 100))) if rows[2] != 0 else 0,
-                                      projectname))
-    ocon.commit()
-    return str(rows[0])
-
-
-def insert_into_suite_table(con, eid, name, status, total, passed, failed, duration, skipped):
-    """Method for inserting parsed data into tb_suite"""
+    cursor_obj.execute(EXECUTION_INSERT_SQL, val)
+    return str(cursor_obj.lastrowid)
+
+
+def insert_provisional_execution(con, name):
+    """Method for inserting an execution whose results update_execution_table fills in"""
     cursor_obj = con.cursor()
-    sql = "INSERT INTO TB_SUITE (Suite_Id, Execution_Id, Suite_Name, Suite_Status, Suite_Total, " \
-          "Suite_Pass, Suite_Fail, Suite_Time, Suite_Skip) VALUES (%s, %s, %s, %s, %s, %s, %s, " \
-          "%s, %s)"
-    val = (0, eid, name, status, total, passed, failed, duration, skipped)
-    cursor_obj.execute(sql, val)
+    cursor_obj.execute(EXECUTION_INSERT_SQL, (datetime.datetime.utcnow(), name) + (0,) * 9)
+    return str(cursor_obj.lastrowid)
 
 
-def insert_into_test_table(con, eid, test, status, duration, msg, tags):
-    """Method for inserting parsed data into tb_test"""
+def update_execution_table(con, eid, total, passed, failed, ctime, stotal, spass, sfail, skipped,
+                           sskipped):
+    """Method for filling in the results of an execution inserted before parsing finished
+
+    robothistoric.TB_PROJECT is left alone, call update_project_table once the
+    execution is complete.
+    """
     cursor_obj = con.cursor()
-    sql = "INSERT INTO TB_TEST (Test_Id, Execution_Id, Test_Name, Test_Status, Test_Time, " \
-          "Test_Error, Test_Tag) VALUES (%s, %s, %s, %s, %s, %s, %s)"
-    val = (0, eid, test, status, duration, msg, tags)
-    cursor_obj.execute(sql, val)
+    val = (total, passed, failed, ctime, stotal, spass, sfail, skipped, sskipped, eid)
+    cursor_obj.execute(EXECUTION_UPDATE_SQL, val)
+
+
+def update_project_table(ocon, utc, passed, total, projectname):
+    """Method for counting a new execution in robothistoric.TB_PROJECT"""
+    # the counter is maintained in place so the cost does not grow with the
+    # history and concurrent uploads cannot miss a count
+    ocon.cursor().execute(
+        "UPDATE " + ROOT_DB + ".TB_PROJECT SET Last_Updated = %s, "
+        "Total_Executions = COALESCE(Total_Executions, 0) + 1, Recent_Pass_Perc = %s "
+        "WHERE Project_Name = %s;", (utc, get_pass_percentage(passed, total), projectname))
+
+
+def get_pass_percentage(passed, total):
+    """Method for calculating the pass percentage of an execution"""
+    total = float(total)
+    return float("{0:.2f}".format(float(passed) / total * 100)) if total != 0 else 0
+
+
+SUITE_INSERT_SQL = "INSERT INTO TB_SUITE (Execution_Id, Suite_Name, Suite_Status, Suite_Total, " \
+                   "Suite_Pass, Suite_Fail, Suite_Time, Suite_Skip) VALUES (%s, %s, %s, %s, %s, " \
+                   "%s, %s, %s)"
+
+TEST_INSERT_SQL = "INSERT INTO TB_TEST (Execution_Id, Test_Name, Test_Status, Test_Time, " \
+                  "Test_Error, Test_Tag) VALUES (%s, %s, %s, %s, %s, %s)"
+
+NORMALIZED_TEST_INSERT_SQL = "INSERT INTO TB_TEST (Execution_Id, Test_Name, Test_Status, Test_Time, " \
+                             "Test_Error_Id, Test_Tag_Id) VALUES (%s, %s, %s, %s, %s, %s)"
+
+
+class BatchWriter:
+    """Buffers rows per insert statement and writes them with executemany
+
+    mysql.connector rewrites an executemany INSERT into a single multi-VALUES
+    statement, so every flush is one round trip instead of one per row. A
+    single cursor is reused for the whole run.
+
+    With ``prepared`` every flush instead executes a multi-VALUES statement
+    that is prepared on the server once per batch size and then only bound,
+    so the server does not parse the SQL text of each batch again.
+    """
+
+    def __init__(self, db, batch_size=DEFAULT_BATCH_SIZE, prepared=False):
+        self.db = db
+        self.batch_size = max(1, int(batch_size))
+        self.prepared = prepared
+        self.cursor = None if prepared else db.cursor()
+        # (sql, rows) -> (multi-VALUES statement, prepared cursor)
+        self.statements = {}
+        self.pending = {}
+
+    def insert(self, sql, val):
+        rows = self.pending.setdefault(sql, [])
+        rows.append(val)
+        if len(rows) >= self.batch_size:
+            self.flush_statement(sql)
+
+    def flush_statement(self, sql):
+        rows = self.pending.pop(sql, None)
+        if not rows:
+            return
+        if not self.prepared:
+            self.cursor.executemany(sql, rows)
+            return
+        limit = max(1, MAX_PREPARED_PARAMETERS // len(rows[0]))
+        for start in range(0, len(rows), limit):
+            chunk = rows[start:start + limit]
+            statement, cursor = self.prepared_statement(sql, len(chunk))
+            cursor.execute(statement, [value for row in chunk for value in row])
+
+    def prepared_statement(self, sql, rows):
+        """Returns the statement inserting rows at once and its prepared cursor
+
+        mysql.connector only prepares again when it is handed a different
+        statement object, so each statement keeps its own cursor.
+        """
+        key = (sql, rows)
+        if key not in self.statements:
+            values = sql[sql.index("VALUES") + len("VALUES"):].strip()
+            self.statements[key] = (sql + (", " + values) * (rows - 1),
+                                    self.db.cursor(prepared=True))
+        return self.statements[key]
+
+    def flush(self):
+        for sql in list(self.pending):
+            self.flush_statement(sql)
+
+    def close(self):
+        self.flush()
+        if self.cursor is not None:
+            self.cursor.close()
+        for _, cursor in self.statements.values():
+            cursor.close()
+        self.statements.clear()
+
+
+def insert_into_suite_table(writer, eid, name, status, total, passed, failed, duration, skipped):
+    """Method for inserting parsed data into tb_suite"""
+    val = (eid, name, status, total, passed, failed, duration, skipped)
+    writer.insert(SUITE_INSERT_SQL, val)
+
+
+def insert_into_test_table(writer, eid, test, status, duration, msg, tags):
+    """Method for inserting parsed data into tb_test"""
+    val = (eid, test, status, duration, msg, tags)
+    writer.insert(TEST_INSERT_SQL, val)
+
+
+def insert_into_normalized_test_table(writer, eid, test, status, duration, error_id, tag_id):
+    """Method for inserting parsed data into tb_test, referencing tb_error and tb_tag"""
+    val = (eid, test, status, duration, error_id, tag_id)
+    writer.insert(NORMALIZED_TEST_INSERT_SQL, val)
 
 
 def commit_and_close_db(db):
@@ -252,60 +507,262 @@ def commit_and_close_db(db):
     db.close()
 
 
+def rollback_and_close_db(db):
+    """Method for discarding uncommitted changes and closing the db"""
+    try:
+        db.rollback()
+    finally:
+        db.close()
+
+
+@contextmanager
+def close_on_error(db):
+    """Method for closing the db when reading results fails before execution_transaction
+
+    Duplicates are looked up before the results are read, so the connection is
+    open while they are parsed. A parse error or exit must not leave it open,
+    a pooled connection would never return to its pool.
+    """
+    try:
+        yield db
+    except BaseException:
+        if db is not None:
+            db.close()
+        raise
+
+
+@contextmanager
+def execution_transaction(db):
+    """Method for writing one execution as a single transaction
+
+    The execution, suite and test rows and the TB_PROJECT update are
+    committed together; on any error everything is rolled back, so a failed
+    upload never leaves a partial execution behind.
+    """
+    db.start_transaction()
+    try:
+        yield db
+    except BaseException:
+        rollback_and_close_db(db)
+        raise
+    commit_and_close_db(db)
+
+
+# TB_INGESTION maps the content hash of ingested files to their execution
+INGESTION_TABLE_SQL = "CREATE TABLE IF NOT EXISTS TB_INGESTION (Content_Hash CHAR(64) NOT NULL PRIMARY KEY, " \
+                      "Execution_Id INT NOT NULL, Report_Type VARCHAR(32), Ingested_Date DATETIME);"
+
+
+class Ingestion:
+    """Content hash of the files being ingested and the execution they were stored as before"""
+
+    def __init__(self, content_hash, report_type, previous_id=None, replace=False):
+        self.content_hash = content_hash
+        self.report_type = report_type
+        self.previous_id = previous_id
+        self.replace = replace
+
+    @property
+    def skip(self):
+        return self.previous_id is not None and not self.replace
+
+
+def hash_output_files(report_type, output_names):
+    """Method for hashing the report type and contents of the output files, reading them in chunks"""
+    digest = hashlib.sha256(report_type.lower().encode("utf-8"))
+    for output_name in output_names:
+        digest.update(b"\0")
+        with open(output_name, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_ingestion(mydb, opts, output_names):
+    """Method for looking up an earlier ingestion of the same output files
+
+    Returns None when duplicates are not checked. A returned Ingestion has
+    ``skip`` set when the files were stored already and are not replaced.
+    """
+    replace = getattr(opts, 'replace', "False") == "True"
+    if getattr(opts, 'skip_duplicates', "False") != "True" and not replace:
+        return None
+    ingestion = Ingestion(hash_output_files(opts.report_type, output_names), opts.report_type,
+                          replace=replace)
+    cursor_obj = mydb.cursor()
+    try:
+        cursor_obj.execute("SELECT Execution_Id FROM TB_INGESTION WHERE Content_Hash = %s;",
+                           (ingestion.content_hash,))
+        row = cursor_obj.fetchone()
+    except Exception as e:
+        if not is_missing_table(e):
+            raise
+        # first ingestion into this project database
+        mydb.rollback()
+        cursor_obj.execute(INGESTION_TABLE_SQL)
+        row = None
+    # end the read, the execution is written in a transaction of its own
+    mydb.commit()
+    if row:
+        ingestion.previous_id = str(row[0])
+        if ingestion.skip:
+            print("INFO: {} already ingested as execution {}, use --replace to store it again".format(
+                ", ".join(output_names), ingestion.previous_id))
+    return ingestion
+
+
+def is_missing_table(error):
+    """Returns whether a statement failed because a table it reads does not exist"""
+    # sqlite3 reports a missing table by its message only
+    return getattr(error, 'errno', None) == MISSING_TABLE_ERRNO or "no such table" in str(error)
+
+
+def record_ingestion(mydb, ingestion, execution_id, projectname):
+    """Method for storing the content hash with the execution, replacing the earlier execution"""
+    if ingestion is None:
+        return
+    cursor_obj = mydb.cursor()
+    if ingestion.previous_id is None:
+        cursor_obj.execute("INSERT INTO TB_INGESTION (Content_Hash, Execution_Id, Report_Type, Ingested_Date) "
+                           "VALUES (%s, %s, %s, %s);", (ingestion.content_hash, execution_id,
+                                                        ingestion.report_type, datetime.datetime.utcnow()))
+        return
+    delete_execution(mydb, ingestion.previous_id, projectname)
+    cursor_obj.execute("UPDATE TB_INGESTION SET Execution_Id = %s, Ingested_Date = %s WHERE Content_Hash = %s;",
+                       (execution_id, datetime.datetime.utcnow(), ingestion.content_hash))
+
+
+def delete_execution(mydb, execution_id, projectname):
+    """Method for deleting an execution with its suites and tests"""
+    cursor_obj = mydb.cursor()
+    cursor_obj.execute("DELETE FROM TB_TEST WHERE Execution_Id = %s;", (execution_id,))
+    cursor_obj.execute("DELETE FROM TB_SUITE WHERE Execution_Id = %s;", (execution_id,))
+    cursor_obj.execute("DELETE FROM TB_EXECUTION WHERE Execution_Id = %s;", (execution_id,))
+    if cursor_obj.rowcount > 0:
+        cursor_obj.execute("UPDATE " + ROOT_DB + ".TB_PROJECT SET Total_Executions = Total_Executions - 1 "
+                           "WHERE Project_Name = %s;", (projectname,))
+
+
 # Allure Report Functions
-def process_allure_report(opts):
-    mydb = connect_to_mysql_db(opts.host, opts.port, opts.username, opts.password, opts.projectname)
-    rootdb = connect_to_mysql_db(opts.host, opts.port, opts.username, opts.password, 'robothistoric')
-
-    total = 0
-    passed = 0
-    failed = 0
-    skipped = 0
-    elapsedtime = 0
+def process_allure_report(opts, output_names=None):
+    output_names = [opts.output] if output_names is None else output_names
+    directories = [name for name in output_names if os.path.isdir(name)]
+    if directories:
+        if len(directories) != len(output_names):
+            print("Allure results directories and summary files cannot be combined: {}".format(
+                ", ".join(output_names)))
+            return
+        process_allure_results(opts, directories)
+        return
+    if not all(get_content_name(name).endswith(('.xml', '.json')) for name in output_names):
+        print("Invalid file type. Please provide either .xml or .json file.")
+        return
+
+    mydb = connect_to_project_db(opts)
+    with close_on_error(mydb):
+        ingestion = check_ingestion(mydb, opts, output_names)
+        if ingestion and ingestion.skip:
+            mydb.close()
+            return
+        summaries = map_output_files(read_allure_summary, output_names, getattr(opts, 'workers', 1))
+        total, passed, failed, skipped, elapsedtime = [sum(values) for values in zip(*summaries)]
+
     # Retrieving suite data is currently not implemented
     stotal = 0
     spass = 0
     sfail = 0
     sskip = 0
 
-    if opts.output.endswith('.xml'):
-        root = ET.parse(opts.output).getroot()
+    # insert test results info into db
+    with execution_transaction(mydb):
+        result_id = insert_into_execution_table(mydb, mydb, opts.executionname, total, passed, failed, elapsedtime,
+                                                stotal, spass, sfail, skipped, sskip, opts.projectname)
+        record_ingestion(mydb, ingestion, result_id, opts.projectname)
+        update_project_table(mydb, datetime.datetime.utcnow(), passed, total, opts.projectname)
+        print("INFO: Writing execution results")
+
+
+def read_allure_summary(output_name):
+    """Method for reading total, passed, failed, skipped and elapsed time of an Allure summary"""
+    import xml.etree.ElementTree as ET
+    if get_content_name(output_name).endswith('.xml'):
+        with open_input(output_name) as f:
+            root = ET.parse(f).getroot()
 
-        total = root.get('total', '0')
-        passed = root.get('passed', '0')
-        failed = root.get('failed', '0')
+        total = int(root.get('total', '0'))
+        passed = int(root.get('passed', '0'))
+        failed = int(root.get('failed', '0'))
         skipped = int(root.get('skipped', '0')) + int(root.get('inconclusive', '0'))
-        elapsedtime = root.get('duration', '0')
+        return total, passed, failed, skipped, float(root.get('duration', '0'))
 
     # if this is in a summary.json
-    elif opts.output.endswith('.json'):
-        with open(opts.output, 'r') as f:
-            data = json.load(f)
-
-        # Navigate to 'statistic' key
-        statistics = data.get('statistic', {})
-
-        total = statistics.get('total', '0')
-        passed = statistics.get('passed', '0')
-        failed = int(statistics.get('failed', '0')) + int(statistics.get('broken', '0'))
-        skipped = int(statistics.get('skipped', '0')) + int(statistics.get('unknown', '0'))
-        elapsedtime = '0' # duration data not saved in the summary.json
-    else:
-        print("Invalid file type. Please provide either .xml or .json file.")
+    with open_input(output_name) as f:
+        data = json.load(f)
+
+    # Navigate to 'statistic' key
+    statistics = data.get('statistic', {})
+
+    total = int(statistics.get('total', '0'))
+    passed = int(statistics.get('passed', '0'))
+    failed = int(statistics.get('failed', '0')) + int(statistics.get('broken', '0'))
+    skipped = int(statistics.get('skipped', '0')) + int(statistics.get('unknown', '0'))
+    # duration data not saved in the summary.json
+    return total, passed, failed, skipped, 0
+
+
+def process_allure_results(opts, directories=None):
+    """Method for writing every test of allure-results directories as suite and test rows"""
+    from .allureparser import find_allure_results, parse_allure_results
+    directories = [opts.output] if directories is None else directories
+    # the result files of all directories share one thread pool and one execution
+    result_files = [name for directory in directories for name in find_allure_results(directory)]
+    if not result_files:
+        print("No *-result.json files found in {}".format(", ".join(directories)))
         return
 
-    # insert test results info into db
-    insert_into_execution_table(mydb, rootdb, opts.executionname, total, passed, failed, elapsedtime, stotal, spass,
-                                sfail, skipped, sskip, opts.projectname)
-
-    print("INFO: Writing execution results")
-    mydb.close()
+    mydb = connect_to_project_db(opts)
+    with close_on_error(mydb):
+        ingestion = check_ingestion(mydb, opts, result_files)
+        if ingestion and ingestion.skip:
+            mydb.close()
+            return
+        interner = create_interner(mydb, opts)
+        workers = getattr(opts, 'workers', 1)
+        records = parse_allure_results(result_files, opts.fullsuitename,
+                                       workers if workers > 1 else None)
+
+    with execution_transaction(mydb):
+        result_id = write_execution_records(mydb, opts, records, interner)
+        record_ingestion(mydb, ingestion, result_id, opts.projectname)
+        update_project_records(mydb, opts, records)
+        print("INFO: Writing execution results")
 
 
 # JUnit Report Functions
-def process_junit_report(opts):
-    mydb = connect_to_mysql_db(opts.host, opts.port, opts.username, opts.password, opts.projectname)
-    rootdb = connect_to_mysql_db(opts.host, opts.port, opts.username, opts.password, 'robothistoric')
+def process_junit_report(opts, output_names=None):
+    output_names = [opts.output] if output_names is None else output_names
+    stream = getattr(opts, 'engine', 'rf') == "stream"
+    mydb = connect_to_project_db(opts)
+    with close_on_error(mydb):
+        ingestion = check_ingestion(mydb, opts, output_names)
+        if ingestion and ingestion.skip:
+            mydb.close()
+            return
+        if stream:
+            interner = create_interner(mydb, opts)
+            records = parse_junit_reports(opts, output_names)
+        else:
+            summaries = map_output_files(read_junit_summary, output_names, getattr(opts, 'workers', 1))
+            total, passed, failed, skipped, elapsedtime = [sum(values) for values in zip(*summaries)]
+
+    if stream:
+        # every testsuite and testcase becomes a suite and test row
+        with execution_transaction(mydb):
+            result_id = write_execution_records(mydb, opts, records, interner)
+            record_ingestion(mydb, ingestion, result_id, opts.projectname)
+            update_project_records(mydb, opts, records)
+            print("INFO: Writing execution results")
+        return
 
     # Retrieving suite data is currently not implemented
     stotal = 0
@@ -313,59 +770,89 @@ def process_junit_report(opts):
     sfail = 0
     sskip = 0
 
-    root = ET.parse(opts.output).getroot()
-    testsuite = root.find('testsuite')
+    # insert test results info into db
+    with execution_transaction(mydb):
+        result_id = insert_into_execution_table(mydb, mydb, opts.executionname, total, passed, failed, elapsedtime,
+                                                stotal, spass, sfail, skipped, sskip, opts.projectname)
+        record_ingestion(mydb, ingestion, result_id, opts.projectname)
+        update_project_table(mydb, datetime.datetime.utcnow(), passed, total, opts.projectname)
+        print("INFO: Writing execution results")
+
+
+def read_junit_summary(output_name):
+    """Method for reading total, passed, failed, skipped and elapsed time of a JUnit report"""
+    import xml.etree.ElementTree as ET
+    with open_input(output_name) as f:
+        root = ET.parse(f).getroot()
+    testsuite = root if root.tag == 'testsuite' else root.find('testsuite')
 
     total = int(testsuite.get('tests', '0'))
     failed = int(testsuite.get('failures', '0')) + int(testsuite.get('errors', '0'))
     skipped = int(testsuite.get('skipped', '0'))
     passed = total - failed - skipped
-    elapsedtime = float(testsuite.get('time', '0'))
+    return total, passed, failed, skipped, float(testsuite.get('time', '0'))
 
 
-    # insert test results info into db
-    insert_into_execution_table(mydb, rootdb, opts.executionname, total, passed, failed, elapsedtime, stotal, spass,
-                                sfail, skipped, sskip, opts.projectname)
+def parse_junit_reports(opts, output_names):
+    """Method for reading every testsuite and testcase of JUnit reports into one set of records"""
+    from .junitparser import parse_junit_stream
+    parse = partial(parse_junit_stream, full_suite_name=opts.fullsuitename,
+                    use_mmap=getattr(opts, 'mmap', "False"))
+    return combine_records(map_output_files(parse, output_names, getattr(opts, 'workers', 1)),
+                           opts.fullsuitename)
+
+
+def process_statistics_report(opts, output_names=None):
+    output_names = [opts.output] if output_names is None else output_names
+    if not all(get_content_name(name).endswith('.json') for name in output_names):
+        print("Invalid file type. Please provide a .json file.")
+        return
 
-    print("INFO: Writing execution results")
-    mydb.close()
+    mydb = connect_to_project_db(opts)
+    with close_on_error(mydb):
+        ingestion = check_ingestion(mydb, opts, output_names)
+        if ingestion and ingestion.skip:
+            mydb.close()
+            return
+        counts = map_output_files(read_statistics_summary, output_names, getattr(opts, 'workers', 1))
+        total_count, passed_count, failed_count, skipped_count = [sum(values) for values in zip(*counts)]
 
+    # insert test results info into db (adjust this part as needed)
+    with execution_transaction(mydb):
+        result_id = insert_into_execution_table(mydb, mydb, opts.executionname, total_count, passed_count,
+                                                failed_count, 0, 0, 0, 0, skipped_count, 0, opts.projectname)
+        record_ingestion(mydb, ingestion, result_id, opts.projectname)
+        update_project_table(mydb, datetime.datetime.utcnow(), passed_count, total_count,
+                             opts.projectname)
+        print("INFO: Writing statistics results")
 
-def process_statistics_report(opts):
-    mydb = connect_to_mysql_db(opts.host, opts.port, opts.username, opts.password, opts.projectname)
-    rootdb = connect_to_mysql_db(opts.host, opts.port, opts.username, opts.password, 'robothistoric')
 
+def read_statistics_summary(output_name):
+    """Method for reading total, passed, failed and skipped counts of a statistics report"""
     # Initialize counts
     passed_count = 0
     failed_count = 0
     skipped_count = 0
     total_count = 0
 
-    if opts.output.endswith('.json'):
-        with open(opts.output, 'r') as f:
-            data = json.load(f)
-
-            # Iterate over properties and extract relevant counts
-            for prop in data.get('property', []):
-                if prop['name'] == 'PassedTestCount':
-                    passed_count = int(prop['value'])
-                elif prop['name'] == 'FailedTestCount':
-                    failed_count = int(prop['value'])
-                elif prop['name'] == 'SkippedTestCount':
-                    skipped_count = int(prop['value'])
-                elif prop['name'] == 'TotalTestCount':
-                    total_count = int(prop['value'])
+    with open_input(output_name) as f:
+        data = json.load(f)
 
-    else:
-        print("Invalid file type. Please provide a .json file.")
-        return
+        # Iterate over properties and extract relevant counts
+        for prop in data.get('property', []):
+            if prop['name'] == 'PassedTestCount':
+                passed_count = int(prop['value'])
+            elif prop['name'] == 'FailedTestCount':
+                failed_count = int(prop['value'])
+            elif prop['name'] == 'SkippedTestCount':
+                skipped_count = int(prop['value'])
+            elif prop['name'] == 'TotalTestCount':
+                total_count = int(prop['value'])
+    return total_count, passed_count, failed_count, skipped_count
 
-    # insert test results info into db (adjust this part as needed)
-    insert_into_execution_table(mydb, rootdb, opts.executionname, total_count, passed_count, failed_count, 0, 0, 0, 0, skipped_count, 0, opts.projectname)
 
-    print("INFO: Writing statistics results")
-    mydb.close()
+_default_sanitizer = MessageSanitizer()
 
 
 def remove_special_characters(string):
-    return re.sub(r'[^a-zA-Z0-9 ]', '', string)
+    return _default_sanitizer(string)
@@ -0,0 +1,61 @@
+"""Cleaning of test messages before they are stored in TB_TEST."""
+import string
+
+# characters a message keeps, everything else is removed
+KEPT_CHARACTERS = string.ascii_letters + string.digits + " "
+# bytes.translate drops these in C, without a regular expression pass
+DELETED_BYTES = bytes(code for code in range(128) if chr(code) not in KEPT_CHARACTERS)
+
+
+class UnicodeTable(dict):
+    """str.translate table keeping letters, digits and spaces of any script
+
+    Entries are worked out the first time a character is seen, so a message
+    costs one lookup per character once its alphabet is known.
+    """
+
+    def __missing__(self, code):
+        character = chr(code)
+        value = character if character.isalnum() or character == " " else None
+        self[code] = value
+        return value
+
+
+class MessageSanitizer:
+    """Removes special characters from messages and shortens long ones
+
+    ``max_length`` limits the stored message, 0 keeps it whole. Letters and
+    digits outside ASCII are removed unless ``keep_unicode`` is "True".
+    Messages are cut before cleaning where possible, so only the part that is
+    stored of a long stack trace is processed.
+    """
+
+    def __init__(self, max_length=0, keep_unicode="False"):
+        self.max_length = max(0, int(max_length or 0))
+        self.table = UnicodeTable() if keep_unicode == "True" else None
+
+    def __call__(self, message):
+        if not self.max_length or len(message) <= self.max_length:
+            return self.clean(message)
+        # cleaning never makes a message longer, so slices of max_length are
+        # cleaned until enough characters are kept
+        parts = []
+        kept = 0
+        for start in range(0, len(message), self.max_length):
+            part = self.clean(message[start:start + self.max_length])
+            parts.append(part)
+            kept += len(part)
+            if kept >= self.max_length:
+                break
+        return "".join(parts)[:self.max_length]
+
+    def clean(self, message):
+        if self.table is None or message.isascii():
+            return message.encode("ascii", "ignore").translate(None, DELETED_BYTES).decode("ascii")
+        return message.translate(self.table)
+
+
+def create_message_sanitizer(opts):
+    """Method for creating the MessageSanitizer configured by the parser options"""
+    return MessageSanitizer(getattr(opts, 'max_error_length', 0),
+                            getattr(opts, 'keep_unicode', "False"))
@@ -0,0 +1,206 @@
+"""Long running ingestion service that keeps imports and connections warm."""
+import copy
+import importlib
+import itertools
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+from .rfhistoricparser import rfhistoric_parser, close_connection_pools, DEFAULT_QUEUE_SIZE
+
+# options a client may set per upload, everything else comes from the serve command line
+JOB_OPTIONS = ('output', 'path', 'projectname', 'executionname', 'report_type', 'fullsuitename',
+               'engine', 'mmap', 'ignoreresult', 'skip_duplicates', 'replace', 'max_error_length',
+               'keep_unicode', 'normalize', 'bulk_load')
+MAX_KEPT_JOBS = 1000
+# imported on first use by rfhistoric_parser, serve loads them before accepting uploads
+JOB_MODULES = ('.resultparser', '.streamparser', '.junitparser', 'mysql.connector.pooling')
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class IngestionService:
+    """Queues ingestion jobs and runs them one at a time on a worker thread"""
+
+    def __init__(self, opts, queue_size=DEFAULT_QUEUE_SIZE):
+        self.opts = opts
+        self.queue = queue.Queue(queue_size)
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.thread = threading.Thread(target=self.run, name="rfhistoric-ingest", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.queue.put(None)
+        self.thread.join()
+
+    def job_options(self, overrides):
+        """Returns the serve options updated with the options of one upload"""
+        unknown = sorted(set(overrides) - set(JOB_OPTIONS))
+        if unknown:
+            raise ValueError("unsupported options: {}".format(", ".join(unknown)))
+        opts = copy.copy(self.opts)
+        for name, value in overrides.items():
+            setattr(opts, name, str(value))
+        opts.pool = "True"
+        return opts
+
+    def submit(self, overrides, cleanup=None):
+        """Queues a job, raising queue.Full when the service is saturated"""
+        opts = self.job_options(overrides)
+        with self.lock:
+            job_id = str(next(self.ids))
+            self.jobs[job_id] = {"id": job_id, "status": "queued", "output": opts.output}
+            while len(self.jobs) > MAX_KEPT_JOBS:
+                self.jobs.popitem(last=False)
+        try:
+            self.queue.put_nowait((job_id, opts, cleanup))
+        except queue.Full:
+            with self.lock:
+                self.jobs.pop(job_id, None)
+            raise
+        return job_id
+
+    def status(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id, **values):
+        with self.lock:
+            if job_id in self.jobs:
+                self.jobs[job_id].update(values)
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            job_id, opts, cleanup = item
+            self.update(job_id, status="running")
+            try:
+                rfhistoric_parser(opts)
+                self.update(job_id, status="done")
+            except SystemExit as e:
+                # rfhistoric_parser exits with a message on invalid input
+                self.update(job_id, status="failed", error=str(e.code))
+            except Exception as e:
+                self.update(job_id, status="failed", error=str(e))
+            finally:
+                if cleanup:
+                    shutil.rmtree(cleanup, ignore_errors=True)
+
+
+class IngestionHandler(BaseHTTPRequestHandler):
+    """HTTP front end of the IngestionService
+
+    POST /ingest takes a JSON object of options, e.g. ``{"output": "output.xml",
+    "path": "/results", "projectname": "demo", "executionname": "nightly"}``.
+    POST /upload?projectname=demo&executionname=nightly&filename=output.xml
+    takes the file itself as the request body. GET /jobs/<id> reports progress.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif url.path.startswith("/jobs/"):
+            job = self.server.service.status(url.path[len("/jobs/"):])
+            if job:
+                self.send_json(200, job)
+            else:
+                self.send_json(404, {"error": "unknown job"})
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        cleanup = None
+        try:
+            if url.path == "/ingest":
+                overrides = json.loads(self.read_body() or b"{}")
+                if not isinstance(overrides, dict):
+                    raise ValueError("request body must be a JSON object")
+            elif url.path == "/upload":
+                overrides = dict(parse_qsl(url.query))
+                filename = os.path.basename(overrides.pop("filename", "output.xml"))
+                cleanup = tempfile.mkdtemp(prefix="rfhistoric_")
+                self.save_body(os.path.join(cleanup, filename))
+                overrides.update(output=filename, path=cleanup)
+            else:
+                self.send_json(404, {"error": "not found"})
+                return
+            job_id = self.server.service.submit(overrides, cleanup)
+        except ValueError as e:
+            self.discard(cleanup)
+            self.send_json(400, {"error": str(e)})
+            return
+        except queue.Full:
+            self.discard(cleanup)
+            self.send_json(503, {"error": "ingestion queue is full"})
+            return
+        self.send_json(202, {"id": job_id, "status": "queued"})
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def save_body(self, filename):
+        remaining = int(self.headers.get("Content-Length", 0))
+        with open(filename, "wb") as f:
+            while remaining > 0:
+                chunk = self.rfile.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+
+    @staticmethod
+    def discard(directory):
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def send_json(self, code, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_server(opts):
+    """Method for creating the ingestion server and its worker"""
+    service = IngestionService(opts, getattr(opts, 'queue_size', DEFAULT_QUEUE_SIZE))
+    server = ThreadingHTTPServer((opts.serve_host, int(opts.serve_port)), IngestionHandler)
+    server.service = service
+    return server
+
+
+def load_job_modules():
+    """Method for importing the parsers and the MySQL driver, so the first job does not wait for them"""
+    for name in JOB_MODULES:
+        importlib.import_module(name, __package__)
+
+
+def serve(opts):
+    """Method for running the ingestion server until interrupted"""
+    load_job_modules()
+    server = create_server(opts)
+    server.service.start()
+    print("INFO: Listening on http://{}:{}".format(*server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.stop()
+        close_connection_pools()
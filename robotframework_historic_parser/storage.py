@@ -0,0 +1,163 @@
+"""Storage backends the parsed results are written to."""
+import datetime
+import os
+
+from .rfhistoricparser import ROOT_DB
+
+SQLITE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS TB_EXECUTION (Execution_Id INTEGER PRIMARY KEY, "
+    "Execution_Date TEXT, Execution_Desc TEXT, Execution_Total INTEGER, "
+    "Execution_Pass INTEGER, Execution_Fail INTEGER, Execution_Time REAL, "
+    "Execution_STotal INTEGER, Execution_SPass INTEGER, Execution_SFail INTEGER, "
+    "Execution_Skip INTEGER, Execution_SSkip INTEGER)",
+    "CREATE TABLE IF NOT EXISTS TB_SUITE (Suite_Id INTEGER PRIMARY KEY, Execution_Id INTEGER, "
+    "Suite_Name TEXT, Suite_Status TEXT, Suite_Total INTEGER, Suite_Pass INTEGER, "
+    "Suite_Fail INTEGER, Suite_Time REAL, Suite_Skip INTEGER)",
+    "CREATE TABLE IF NOT EXISTS TB_TEST (Test_Id INTEGER PRIMARY KEY, Execution_Id INTEGER, "
+    "Test_Name TEXT, Test_Status TEXT, Test_Time REAL, Test_Error TEXT, Test_Comment TEXT, "
+    "Test_Assigned_To TEXT, Test_ETA TEXT, Test_Review_By TEXT, Test_Issue_Type TEXT, "
+    "Test_Tag TEXT, Test_Updated TEXT)",
+    "CREATE TABLE IF NOT EXISTS TB_PROJECT (Project_Id INTEGER PRIMARY KEY, "
+    "Project_Name TEXT UNIQUE, Project_Desc TEXT, Project_Image TEXT, Created_Date TEXT, "
+    "Last_Updated TEXT, Total_Executions INTEGER, Recent_Pass_Perc REAL, "
+    "Overall_Pass_Perc REAL)",
+)
+
+
+class StorageBackend:
+    """Interface of the databases results are written to
+
+    ``connect`` returns a DB-API style connection (``cursor``,
+    ``start_transaction``, ``commit``, ``rollback`` and ``close``) that accepts the MySQL flavoured statements
+    of rfhistoricparser: ``%s`` placeholders and ``robothistoric.TB_PROJECT``.
+    """
+
+    name = None
+    # whether suite and test rows are written with server-side prepared statements
+    prepared_statements = False
+    # whether --bulk-load writes rows with LOAD DATA LOCAL INFILE
+    bulk_load = False
+
+    def connect(self, opts):
+        raise NotImplementedError
+
+
+class MySQLBackend(StorageBackend):
+    """Robot Framework Historic MySQL server, the default backend"""
+
+    name = "mysql"
+    prepared_statements = True
+    bulk_load = True
+
+    def connect(self, opts):
+        from . import rfhistoricparser
+        return rfhistoricparser.connect_to_project_mysql_db(opts)
+
+
+class SQLiteBackend(StorageBackend):
+    """Local SQLite file holding the project tables and TB_PROJECT
+
+    Meant for ingesting on build agents without a server; the file uses WAL
+    journaling and rows are bulk inserted with executemany, which reuses one
+    compiled statement from the sqlite3 statement cache.
+    """
+
+    name = "sqlite"
+
+    def connect(self, opts):
+        filename = getattr(opts, 'database_file', None) or opts.projectname + ".db"
+        return SQLiteConnection(filename, opts.projectname)
+
+
+class SQLiteConnection:
+    """sqlite3 connection translating the MySQL statements of the parser"""
+
+    def __init__(self, filename, projectname):
+        import sqlite3
+        if filename != ":memory:":
+            filename = os.path.abspath(os.path.expanduser(filename))
+        # the pipeline writer thread takes over the connection, never concurrently
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in SQLITE_SCHEMA:
+            self.connection.execute(statement)
+        self.connection.execute(
+            "INSERT OR IGNORE INTO TB_PROJECT (Project_Name, Created_Date, Total_Executions, "
+            "Recent_Pass_Perc) VALUES (?, ?, 0, 0)",
+            (projectname, format_datetime(datetime.datetime.utcnow())))
+        self.connection.commit()
+
+    def cursor(self, prepared=False):
+        # sqlite3 compiles and caches every statement, prepared is implied
+        return SQLiteCursor(self.connection.cursor())
+
+    def start_transaction(self):
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN")
+
+    def commit(self):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+    def close(self):
+        self.connection.close()
+
+
+class SQLiteCursor:
+    """sqlite3 cursor accepting %s placeholders and robothistoric tables"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    @property
+    def lastrowid(self):
+        return self.cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+    def execute(self, sql, params=()):
+        self.cursor.execute(translate_sql(sql), [convert_value(value) for value in params])
+
+    def executemany(self, sql, rows):
+        self.cursor.executemany(translate_sql(sql), rows)
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+
+def translate_sql(sql):
+    """Converts a MySQL statement of the parser to SQLite syntax"""
+    sql = sql.replace(ROOT_DB + ".", "").replace("%s", "?")
+    # INTEGER PRIMARY KEY columns are assigned automatically by SQLite
+    sql = sql.replace(" AUTO_INCREMENT", "").replace("INSERT IGNORE", "INSERT OR IGNORE")
+    # a write transaction in SQLite already excludes every other writer
+    return sql.replace(" LOCK IN SHARE MODE", "")
+
+
+def convert_value(value):
+    if isinstance(value, datetime.datetime):
+        return format_datetime(value)
+    return value
+
+
+def format_datetime(value):
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+BACKENDS = {backend.name: backend for backend in (MySQLBackend(), SQLiteBackend())}
+
+
+def get_backend(name):
+    """Returns the backend registered under name, MySQL by default"""
+    return BACKENDS.get(name, BACKENDS["mysql"])
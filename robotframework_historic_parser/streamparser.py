@@ -0,0 +1,167 @@
+"""Incremental output.xml parser that reads suite and test data only."""
+import datetime
+import xml.etree.ElementTree as ET
+
+from .compression import is_compressed, open_input
+from .mmapreader import iterparse_mapped
+from .records import ExecutionRecords, SuiteFrame
+
+TIMESTAMP_FORMAT = "%Y%m%d %H:%M:%S.%f"
+
+
+class OutputStreamParser:
+    """Parses output.xml with iterparse, emitting suite and test rows
+
+    Keyword, message and argument elements are dropped as soon as they are
+    closed, so memory use depends on the number of tests rather than on the
+    size of the file.
+    """
+
+    def __init__(self, full_suite_name="False", records=None):
+        self.full_suite_name = full_suite_name
+        self.records = ExecutionRecords() if records is None else records
+        self.suites = []
+        self.stack = []
+        self.test_name = None
+        self.test_status = ""
+        self.test_elapsedtime = 0
+        self.test_message = ""
+        self.test_tags = []
+
+    def parse(self, source):
+        """Parses a file name or file object and returns ExecutionRecords"""
+        return self.parse_events(ET.iterparse(source, events=("start", "end")))
+
+    def parse_events(self, events):
+        """Parses the start and end events of a whole file and returns ExecutionRecords"""
+        self.stack = []
+        self.handle_events(events)
+        return self.records
+
+    def handle_events(self, events):
+        """Handles iterparse or XMLPullParser events, possibly a few at a time"""
+        stack = self.stack
+        for event, elem in events:
+            if event == "start":
+                parent = stack[-1].tag if stack else None
+                if elem.tag == "suite" and parent in ("robot", "suite"):
+                    self.start_suite(elem)
+                elif elem.tag == "test" and parent == "suite":
+                    self.start_test(elem)
+                stack.append(elem)
+                continue
+            stack.pop()
+            parent = stack[-1].tag if stack else None
+            if elem.tag == "status":
+                if parent == "test":
+                    self.end_test_status(elem)
+                elif parent == "suite":
+                    self.end_suite_status(elem)
+            elif elem.tag == "tag" and parent == "test":
+                self.test_tags.append(elem.text or "")
+            elif elem.tag == "test" and parent == "suite":
+                self.end_test()
+            elif elem.tag == "suite" and parent in ("robot", "suite"):
+                self.end_suite()
+            # earlier siblings have been handled already, so drop them all
+            elem.clear()
+            if stack:
+                del stack[-1][:]
+
+    def start_suite(self, elem):
+        name = elem.get("name", "")
+        parent = self.suites[-1] if self.suites else None
+        longname = parent.longname + "." + name if parent else name
+        if not parent:
+            self.records.name = name
+        self.suites.append(SuiteFrame(name, longname))
+
+    def end_suite_status(self, elem):
+        suite = self.suites[-1]
+        suite.status = elem.get("status", "")
+        suite.elapsedtime = get_elapsed_millis(elem)
+
+    def end_suite(self):
+        suite = self.suites.pop()
+        if suite.index is not None:
+            name = suite.longname if self.full_suite_name == "True" else suite.name
+            self.records.set_suite(suite.index, name, suite.status, suite.total, suite.passed,
+                                   suite.failed, suite.elapsedtime, suite.skipped)
+        if self.suites:
+            self.suites[-1].add_counts(suite)
+        else:
+            self.records.elapsedtime = suite.elapsedtime
+
+    def start_test(self, elem):
+        self.test_name = elem.get("name", "")
+        self.test_status = ""
+        self.test_elapsedtime = 0
+        self.test_message = ""
+        self.test_tags = []
+
+    def end_test_status(self, elem):
+        self.test_status = elem.get("status", "")
+        self.test_elapsedtime = get_elapsed_millis(elem)
+        self.test_message = elem.text or ""
+
+    def end_test(self):
+        suite = self.suites[-1]
+        if suite.index is None:
+            suite.index = self.records.reserve_suite()
+        suite.add_status(self.test_status)
+        if self.full_suite_name == "True":
+            name = suite.longname + " - " + self.test_name
+        else:
+            name = suite.name + " - " + self.test_name
+        self.records.add_test(name, self.test_status, self.test_elapsedtime,
+                              self.test_message, normalize_tags(self.test_tags))
+
+
+def parse_output_stream(source, full_suite_name="False", records=None, use_mmap="False"):
+    """Method for parsing output.xml without building the result model"""
+    parser = OutputStreamParser(full_suite_name, records)
+    if isinstance(source, str):
+        if use_mmap == "True" and not is_compressed(source):
+            return parser.parse_events(iterparse_mapped(source))
+        # compressed files are inflated while they are parsed
+        with open_input(source) as f:
+            return parser.parse(f)
+    return parser.parse(source)
+
+
+def read_root_suite_name(filename):
+    """Returns the name of the top level suite without reading the rest of the file"""
+    with open_input(filename) as source:
+        for _, elem in ET.iterparse(source, events=("start",)):
+            if elem.tag == "suite":
+                return elem.get("name", "")
+    return ""
+
+
+def get_elapsed_millis(status):
+    """Returns elapsed milliseconds of a RF 7 or earlier status element"""
+    elapsed = status.get("elapsed")
+    if elapsed is not None:
+        return round(float(elapsed) * 1000)
+    start = parse_timestamp(status.get("starttime"))
+    end = parse_timestamp(status.get("endtime"))
+    if start is None or end is None:
+        return 0
+    return round((end - start).total_seconds() * 1000)
+
+
+def parse_timestamp(timestamp):
+    """Parses RF 6 style timestamps, returning None for N/A values"""
+    if not timestamp or timestamp == "N/A":
+        return None
+    return datetime.datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+
+
+def normalize_tags(tags):
+    """Sorts and de-duplicates tags like robot.model.Tags does"""
+    normalized = {}
+    for tag in tags:
+        key = tag.lower().replace(" ", "").replace("_", "")
+        if key and key != "none" and key not in normalized:
+            normalized[key] = tag
+    return [normalized[key] for key in sorted(normalized)]
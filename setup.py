@@ -24,7 +24,7 @@ setup(
     url='https://github.com/adiralashiva8/robotframework-historic-parser',
     license='MIT',
 
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     include_package_data=True,
     zip_safe=False,
 
@@ -0,0 +1,108 @@
+"""Unit tests for the allure-results directory parser"""
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from argparse import Namespace
+from unittest.mock import patch
+
+from robotframework_historic_parser.allureparser import (
+    find_allure_results,
+    parse_allure_results,
+    read_allure_result,
+)
+from robotframework_historic_parser.rfhistoricparser import process_allure_report
+
+
+def labels(**values):
+    return [{"name": name, "value": value} for name, value in values.items()]
+
+
+RESULTS = {
+    "b1-result.json": {"name": "login", "status": "passed", "start": 1000, "stop": 3000,
+                       "labels": labels(parentSuite="web", suite="auth", tag="smoke")},
+    "a2-result.json": {"name": "logout", "status": "broken", "start": 3000, "stop": 3500,
+                       "statusDetails": {"message": "Element not found", "trace": "..."},
+                       "labels": labels(parentSuite="web", suite="auth")},
+    "c3-result.json": {"name": "search", "status": "skipped", "start": 500, "stop": 600,
+                       "labels": labels(suite="search", tag="Slow")},
+    "d4-result.json": {"name": "orphan", "status": "unknown"},
+    "e5-container.json": {"uuid": "container", "children": ["b1"]},
+}
+
+
+class TestAllureParser(unittest.TestCase):
+    """Unit Tests for allureparser.py"""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        self.results = os.path.join(self.workdir.name, "allure-results")
+        os.makedirs(self.results)
+        for name, data in RESULTS.items():
+            with open(os.path.join(self.results, name), "w", encoding="utf-8") as f:
+                json.dump(data, f)
+
+    def test_find_allure_results(self):
+        """Only test result files are listed, container files are skipped"""
+        self.assertEqual(["a2-result.json", "b1-result.json", "c3-result.json",
+                          "d4-result.json"],
+                         [os.path.basename(name) for name in find_allure_results(self.results)])
+
+    def test_read_allure_result(self):
+        """Suite labels, status, duration, message and tags are read"""
+        self.assertEqual((3000, ("web", "auth"), "logout", "FAIL", 500, "Element not found", []),
+                         read_allure_result(os.path.join(self.results, "a2-result.json")))
+        self.assertEqual((0, ("Allure",), "orphan", "SKIP", 0, "", []),
+                         read_allure_result(os.path.join(self.results, "d4-result.json")))
+
+    def test_read_unreadable_result(self):
+        """Truncated result files are skipped with a warning"""
+        path = os.path.join(self.results, "f6-result.json")
+        with open(path, "w") as f:
+            f.write('{"name": "cut')
+        with patch("builtins.print") as mock_print:
+            self.assertIsNone(read_allure_result(path))
+        self.assertIn("Skipping unreadable Allure result", mock_print.call_args[0][0])
+
+    def test_parse_allure_results(self):
+        """Tests are grouped into suites and ordered by start time"""
+        records = parse_allure_results(find_allure_results(self.results), "True", workers=2)
+        self.assertEqual("Allure", records.name)
+        self.assertEqual([("Allure", "SKIP", 1, 0, 0, 0, 1),
+                          ("search", "SKIP", 1, 0, 0, 100, 1),
+                          ("web.auth", "FAIL", 2, 1, 1, 2500, 0)], records.suites)
+        self.assertEqual([("Allure - orphan", "SKIP", 0, "", ()),
+                          ("search - search", "SKIP", 100, "", ("Slow",)),
+                          ("web.auth - login", "PASS", 2000, "", ("smoke",)),
+                          ("web.auth - logout", "FAIL", 500, "Element not found", ())],
+                         records.tests)
+        self.assertEqual(3500, records.elapsedtime)
+
+    def test_process_allure_report_directory(self):
+        """An allure-results directory is stored with a row per test"""
+        database_file = os.path.join(self.workdir.name, "historic.db")
+        opts = Namespace(report_type="Allure", backend="sqlite", database_file=database_file,
+                         projectname="project", executionname="allure", fullsuitename="False",
+                         output=self.results, workers=1)
+        with patch("builtins.print"):
+            process_allure_report(opts)
+        with sqlite3.connect(database_file) as connection:
+            self.assertEqual([(4, 1, 1, 2, 3, 1)], connection.execute(
+                "SELECT Execution_Total, Execution_Pass, Execution_Fail, Execution_Skip, "
+                "Execution_STotal, Execution_SFail FROM TB_EXECUTION").fetchall())
+            self.assertEqual(["auth - login", "auth - logout"], [row[0] for row in connection.execute(
+                "SELECT Test_Name FROM TB_TEST WHERE Test_Name LIKE 'auth%' ORDER BY Test_Id")])
+
+    def test_process_allure_report_empty_directory(self):
+        """A directory without result files is reported and nothing is stored"""
+        empty = os.path.join(self.workdir.name, "empty")
+        os.makedirs(empty)
+        opts = Namespace(report_type="Allure", output=empty)
+        with patch("builtins.print") as mock_print, \
+                patch("robotframework_historic_parser.rfhistoricparser.connect_to_project_db") \
+                as mock_connect:
+            process_allure_report(opts)
+        mock_connect.assert_not_called()
+        mock_print.assert_called_once_with("No *-result.json files found in " + empty)
@@ -0,0 +1,72 @@
+"""Smoke tests keeping the benchmark harness and its generators working"""
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from benchmarks.generators import suite_layout, write_output_xml, write_junit_xml
+from benchmarks.mmap_benchmark import main as mmap_main
+from benchmarks.name_benchmark import main as name_main
+from benchmarks.run_benchmarks import main
+from robotframework_historic_parser.resultparser import parse_output_result
+from robotframework_historic_parser.streamparser import parse_output_stream
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Unit Tests for the benchmark harness"""
+
+    def test_suite_layout(self):
+        """Tests are spread over width ** depth leaf suites"""
+        name, children, count = suite_layout(10, 2, 2)
+        self.assertEqual(("Suite 0-0", 0), (name, count))
+        leaves = [leaf for child in children for leaf in child[1]]
+        self.assertEqual([3, 3, 2, 2], [leaf[2] for leaf in leaves])
+
+    def test_generated_output_is_valid(self):
+        """Generated outputs parse the same with both engines and schemas"""
+        with tempfile.TemporaryDirectory() as workdir:
+            for schema in (4, 5):
+                output = write_output_xml(os.path.join(workdir, "output.xml"), 25, depth=1,
+                                          width=3, schema=schema)
+                expected = parse_output_result([output])
+                records = parse_output_stream(output)
+                self.assertEqual(25, len(records.tests))
+                self.assertEqual(expected.suites, records.suites)
+                self.assertEqual(expected.tests, records.tests)
+
+    def test_generated_junit_counts(self):
+        """Generated JUnit reports hold the requested number of tests"""
+        with tempfile.TemporaryDirectory() as workdir:
+            with open(write_junit_xml(os.path.join(workdir, "junit.xml"), 25, suites=4)) as f:
+                self.assertEqual(25, f.read().count("<testcase "))
+
+    def test_run_benchmarks(self):
+        """The harness runs every benchmark on small files"""
+        with redirect_stdout(io.StringIO()) as output:
+            results = main(["--sizes", "20", "--depth", "1"])
+        self.assertIn("rows/sec", output.getvalue())
+        benchmarks = {row["benchmark"]: row for row in results}
+        self.assertEqual({"RF parse (rf)", "RF parse (stream)", "RF write", "JUnit",
+                          "JUnit (stream)", "Allure", "Allure (results)", "Statistics"},
+                         set(benchmarks))
+        self.assertEqual(24, benchmarks["RF parse (stream)"]["rows"])
+        self.assertEqual(24, benchmarks["RF write"]["rows"])
+        self.assertEqual(1, benchmarks["JUnit"]["rows"])
+        # the execution, the generated suites holding tests and a row per test
+        self.assertEqual(1 + 10 + 20, benchmarks["JUnit (stream)"]["rows"])
+        self.assertEqual(1 + 10 + 20, benchmarks["Allure (results)"]["rows"])
+
+    def test_name_benchmark(self):
+        """The name benchmark reports both variants for both name modes"""
+        with redirect_stdout(io.StringIO()) as output:
+            rows = name_main(["--tests", "20", "--suites", "3", "--rounds", "1"])
+        self.assertIn("us/test", output.getvalue())
+        self.assertEqual(["False", "True"], [row["fullsuitename"] for row in rows])
+
+    def test_mmap_benchmark(self):
+        """The mmap benchmark reports both reads for output.xml and JUnit files"""
+        with redirect_stdout(io.StringIO()) as output:
+            rows = mmap_main(["--megabytes", "0.05", "--rounds", "1"])
+        self.assertIn("mmap MB/s", output.getvalue())
+        self.assertEqual(["output.xml", "JUnit"], [row["file"] for row in rows])
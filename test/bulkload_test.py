@@ -0,0 +1,135 @@
+"""Unit tests for bulk loading rows with LOAD DATA LOCAL INFILE"""
+import os
+import unittest
+from argparse import Namespace
+from unittest.mock import Mock, call, patch
+
+from robotframework_historic_parser.bulkload import (
+    BulkLoadWriter,
+    create_bulk_writer,
+    format_field,
+    parse_field,
+)
+from robotframework_historic_parser.rfhistoricparser import (
+    SUITE_INSERT_SQL,
+    TEST_INSERT_SQL,
+    BatchWriter,
+    connect_to_project_db,
+    create_batch_writer,
+    write_test_rows,
+)
+
+
+class LocalInfileError(Exception):
+    """Error raised by a server with local_infile disabled"""
+    errno = 3948
+
+
+class TestBulkLoad(unittest.TestCase):
+    """Unit Tests for bulkload.py"""
+
+    def setUp(self):
+        self.db = Mock()
+        self.cursor = self.db.cursor.return_value
+        self.loaded = []
+        print_patch = patch("builtins.print")
+        print_patch.start()
+        self.addCleanup(print_patch.stop)
+
+    def read_loaded_file(self, sql, params=()):
+        with open(params[0], encoding="utf-8", newline="\n") as f:
+            self.loaded.append((sql, f.read()))
+
+    def test_format_field(self):
+        """Separators and backslashes are escaped, None becomes NULL"""
+        self.assertEqual("\\N", format_field(None))
+        self.assertEqual("0.5", format_field(0.5))
+        self.assertEqual("a\\tb\\nc\\\\d\\re", format_field("a\tb\nc\\d\re"))
+        for value in ("plain", "a\tb\nc\\d\re\0f", "\\N", "\\", ""):
+            self.assertEqual(value, parse_field(format_field(value)))
+        self.assertIsNone(parse_field(format_field(None)))
+
+    def test_load_rows(self):
+        """Rows of every statement are loaded from their own file"""
+        self.cursor.execute.side_effect = self.read_loaded_file
+        writer = BulkLoadWriter(self.db, 1000)
+        directory = writer.directory
+        write_test_rows(writer, 7, [("S - A", "FAIL", 60000, "Bad\tthing!", ("b", "a")),
+                                    ("S - B", "PASS", 0, "", ())])
+        writer.insert(SUITE_INSERT_SQL, (7, "S", "FAIL", 2, 1, 1, 1.0, 0))
+        writer.close()
+
+        self.assertEqual(2, len(self.loaded))
+        test_sql, test_rows = self.loaded[0]
+        self.assertTrue(test_sql.startswith("LOAD DATA LOCAL INFILE %s INTO TABLE TB_TEST "))
+        self.assertTrue(test_sql.endswith("(Execution_Id, Test_Name, Test_Status, Test_Time, "
+                                          "Test_Error, Test_Tag)"))
+        self.assertEqual("7\tS - A\tFAIL\t1.0\tBadthing\t[b, a]\n7\tS - B\tPASS\t0.0\t\t[]\n",
+                         test_rows)
+        self.assertIn("INTO TABLE TB_SUITE ", self.loaded[1][0])
+        self.assertFalse(os.path.exists(directory))
+
+    def test_flush_loads_rows_so_far(self):
+        """Each flush loads and removes the files written since the previous one"""
+        self.cursor.execute.side_effect = self.read_loaded_file
+        writer = BulkLoadWriter(self.db, 1000)
+        writer.insert(TEST_INSERT_SQL, (1, "A", "PASS", 0.0, "", "[]"))
+        writer.flush()
+        writer.insert(TEST_INSERT_SQL, (1, "B", "PASS", 0.0, "", "[]"))
+        writer.close()
+        self.assertEqual(["1\tA\tPASS\t0.0\t\t[]\n", "1\tB\tPASS\t0.0\t\t[]\n"],
+                         [rows for _, rows in self.loaded])
+
+    def test_fallback_to_batched_inserts(self):
+        """Rows are inserted in batches when the server refuses local files"""
+        self.cursor.execute.side_effect = LocalInfileError("Loading local data is disabled")
+        writer = BulkLoadWriter(self.db, 2)
+        writer.insert(TEST_INSERT_SQL, (1, "A\tx", "PASS", 0.0, None, "[]"))
+        writer.insert(TEST_INSERT_SQL, (1, "B", "PASS", 0.0, "", "[]"))
+        writer.flush()
+        writer.insert(TEST_INSERT_SQL, (1, "C", "PASS", 0.0, "", "[]"))
+        writer.close()
+
+        self.assertEqual(1, self.cursor.execute.call_count)
+        self.assertEqual([call(TEST_INSERT_SQL, [("1", "A\tx", "PASS", "0.0", None, "[]"),
+                                                 ("1", "B", "PASS", "0.0", "", "[]")]),
+                          call(TEST_INSERT_SQL, [(1, "C", "PASS", 0.0, "", "[]")])],
+                         self.cursor.executemany.call_args_list)
+        self.assertFalse(os.path.exists(writer.directory))
+
+    def test_other_errors_are_raised(self):
+        """Failures other than a refused local file abort the execution"""
+        self.cursor.execute.side_effect = ValueError("boom")
+        writer = BulkLoadWriter(self.db, 2)
+        writer.insert(TEST_INSERT_SQL, (1, "A", "PASS", 0.0, "", "[]"))
+        with self.assertRaises(ValueError):
+            writer.close()
+        self.assertFalse(os.path.exists(writer.directory))
+
+    def test_create_bulk_writer_probes_server(self):
+        """Servers with local_infile disabled get a BatchWriter right away"""
+        self.cursor.fetchone.return_value = (0,)
+        self.assertIsInstance(create_bulk_writer(self.db, 10), BatchWriter)
+        self.cursor.fetchone.return_value = (1,)
+        writer = create_bulk_writer(self.db, 10, prepared=True)
+        self.assertIsInstance(writer, BulkLoadWriter)
+        self.assertTrue(writer.prepared)
+        writer.close()
+
+    def test_create_batch_writer_bulk_load(self):
+        """Only backends supporting it bulk load"""
+        self.cursor.fetchone.return_value = (1,)
+        writer = create_batch_writer(self.db, Namespace(backend="mysql", bulk_load="True"))
+        self.assertIsInstance(writer, BulkLoadWriter)
+        writer.close()
+        self.assertIsInstance(create_batch_writer(self.db, Namespace(backend="sqlite",
+                                                                     bulk_load="True")),
+                              BatchWriter)
+
+    @patch("mysql.connector.connect")
+    def test_connection_allows_local_infile(self, connect_mock):
+        """Bulk loading connections allow the client to send local files"""
+        opts = Namespace(host="host", port=3306, username="user", password="pwd",
+                         projectname="project", bulk_load="True")
+        connect_to_project_db(opts)
+        self.assertTrue(connect_mock.call_args.kwargs["allow_local_infile"])
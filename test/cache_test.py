@@ -0,0 +1,91 @@
+"""Unit tests for the parse cache of Robot Framework Historic Parser"""
+import os
+import tempfile
+import unittest
+from argparse import Namespace
+from unittest.mock import patch
+
+from robotframework_historic_parser.cache import ParseCache
+from robotframework_historic_parser.records import ExecutionRecords
+from robotframework_historic_parser.rfhistoricparser import load_output_records
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+
+
+def make_records(tests=2):
+    records = ExecutionRecords("Suite & Other", 1500)
+    records.add_suite("Suite", "FAIL", tests, 1, tests - 1, 1500, 0)
+    for index in range(tests):
+        records.add_test("Suite - Test %s" % index, "PASS" if index == 0 else "FAIL", 700,
+                         "Expected 'ä' but got \"b\"\n  trace", ["smoke", "tag %s" % index])
+    return records
+
+
+class TestParseCache(unittest.TestCase):
+    """Unit Tests for cache.py"""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        self.directory = os.path.join(self.workdir.name, "cache")
+
+    def test_round_trip(self):
+        """Records read back from the cache equal the stored ones"""
+        cache = ParseCache(self.directory, 1024 * 1024)
+        records = make_records()
+        cache.store("key", records)
+        loaded = cache.load("key")
+        self.assertEqual(("Suite & Other", 1500), (loaded.name, loaded.elapsedtime))
+        self.assertEqual(records.suites, loaded.suites)
+        self.assertEqual(records.tests, loaded.tests)
+        self.assertEqual(records.test_totals(), loaded.test_totals())
+
+    def test_missing_and_corrupt_entries(self):
+        cache = ParseCache(self.directory, 1024 * 1024)
+        self.assertIsNone(cache.load("missing"))
+        os.makedirs(self.directory)
+        with open(cache.path("corrupt"), "w") as f:
+            f.write('{"name": "Suite"')
+        self.assertIsNone(cache.load("corrupt"))
+
+    def test_key_depends_on_options(self):
+        key = ParseCache.key("hash", "rf", "False")
+        self.assertEqual(key, ParseCache.key("hash", "rf", "False"))
+        self.assertNotEqual(key, ParseCache.key("other", "rf", "False"))
+        self.assertNotEqual(key, ParseCache.key("hash", "stream", "False"))
+        self.assertNotEqual(key, ParseCache.key("hash", "rf", "True"))
+
+    def test_evicts_least_recently_used(self):
+        """The cache is trimmed to its size, keeping recently read entries"""
+        cache = ParseCache(self.directory, 1024 * 1024)
+        cache.store("first", make_records(100))
+        cache.store("second", make_records(100))
+        os.utime(cache.path("first"), (1, 1))
+        os.utime(cache.path("second"), (2, 2))
+        cache.load("first")
+        size = os.path.getsize(cache.path("first"))
+        cache.max_bytes = 2 * size + size // 2
+        cache.store("third", make_records(100))
+        self.assertEqual(["first.jsonl", "third.jsonl"], sorted(os.listdir(self.directory)))
+
+    def test_load_output_records_uses_cache(self):
+        """A second ingest of the same file is read from the cache instead of parsed"""
+        opts = Namespace(report_type="RF", engine="stream", workers=1, fullsuitename="False",
+                         cache_dir=self.directory, cache_size=1)
+        output = [ROOT_PATH + "/test_files/output_test_rf7.xml"]
+        with patch("builtins.print"):
+            parsed = load_output_records(opts, output)
+            with patch("robotframework_historic_parser.rfhistoricparser.parse_output_files") \
+                    as mock_parse:
+                cached = load_output_records(opts, output)
+        mock_parse.assert_not_called()
+        self.assertEqual(parsed.suites, cached.suites)
+        self.assertEqual(parsed.tests, cached.tests)
+        self.assertEqual(parsed.elapsedtime, cached.elapsedtime)
+        self.assertEqual(1, len(os.listdir(self.directory)))
+
+    def test_load_output_records_without_cache(self):
+        opts = Namespace(report_type="RF", engine="stream", workers=1, fullsuitename="False")
+        with patch("robotframework_historic_parser.rfhistoricparser.parse_output_files") \
+                as mock_parse:
+            self.assertIs(mock_parse.return_value, load_output_records(opts, ["output.xml"]))
@@ -0,0 +1,87 @@
+"""Unit tests for reading compressed result files"""
+import gzip
+import lzma
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from argparse import Namespace
+from unittest.mock import patch
+
+from robotframework_historic_parser.compression import get_content_name, open_input
+from robotframework_historic_parser.junitparser import parse_junit_stream
+from robotframework_historic_parser.resultparser import parse_output_result
+from robotframework_historic_parser.rfhistoricparser import process_statistics_report
+from robotframework_historic_parser.streamparser import parse_output_stream
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+OUTPUT_FILE = ROOT_PATH + "/test_files/output_test_rf7.xml"
+
+
+class TestCompression(unittest.TestCase):
+    """Unit Tests for compression.py"""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+
+    def compress(self, source, suffix):
+        name = os.path.join(self.workdir.name, os.path.basename(source) + suffix)
+        opener = {".gz": gzip.open, ".xz": lzma.open}[suffix]
+        with open(source, "rb") as f, opener(name, "wb") as compressed:
+            shutil.copyfileobj(f, compressed)
+        return name
+
+    def test_get_content_name(self):
+        self.assertEqual("output.xml", get_content_name("output.xml.gz"))
+        self.assertEqual("output.json", get_content_name("output.json.zst"))
+        self.assertEqual("output.xml", get_content_name("output.xml"))
+
+    def test_open_input(self):
+        """Compressed files read back as the original bytes"""
+        with open(OUTPUT_FILE, "rb") as f:
+            data = f.read()
+        for suffix in (".gz", ".xz"):
+            with open_input(self.compress(OUTPUT_FILE, suffix)) as f:
+                self.assertEqual(data, f.read())
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_open_zstd_frames(self):
+        """Every frame of a multi-frame zstd file is read"""
+        name = os.path.join(self.workdir.name, "output.xml.zst")
+        compressor = zstandard.ZstdCompressor()
+        with open(name, "wb") as f:
+            f.write(compressor.compress(b"<robot>") + compressor.compress(b"</robot>"))
+        with open_input(name) as f:
+            self.assertEqual(b"<robot></robot>", f.read())
+
+    def test_parsers_read_compressed_outputs(self):
+        """Both output.xml engines and the JUnit reader parse compressed files"""
+        compressed = self.compress(OUTPUT_FILE, ".gz")
+        expected = parse_output_stream(OUTPUT_FILE, "True")
+        for records in (parse_output_stream(compressed, "True"),
+                        parse_output_result([compressed], "True")):
+            self.assertEqual(expected.suites, records.suites)
+            self.assertEqual(expected.tests, records.tests)
+        junit = ROOT_PATH + "/test_files/junit_test.xml"
+        self.assertEqual(parse_junit_stream(junit).tests,
+                         parse_junit_stream(self.compress(junit, ".xz")).tests)
+
+    def test_process_statistics_report_compressed(self):
+        """Summary reports are read from compressed files as well"""
+        database_file = os.path.join(self.workdir.name, "historic.db")
+        output = self.compress(ROOT_PATH + "/test_files/statistics_test.json", ".gz")
+        opts = Namespace(backend="sqlite", database_file=database_file, projectname="project",
+                         executionname="statistics", report_type="Statistics", output=output)
+        with patch("builtins.print"):
+            process_statistics_report(opts)
+        with sqlite3.connect(database_file) as connection:
+            self.assertEqual([(4, 2, 1, 1)], connection.execute(
+                "SELECT Execution_Total, Execution_Pass, Execution_Fail, Execution_Skip "
+                "FROM TB_EXECUTION").fetchall())
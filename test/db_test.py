@@ -1,8 +1,17 @@
 """Unit tests for functions using db in Robotframework Historic Parser"""
 import unittest
+from argparse import Namespace
 from unittest.mock import patch, MagicMock, call
 
-from robotframework_historic_parser.rfhistoricparser import connect_to_mysql_db
+from mysql.connector.connection import MySQLConnection
+from mysql.connector.pooling import MySQLConnectionPool, PooledMySQLConnection
+
+from robotframework_historic_parser.rfhistoricparser import (
+    connect_to_mysql_db,
+    connect_to_project_db,
+    get_pooled_connection,
+    close_connection_pools,
+)
 
 
 class TestDBFunctions(unittest.TestCase):
@@ -23,3 +32,52 @@ class TestDBFunctions(unittest.TestCase):
         args = (1, 2, 3, 4, 5)
         connect_to_mysql_db(*args)
         self.assertRaises(AttributeError)
+
+    def test_get_pooled_connection_reuses_pool(self):
+        """Tests pooled connections share one pool per server and user"""
+        connection = MagicMock(spec=MySQLConnection)
+        pool = MySQLConnectionPool(pool_name='test_pool')
+        borrowed = [PooledMySQLConnection(pool, connection), PooledMySQLConnection(pool, connection)]
+        with patch('mysql.connector.pooling.MySQLConnectionPool') as pool_mock:
+            pool_mock.return_value.get_connection.side_effect = borrowed
+            first = get_pooled_connection('host', 3306, 'user', 'pwd', 'project_a')
+            second = get_pooled_connection('host', 3306, 'user', 'pwd', 'project_b')
+            self.assertEqual(1, pool_mock.call_count)
+            self.assertEqual([first, second], borrowed)
+            # the database is selected on the wrapped connection, not on the wrapper
+            self.assertEqual([call('project_a'), call('project_b')],
+                             connection.cmd_init_db.call_args_list)
+            close_connection_pools()
+            pool_mock.return_value._remove_connections.assert_called_once()
+
+    @patch('mysql.connector.pooling.MySQLConnectionPool')
+    def test_get_pooled_connection_unknown_database(self, pool_mock):
+        """Tests a connection whose database cannot be selected goes back to the pool"""
+        connection = pool_mock.return_value.get_connection.return_value
+        connection.cmd_init_db.side_effect = Exception('Unknown database')
+        with patch('builtins.print'):
+            self.assertIsNone(get_pooled_connection('host', 3306, 'user', 'pwd', 'project'))
+        connection.close.assert_called_once()
+        close_connection_pools()
+
+    @patch('mysql.connector.pooling.MySQLConnectionPool')
+    def test_get_pooled_connection_error(self, pool_mock):
+        """Tests pooled connection failures are reported instead of raised"""
+        pool_mock.return_value.get_connection.side_effect = Exception('pool exhausted')
+        self.assertIsNone(get_pooled_connection('host', 3306, 'user', 'pwd', 'project'))
+        close_connection_pools()
+
+    @patch('robotframework_historic_parser.rfhistoricparser.get_pooled_connection')
+    @patch('mysql.connector.connect')
+    def test_connect_to_project_db(self, connect_mock, pooled_mock):
+        """Tests the project connection is pooled only when requested"""
+        opts = Namespace(host='host', port=3306, username='user', password='pwd',
+                         projectname='project', pool='False')
+        connect_to_project_db(opts)
+        connect_mock.assert_called_once()
+        pooled_mock.assert_not_called()
+
+        opts.pool = 'True'
+        opts.pool_size = 3
+        connect_to_project_db(opts)
+        pooled_mock.assert_called_once_with('host', 3306, 'user', 'pwd', 'project', 3, False)
@@ -0,0 +1,89 @@
+"""Unit tests for the follow mode of Robot Framework Historic Parser"""
+import os
+import sqlite3
+import tempfile
+import unittest
+from argparse import Namespace
+from unittest.mock import patch
+
+from robotframework_historic_parser.rfhistoricparser import rfhistoric_parser
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+
+
+class TestFollow(unittest.TestCase):
+    """Unit Tests for follow.py"""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        self.database_file = os.path.join(self.workdir.name, "historic.db")
+        self.output = os.path.join(self.workdir.name, "output.xml")
+        with open(ROOT_PATH + "/test_files/output_test_rf7.xml", "rb") as f:
+            content = f.read()
+        # the run is written in pieces, every piece closing one more test
+        ends = [content.index(b"</test>", content.index(b"<test ")) + len(b"</test>")]
+        ends.append(content.index(b"</test>", ends[0]) + len(b"</test>"))
+        self.pieces = [content[:ends[0]], content[ends[0]:ends[1]], content[ends[1]:]]
+
+    def make_opts(self, **kwargs):
+        options = dict(ignoreresult="False", path=self.workdir.name, output="output.xml",
+                       report_type="RF", backend="sqlite", database_file=self.database_file,
+                       projectname="project", executionname="live", fullsuitename="False",
+                       follow="True", follow_interval=0.5, follow_timeout=0)
+        options.update(kwargs)
+        return Namespace(**options)
+
+    def query(self, sql):
+        with sqlite3.connect(self.database_file) as connection:
+            return connection.execute(sql).fetchall()
+
+    def append(self, piece):
+        with open(self.output, "ab") as f:
+            f.write(piece)
+
+    def test_follow_ingests_tests_while_running(self):
+        """Tests are committed as they finish and totals are final at the end"""
+        pieces = list(self.pieces)
+        seen = []
+
+        def sleep(seconds):
+            # called whenever the follower caught up with the writer
+            if os.path.exists(self.output):
+                seen.append(self.query("SELECT COUNT(*) FROM TB_TEST")[0][0])
+            self.append(pieces.pop(0))
+
+        with patch("robotframework_historic_parser.follow.time.sleep", side_effect=sleep), \
+                patch("builtins.print"):
+            rfhistoric_parser(self.make_opts())
+
+        self.assertEqual([1, 2], seen)
+        self.assertEqual([("live", 3, 1, 1, 1, 1, 0, 1, 1, 0)],
+                         self.query("SELECT Execution_Desc, Execution_Total, Execution_Pass, "
+                                    "Execution_Fail, Execution_Skip, Execution_STotal, "
+                                    "Execution_SPass, Execution_SFail, Execution_Skip, "
+                                    "Execution_SSkip FROM TB_EXECUTION"))
+        self.assertEqual([("RFH Parser Test", "FAIL", 3)],
+                         self.query("SELECT Suite_Name, Suite_Status, Suite_Total FROM TB_SUITE"))
+        self.assertEqual(3, self.query("SELECT COUNT(*) FROM TB_TEST")[0][0])
+        self.assertEqual([(1, 33.33)],
+                         self.query("SELECT Total_Executions, Recent_Pass_Perc FROM TB_PROJECT"))
+
+    def test_follow_timeout_finalises_partial_run(self):
+        """An output that stops growing is finalised with the tests seen so far"""
+        self.append(self.pieces[0])
+        with patch("robotframework_historic_parser.follow.time.sleep"), \
+                patch("robotframework_historic_parser.follow.time.monotonic",
+                      side_effect=[0, 0, 5, 11]), \
+                patch("builtins.print") as mock_print:
+            rfhistoric_parser(self.make_opts(follow_timeout=10))
+
+        self.assertIn("did not grow for 10.0 seconds", mock_print.call_args_list[-2].args[0])
+        # the suite never ended, so only its test was written
+        self.assertEqual([(1, 0)], self.query("SELECT Execution_Total, Execution_STotal "
+                                              "FROM TB_EXECUTION"))
+        self.assertEqual([(1,)], self.query("SELECT Total_Executions FROM TB_PROJECT"))
+
+    def test_follow_single_output_only(self):
+        with self.assertRaises(SystemExit):
+            rfhistoric_parser(self.make_opts(output="a.xml,b.xml"))
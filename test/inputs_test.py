@@ -0,0 +1,56 @@
+"""Unit tests for the discovery of result files"""
+import os
+import tempfile
+import unittest
+
+from robotframework_historic_parser.inputs import discover_inputs
+
+
+class TestInputs(unittest.TestCase):
+    """Unit Tests for inputs.py"""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        self.path = self.workdir.name
+        for name in ("output.xml", "log.html", "pabot/0/output.xml", "pabot/1/output.xml",
+                     "pabot/1/xunit.xml", "pabot/2/output.xml.gz", "junit/TEST-a.xml", "junit/nested/TEST-b.xml",
+                     "allure-results/a-result.json", "summary.json"):
+            name = os.path.join(self.path, name)
+            os.makedirs(os.path.dirname(name), exist_ok=True)
+            open(name, "w").close()
+
+    def names(self, *names):
+        return [os.path.join(self.path, name) for name in names]
+
+    def test_names_are_joined_with_path(self):
+        """Comma separated names are relative to the input path and kept when missing"""
+        self.assertEqual(self.names("output.xml", "missing.xml"),
+                         discover_inputs(self.path, "output.xml, missing.xml"))
+
+    def test_glob(self):
+        """Globs match files in the input path, recursively with **"""
+        self.assertEqual(self.names("output.xml"), discover_inputs(self.path, "*.xml"))
+        self.assertEqual(self.names("output.xml", "pabot/0/output.xml", "pabot/1/output.xml"),
+                         discover_inputs(self.path, "**/output.xml"))
+        self.assertEqual([], discover_inputs(self.path, "*.zip"))
+
+    def test_directory(self):
+        """Directories are searched recursively for the files of the report type"""
+        self.assertEqual(self.names("pabot/0/output.xml", "pabot/1/output.xml",
+                                    "pabot/2/output.xml.gz"),
+                         discover_inputs(self.path, "pabot"))
+        self.assertEqual(self.names("junit/TEST-a.xml", "junit/nested/TEST-b.xml"),
+                         discover_inputs(self.path, "junit", "JUnit"))
+
+    def test_allure_directories(self):
+        """Allure directories are kept whole, also when matched by a glob"""
+        self.assertEqual(self.names("allure-results"),
+                         discover_inputs(self.path, "allure-*", "Allure"))
+        self.assertEqual(self.names("allure-results", "summary.json"),
+                         discover_inputs(self.path, "allure-results,summary.json", "Allure"))
+
+    def test_duplicates_are_dropped(self):
+        """A file named twice is read once"""
+        self.assertEqual(self.names("output.xml"),
+                         discover_inputs(self.path, "output.xml,*.xml"))
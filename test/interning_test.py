@@ -0,0 +1,162 @@
+"""Unit tests for normalized storage of test messages and tags"""
+import os
+import sqlite3
+import tempfile
+import unittest
+from argparse import Namespace
+from unittest.mock import Mock, patch
+
+from mysql.connector.errors import OperationalError, ProgrammingError
+
+from robotframework_historic_parser.interning import (
+    InternTable,
+    MessageInterner,
+    create_interner,
+    is_missing_column,
+    prepare_normalized_tables,
+)
+from robotframework_historic_parser.rfhistoricparser import (
+    BatchWriter,
+    rfhistoric_parser,
+    write_test_rows,
+)
+from robotframework_historic_parser.storage import SQLiteConnection
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+
+
+class TestInterning(unittest.TestCase):
+    """Unit Tests for interning.py"""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        self.database_file = os.path.join(self.workdir.name, "historic.db")
+
+    def query(self, sql):
+        with sqlite3.connect(self.database_file) as connection:
+            return connection.execute(sql).fetchall()
+
+    def test_create_interner_disabled(self):
+        """Interning is off unless normalize is True"""
+        mydb = Mock()
+        self.assertIsNone(create_interner(mydb, Namespace()))
+        self.assertIsNone(create_interner(mydb, Namespace(normalize="False")))
+        mydb.cursor.assert_not_called()
+
+    def test_prepare_tables_once(self):
+        """The lookup tables and TB_TEST columns are added to an existing database"""
+        connection = SQLiteConnection(self.database_file, "project")
+        prepare_normalized_tables(connection)
+        prepare_normalized_tables(connection)
+        connection.close()
+        columns = [row[1] for row in self.query("PRAGMA table_info(TB_TEST)")]
+        self.assertEqual(["Test_Error_Id", "Test_Tag_Id"], columns[-2:])
+        self.assertEqual([], self.query("SELECT * FROM TB_ERROR"))
+
+    def test_prepare_tables_adds_missing_column(self):
+        """Each reference column is added on its own"""
+        connection = SQLiteConnection(self.database_file, "project")
+        connection.cursor().execute("ALTER TABLE TB_TEST ADD COLUMN Test_Error_Id INTEGER;")
+        prepare_normalized_tables(connection)
+        connection.close()
+        columns = [row[1] for row in self.query("PRAGMA table_info(TB_TEST)")]
+        self.assertEqual(["Test_Error_Id", "Test_Tag_Id"], columns[-2:])
+
+    def test_prepare_tables_lookup_error(self):
+        """Errors other than a missing column are raised without altering TB_TEST"""
+        mydb = Mock()
+        cursor = mydb.cursor.return_value
+        cursor.execute.side_effect = [None, None, OperationalError(msg="Lost connection", errno=2013)]
+        with self.assertRaises(OperationalError):
+            prepare_normalized_tables(mydb)
+        self.assertEqual(3, cursor.execute.call_count)
+        mydb.commit.assert_not_called()
+
+    def test_is_missing_column(self):
+        self.assertTrue(is_missing_column(ProgrammingError(msg="Unknown column", errno=1054)))
+        self.assertTrue(is_missing_column(sqlite3.OperationalError("no such column: Test_Tag_Id")))
+        self.assertFalse(is_missing_column(ProgrammingError(msg="Unknown table", errno=1146)))
+        self.assertFalse(is_missing_column(sqlite3.OperationalError("database is locked")))
+
+    def test_intern_table_reads_concurrent_insert(self):
+        """A text another upload stored after the first lookup is read with a locking read"""
+        committed = {}
+
+        def execute(sql, params):
+            # the consistent snapshot predates the other upload, a locking read does not
+            rows = committed if sql.endswith("LOCK IN SHARE MODE;") else {}
+            cursor.fetchall.return_value = [(h, rows[h]) for h in params if h in rows]
+
+        def executemany(sql, rows):
+            # INSERT IGNORE waits for the other upload and skips its hash
+            committed.update((text_hash, 9) for text_hash, _ in rows)
+
+        mydb = Mock()
+        cursor = mydb.cursor.return_value
+        cursor.execute.side_effect = execute
+        cursor.executemany.side_effect = executemany
+        errors = InternTable("TB_ERROR", "Error")
+        errors.resolve(mydb, ["boom"])
+        self.assertEqual(9, errors["boom"])
+
+    def test_intern_table_reuses_ids(self):
+        """Each distinct text is stored once and looked up in memory afterwards"""
+        connection = SQLiteConnection(self.database_file, "project")
+        prepare_normalized_tables(connection)
+        errors = InternTable("TB_ERROR", "Error")
+        errors.resolve(connection, ["boom", "", "boom"])
+        errors.resolve(connection, ["", "other"])
+        connection.commit()
+        # a later run finds the ids stored before
+        again = InternTable("TB_ERROR", "Error")
+        again.resolve(connection, ["other", "boom"])
+        connection.close()
+
+        self.assertEqual([(1, "boom"), (2, ""), (3, "other")],
+                         self.query("SELECT Error_Id, Error_Text FROM TB_ERROR"))
+        self.assertEqual((1, 2, 3), (errors["boom"], errors[""], errors["other"]))
+        self.assertEqual((1, 3), (again["boom"], again["other"]))
+
+    def test_intern_table_known_texts_skip_database(self):
+        """Texts resolved before in the run need no statements"""
+        errors = InternTable("TB_ERROR", "Error")
+        errors.ids["boom"] = 4
+        mydb = Mock()
+        errors.resolve(mydb, ["boom", "boom"])
+        mydb.cursor.assert_not_called()
+
+    def test_write_test_rows_normalized(self):
+        """Test rows reference the interned message and tags"""
+        connection = SQLiteConnection(self.database_file, "project")
+        prepare_normalized_tables(connection)
+        writer = BatchWriter(connection, 2)
+        tests = [("S - A", "FAIL", 1000, "Timeout!", ("b", "a")),
+                 ("S - B", "FAIL", 2000, "Timeout", ("b", "a")),
+                 ("S - C", "PASS", 0, "", ())]
+        write_test_rows(writer, 1, tests, interner=MessageInterner(connection))
+        writer.close()
+        connection.commit()
+        connection.close()
+
+        self.assertEqual([("S - A", None, 1, 1), ("S - B", None, 1, 1), ("S - C", None, 2, 2)],
+                         self.query("SELECT Test_Name, Test_Error, Test_Error_Id, Test_Tag_Id "
+                                    "FROM TB_TEST ORDER BY Test_Id"))
+        self.assertEqual([("Timeout",), ("",)], self.query("SELECT Error_Text FROM TB_ERROR"))
+        self.assertEqual([("[b, a]",), ("[]",)], self.query("SELECT Tag_Text FROM TB_TAG"))
+
+    def test_rfhistoric_parser_normalized(self):
+        """Normalized ingestions share messages and tags across executions"""
+        opts = Namespace(ignoreresult="False", path=ROOT_PATH + "/test_files",
+                         output="output_test_rf7.xml", report_type="RF", backend="sqlite",
+                         database_file=self.database_file, projectname="project",
+                         executionname="nightly", fullsuitename="False", normalize="True")
+        with patch("builtins.print"):
+            rfhistoric_parser(opts)
+            rfhistoric_parser(opts)
+
+        self.assertEqual(6, self.query("SELECT COUNT(*) FROM TB_TEST")[0][0])
+        self.assertEqual(3, self.query("SELECT COUNT(*) FROM TB_ERROR")[0][0])
+        self.assertEqual(
+            [(0,)], self.query("SELECT COUNT(*) FROM TB_TEST t LEFT JOIN TB_ERROR e "
+                               "ON e.Error_Id = t.Test_Error_Id WHERE e.Error_Id IS NULL"))
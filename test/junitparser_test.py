@@ -0,0 +1,132 @@
+"""Unit tests for the incremental JUnit parser"""
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from argparse import Namespace
+from unittest.mock import patch
+
+from robotframework_historic_parser.junitparser import parse_junit_stream
+from robotframework_historic_parser.rfhistoricparser import process_junit_report
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+
+NESTED_REPORT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<testsuites name="all" time="9">
+  <testsuite name="api">
+    <testsuite name="users" time="3">
+      <testcase classname="UserTest" name="create" time="1.5"/>
+      <testcase name="delete" time="1,000.5">
+        <skipped/>
+        <error message="teardown failed"/>
+      </testcase>
+    </testsuite>
+    <testcase name="health" time="0.25"><system-out>ok</system-out></testcase>
+  </testsuite>
+  <testsuite name="ui">
+    <testcase name="login"><skipped message="no browser"/></testcase>
+  </testsuite>
+  <testsuite name="empty" tests="0"/>
+</testsuites>
+"""
+
+
+class TestJUnitParser(unittest.TestCase):
+    """Unit Tests for junitparser.py"""
+
+    def test_parse_junit_stream(self):
+        """Every testcase of the report becomes a test row"""
+        records = parse_junit_stream(ROOT_PATH + "/test_files/junit_test.xml")
+        self.assertEqual("pytest", records.name)
+        self.assertEqual(2500, records.elapsedtime)
+        self.assertEqual([("pytest", "FAIL", 4, 1, 2, 2500, 1)], records.suites)
+        self.assertEqual([("pytest - tests.test_login.test_valid_login", "PASS", 500, "", ()),
+                          ("pytest - tests.test_login.test_invalid_login", "FAIL", 1000,
+                           "assert 401 == 200", ()),
+                          ("pytest - tests.test_search.test_search_timeout", "FAIL", 1000,
+                           "TimeoutError", ()),
+                          ("pytest - tests.test_search.test_search_legacy", "SKIP", 0,
+                           "legacy search disabled", ())], records.tests)
+
+    def test_nested_suites(self):
+        """Nested and sibling testsuites are counted from their testcases"""
+        records = parse_junit_stream(io.BytesIO(NESTED_REPORT), "True")
+        self.assertEqual("all", records.name)
+        self.assertEqual(9000, records.elapsedtime)
+        # suite rows are reserved by their first testcase, users ends before health
+        self.assertEqual([("api.users", "FAIL", 2, 1, 1, 3000, 0),
+                          ("api", "FAIL", 3, 2, 1, 3250, 0),
+                          ("ui", "SKIP", 1, 0, 0, 0, 1)], records.suites)
+        self.assertEqual([("api.users - UserTest.create", "PASS", 1500, ""),
+                          ("api.users - delete", "FAIL", 1000500, "teardown failed"),
+                          ("api - health", "PASS", 250, ""),
+                          ("ui - login", "SKIP", 0, "no browser")],
+                         [test[:4] for test in records.tests])
+        self.assertEqual((4, 2, 1, 1), records.test_totals())
+
+    def test_testsuite_root(self):
+        """A report with a single testsuite root element is read as well"""
+        records = parse_junit_stream(io.BytesIO(
+            b'<testsuite name="solo"><testcase name="a" time="2"/></testsuite>'))
+        self.assertEqual(("solo", 2000), (records.name, records.elapsedtime))
+        self.assertEqual([("solo", "PASS", 1, 1, 0, 2000, 0)], records.suites)
+
+    def test_process_junit_report_stream(self):
+        """The stream engine stores suite and test rows with the execution"""
+        with tempfile.TemporaryDirectory() as workdir:
+            database_file = os.path.join(workdir, "historic.db")
+            opts = Namespace(report_type="JUnit", engine="stream", backend="sqlite",
+                             database_file=database_file, projectname="project",
+                             executionname="junit", fullsuitename="False",
+                             output=ROOT_PATH + "/test_files/junit_test.xml")
+            with patch("builtins.print"):
+                process_junit_report(opts)
+            with sqlite3.connect(database_file) as connection:
+                execution = connection.execute(
+                    "SELECT Execution_Total, Execution_Pass, Execution_Fail, Execution_Skip, "
+                    "Execution_STotal, Execution_SFail FROM TB_EXECUTION").fetchall()
+                tests = connection.execute(
+                    "SELECT Test_Status, Test_Error FROM TB_TEST ORDER BY Test_Id").fetchall()
+        self.assertEqual([(4, 1, 2, 1, 1, 1)], execution)
+        self.assertEqual([("PASS", ""), ("FAIL", "assert 401  200"), ("FAIL", "TimeoutError"),
+                          ("SKIP", "legacy search disabled")], tests)
+
+    def test_process_junit_report_files(self):
+        """Several reports are merged into one execution, with either engine"""
+        with tempfile.TemporaryDirectory() as workdir:
+            second = os.path.join(workdir, "nested.xml")
+            with open(second, "wb") as f:
+                f.write(NESTED_REPORT)
+            output_names = [ROOT_PATH + "/test_files/junit_test.xml", second]
+            executions = []
+            for engine in ("rf", "stream"):
+                database_file = os.path.join(workdir, engine + ".db")
+                opts = Namespace(report_type="JUnit", engine=engine, backend="sqlite",
+                                 database_file=database_file, projectname="project",
+                                 executionname="junit", fullsuitename="False", workers=2,
+                                 output="*.xml")
+                with patch("builtins.print"):
+                    process_junit_report(opts, output_names)
+                with sqlite3.connect(database_file) as connection:
+                    executions.append(connection.execute(
+                        "SELECT Execution_Total, Execution_Pass, Execution_Fail, "
+                        "Execution_Skip FROM TB_EXECUTION").fetchall())
+        # the legacy engine reads the first testsuite of each report only
+        self.assertEqual([[(4, 1, 2, 1)], [(8, 3, 3, 2)]], executions)
+
+    @patch("robotframework_historic_parser.rfhistoricparser.connect_to_project_db")
+    def test_process_junit_report_closes_on_error(self, mock_connect):
+        """The connection is closed when a report cannot be parsed, with either engine"""
+        with tempfile.TemporaryDirectory() as workdir:
+            truncated = os.path.join(workdir, "junit.xml")
+            with open(truncated, "w") as f:
+                f.write("<testsuites><testsuite name='cut'>")
+            for engine in ("rf", "stream"):
+                mock_connect.reset_mock()
+                opts = Namespace(report_type="JUnit", engine=engine, fullsuitename="False",
+                                 output=truncated)
+                with self.assertRaises(ET.ParseError):
+                    process_junit_report(opts)
+                mock_connect.return_value.close.assert_called_once()
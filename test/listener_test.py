@@ -0,0 +1,110 @@
+"""Unit tests for the Robot Framework listener of Robot Framework Historic Parser"""
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from argparse import Namespace
+from unittest.mock import patch
+
+import robot
+
+from robotframework_historic_parser.listener import HistoricListener
+from robotframework_historic_parser.rfhistoricparser import rfhistoric_parser
+
+SUITES = {
+    "first.robot": "*** Test Cases ***\n"
+                   "Passing\n    [Tags]    smoke    Fast\n    Log    ok\n"
+                   "Failing\n    Fail    Expected <failure> & more\n",
+    "second.robot": "*** Test Cases ***\n"
+                    "Skipped\n    Skip    not now\n"
+                    "Another Pass\n    No Operation\n",
+}
+
+# times are left out, the listener and output.xml round them differently
+SUITE_QUERY = "SELECT Execution_Id, Suite_Name, Suite_Status, Suite_Total, Suite_Pass, " \
+              "Suite_Fail, Suite_Skip FROM TB_SUITE ORDER BY Suite_Id"
+TEST_QUERY = "SELECT Execution_Id, Test_Name, Test_Status, Test_Error, Test_Tag FROM TB_TEST " \
+             "ORDER BY Test_Id"
+EXECUTION_QUERY = "SELECT Execution_Desc, Execution_Total, Execution_Pass, Execution_Fail, " \
+                  "Execution_STotal, Execution_SPass, Execution_SFail, Execution_Skip, " \
+                  "Execution_SSkip FROM TB_EXECUTION"
+
+
+class TestListener(unittest.TestCase):
+    """Unit Tests for listener.py"""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        self.suites = os.path.join(self.workdir.name, "suites")
+        os.mkdir(self.suites)
+        for name, content in SUITES.items():
+            with open(os.path.join(self.suites, name), "w") as f:
+                f.write(content)
+
+    def run_robot(self, listener):
+        with patch("builtins.print"):
+            return robot.run(self.suites, listener=listener, outputdir=self.workdir.name,
+                             log=None, report=None, stdout=io.StringIO(), stderr=io.StringIO())
+
+    def query(self, database_file, sql):
+        with sqlite3.connect(database_file) as connection:
+            return connection.execute(sql).fetchall()
+
+    def assert_same_rows(self, fullsuitename):
+        listener_db = os.path.join(self.workdir.name, "listener.db")
+        self.run_robot(HistoricListener("demo", "live", fullsuitename=fullsuitename,
+                                        backend="sqlite", database_file=listener_db))
+        parser_db = os.path.join(self.workdir.name, "parser.db")
+        with patch("builtins.print"):
+            rfhistoric_parser(Namespace(
+                ignoreresult="False", path=self.workdir.name, output="output.xml",
+                report_type="RF", backend="sqlite", database_file=parser_db, projectname="demo",
+                executionname="live", fullsuitename=fullsuitename))
+        for sql in (EXECUTION_QUERY, SUITE_QUERY, TEST_QUERY):
+            self.assertEqual(self.query(parser_db, sql), self.query(listener_db, sql))
+        return listener_db
+
+    def test_listener_matches_parsed_output(self):
+        """The listener writes the rows parsing output.xml afterwards would"""
+        listener_db = self.assert_same_rows("False")
+        self.assertEqual([("live", 4, 2, 1, 2, 1, 1, 1, 0)],
+                         self.query(listener_db, EXECUTION_QUERY))
+        self.assertEqual((1, "First - Passing", "PASS", "", "[Fast, smoke]"),
+                         self.query(listener_db, TEST_QUERY)[0])
+        self.assertEqual([(1, 50.0)], self.query(listener_db, "SELECT Total_Executions, "
+                                                               "Recent_Pass_Perc FROM TB_PROJECT"))
+
+    def test_listener_matches_parsed_output_full_suite_name(self):
+        self.assert_same_rows("True")
+
+    def test_listener_failure_does_not_fail_run(self):
+        """A database failure disables the listener and keeps nothing of the run"""
+        listener_db = os.path.join(self.workdir.name, "listener.db")
+        listener = HistoricListener("demo", "live", backend="sqlite", database_file=listener_db,
+                                    batch_size="1")
+        with patch("robotframework_historic_parser.pipeline.write_test_rows",
+                   side_effect=RuntimeError("lost connection")):
+            rc = self.run_robot(listener)
+        self.assertEqual(1, rc)
+        self.assertTrue(listener.disabled)
+        self.assertEqual([(0,)], self.query(listener_db, "SELECT COUNT(*) FROM TB_EXECUTION"))
+        self.assertEqual([(0,)], self.query(listener_db, "SELECT COUNT(*) FROM TB_TEST"))
+
+    @patch("robotframework_historic_parser.listener.connect_to_project_db",
+           side_effect=RuntimeError("unreachable"))
+    def test_listener_connection_failure(self, mock_connect):
+        listener = HistoricListener("demo", "live")
+        self.assertEqual(1, self.run_robot(listener))
+        self.assertTrue(listener.disabled)
+        mock_connect.assert_called_once()
+
+    def test_listener_arguments(self):
+        """Listener arguments arrive as strings from the robot command line"""
+        listener = HistoricListener("demo", "live", port="3307", backend="SQLite",
+                                    batch_size="10")
+        self.assertEqual(3307, listener.opts.port)
+        self.assertEqual("sqlite", listener.opts.backend)
+        self.assertEqual(10, listener.opts.batch_size)
+        self.assertEqual(3, HistoricListener.ROBOT_LISTENER_API_VERSION)
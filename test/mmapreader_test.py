@@ -0,0 +1,50 @@
+"""Unit tests for reading result files through a memory mapping"""
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from robotframework_historic_parser.junitparser import parse_junit_stream
+from robotframework_historic_parser.mmapreader import iterparse_mapped
+from robotframework_historic_parser.streamparser import parse_output_stream
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+OUTPUT_FILE = ROOT_PATH + "/test_files/output_test_rf7.xml"
+
+
+class TestMmapReader(unittest.TestCase):
+    """Unit Tests for mmapreader.py"""
+
+    def test_events_match_iterparse(self):
+        """Slices split anywhere in the file produce the events of iterparse"""
+        expected = [(event, elem.tag) for event, elem in
+                    ET.iterparse(OUTPUT_FILE, events=("start", "end"))]
+        for chunk_size in (7, 4096):
+            self.assertEqual(expected, [(event, elem.tag) for event, elem in
+                                        iterparse_mapped(OUTPUT_FILE, chunk_size)])
+
+    def test_parsers_read_mapped_files(self):
+        """The stream and JUnit parsers store the same rows with use_mmap"""
+        expected = parse_output_stream(OUTPUT_FILE, "True")
+        records = parse_output_stream(OUTPUT_FILE, "True", use_mmap="True")
+        self.assertEqual((expected.suites, expected.tests), (records.suites, records.tests))
+        junit = ROOT_PATH + "/test_files/junit_test.xml"
+        self.assertEqual(parse_junit_stream(junit).tests,
+                         parse_junit_stream(junit, use_mmap="True").tests)
+
+    def test_empty_file(self):
+        """An empty file is reported as invalid XML instead of failing to map"""
+        with tempfile.TemporaryDirectory() as workdir:
+            empty = os.path.join(workdir, "output.xml")
+            open(empty, "w").close()
+            with self.assertRaises(ET.ParseError):
+                list(iterparse_mapped(empty))
+
+    def test_truncated_file(self):
+        """A truncated file raises ParseError at the end of the mapping"""
+        with tempfile.TemporaryDirectory() as workdir:
+            truncated = os.path.join(workdir, "output.xml")
+            with open(truncated, "wb") as f:
+                f.write(b"<robot><suite name='a'>")
+            with self.assertRaises(ET.ParseError):
+                list(iterparse_mapped(truncated, 4))
@@ -1,4 +1,5 @@
 """Unit tests for functions used in Robot Framework Historic Parser parserargs"""
+import subprocess
 import sys
 import unittest
 from unittest.mock import patch
@@ -141,6 +142,147 @@ class TestRunner(unittest.TestCase):
         with self.assertRaises(SystemExit):
             parse_options()
 
+    def test_batch_size(self):
+        """Argument parser positive test for batch size"""
+        sys.argv[1:] = ['--batch-size', '250']
+        options = parse_options()
+        self.assertEqual(250, options.batch_size)
+
+    def test_batch_size_invalid(self):
+        """Argument parser negative test for batch size"""
+        sys.argv[1:] = ['--batch-size', 'many']
+        with self.assertRaises(SystemExit):
+            parse_options()
+
+    def test_engine(self):
+        """Argument parser positive test for engine"""
+        sys.argv[1:] = ['--engine', 'Stream']
+        options = parse_options()
+        self.assertEqual('stream', options.engine)
+
+    def test_mmap(self):
+        """Argument parser positive test for memory-mapped reads"""
+        sys.argv[1:] = ['--engine', 'stream', '--mmap', 'True']
+        options = parse_options()
+        self.assertEqual('True', options.mmap)
+
+    def test_engine_invalid(self):
+        """Argument parser negative test for engine"""
+        sys.argv[1:] = ['--engine', 'sax']
+        with self.assertRaises(SystemExit):
+            parse_options()
+
+    def test_backend(self):
+        """Argument parser positive test for backend"""
+        sys.argv[1:] = ['--backend', 'SQLite', '--database-file', 'results.db']
+        options = parse_options()
+        self.assertEqual('sqlite', options.backend)
+        self.assertEqual('results.db', options.database_file)
+
+    def test_backend_invalid(self):
+        """Argument parser negative test for backend"""
+        sys.argv[1:] = ['--backend', 'postgres']
+        with self.assertRaises(SystemExit):
+            parse_options()
+
+    def test_workers(self):
+        """Argument parser positive test for workers"""
+        sys.argv[1:] = ['--workers', '4']
+        options = parse_options()
+        self.assertEqual(4, options.workers)
+
+    def test_workers_empty(self):
+        """Argument parser negative test for workers"""
+        sys.argv[1:] = ['--workers']
+        with self.assertRaises(SystemExit):
+            parse_options()
+
+    def test_pipeline(self):
+        """Argument parser positive test for pipeline"""
+        sys.argv[1:] = ['--pipeline', 'True']
+        options = parse_options()
+        self.assertEqual('True', options.pipeline)
+
+    def test_pipeline_default(self):
+        """Argument parser default for pipeline"""
+        sys.argv[1:] = []
+        options = parse_options()
+        self.assertEqual('False', options.pipeline)
+
+    def test_follow(self):
+        """Argument parser positive test for follow mode"""
+        sys.argv[1:] = ['--follow', 'True', '--follow-interval', '0.5', '--follow-timeout', '60']
+        options = parse_options()
+        self.assertEqual('True', options.follow)
+        self.assertEqual(0.5, options.follow_interval)
+        self.assertEqual(60, options.follow_timeout)
+
+    def test_duplicates(self):
+        """Argument parser defaults neither skip nor replace duplicates"""
+        sys.argv[1:] = []
+        options = parse_options()
+        self.assertEqual('False', options.skip_duplicates)
+        self.assertEqual('False', options.replace)
+
+    def test_replace(self):
+        """Argument parser positive test for replace"""
+        sys.argv[1:] = ['--replace', 'True', '--skip-duplicates', 'True']
+        options = parse_options()
+        self.assertEqual('True', options.replace)
+        self.assertEqual('True', options.skip_duplicates)
+
+    def test_cache(self):
+        """Argument parser positive test for the parse cache"""
+        sys.argv[1:] = ['--cache-dir', '/tmp/rfhistoric', '--cache-size', '64']
+        options = parse_options()
+        self.assertEqual('/tmp/rfhistoric', options.cache_dir)
+        self.assertEqual(64, options.cache_size)
+
+    def test_messages(self):
+        """Argument parser positive test for stored test messages"""
+        sys.argv[1:] = ['--max-error-length', '2000', '--keep-unicode', 'True']
+        options = parse_options()
+        self.assertEqual(2000, options.max_error_length)
+        self.assertEqual('True', options.keep_unicode)
+
+    def test_command_default(self):
+        """Argument parser defaults to a single parse"""
+        sys.argv[1:] = ['-o', 'output.xml']
+        options = parse_options()
+        self.assertEqual('parse', options.command)
+
+    def test_command_serve(self):
+        """Argument parser positive test for the serve command"""
+        sys.argv[1:] = ['serve', '--serve-port', '9000', '--pool-size', '8']
+        options = parse_options()
+        self.assertEqual('serve', options.command)
+        self.assertEqual(9000, options.serve_port)
+        self.assertEqual(8, options.pool_size)
+
+    def test_command_invalid(self):
+        """Argument parser negative test for the command"""
+        sys.argv[1:] = ['listen']
+        with self.assertRaises(SystemExit):
+            parse_options()
+
+    @patch('robotframework_historic_parser.parserargs.rfhistoric_parser')
+    @patch('robotframework_historic_parser.server.serve')
+    def test_main_serve(self, serve_mock, parser_mock):
+        """Tests main starts the service for the serve command"""
+        sys.argv[1:] = ['serve']
+        main()
+        serve_mock.assert_called_once()
+        parser_mock.assert_not_called()
+
+    def test_import_skips_server(self):
+        """Tests the command line does not import the HTTP service unless it is served"""
+        code = ("import sys, robotframework_historic_parser.parserargs; "
+                "print('robotframework_historic_parser.server' in sys.modules, "
+                "'http.server' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                check=True).stdout
+        self.assertEqual("False False", output.strip())
+
     @patch('robotframework_historic_parser.parserargs.rfhistoric_parser')
     # pylint: disable=R0201
     def test_main(self, pzf_mock):
@@ -0,0 +1,112 @@
+"""Unit tests for the ingestion pipeline of Robot Framework Historic Parser"""
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from argparse import Namespace
+from unittest.mock import patch, Mock
+
+from robotframework_historic_parser.rfhistoricparser import rfhistoric_parser
+from robotframework_historic_parser.pipeline import PipelineRecords, PipelineWriter
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+
+EXECUTION_QUERY = "SELECT Execution_Desc, Execution_Total, Execution_Pass, Execution_Fail, " \
+                  "Execution_Time, Execution_STotal, Execution_SPass, Execution_SFail, " \
+                  "Execution_Skip, Execution_SSkip FROM TB_EXECUTION ORDER BY Execution_Id"
+
+
+class TestPipeline(unittest.TestCase):
+    """Unit Tests for pipeline.py"""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+
+    def ingest(self, database, **kwargs):
+        options = dict(ignoreresult="False", path=ROOT_PATH + "/test_files",
+                       output="output_test_rf7.xml", report_type="RF", backend="sqlite",
+                       database_file=os.path.join(self.workdir.name, database),
+                       projectname="project", executionname="nightly", fullsuitename="False",
+                       engine="rf", workers=1, batch_size=2)
+        options.update(kwargs)
+        with patch("builtins.print"):
+            rfhistoric_parser(Namespace(**options))
+        with sqlite3.connect(options["database_file"]) as connection:
+            return (connection.execute(EXECUTION_QUERY).fetchall(),
+                    connection.execute("SELECT Execution_Id, Suite_Name, Suite_Status, "
+                                       "Suite_Total, Suite_Pass, Suite_Fail, Suite_Time, "
+                                       "Suite_Skip FROM TB_SUITE ORDER BY Suite_Id").fetchall(),
+                    connection.execute("SELECT Execution_Id, Test_Name, Test_Status, Test_Time, "
+                                       "Test_Error, Test_Tag FROM TB_TEST "
+                                       "ORDER BY Test_Id").fetchall(),
+                    connection.execute("SELECT Total_Executions, Recent_Pass_Perc "
+                                       "FROM TB_PROJECT").fetchall())
+
+    def assert_same_rows(self, **kwargs):
+        expected = self.ingest("sequential.db", **kwargs)
+        self.assertEqual(expected, self.ingest("pipeline.db", pipeline="True", **kwargs))
+        return expected
+
+    def test_pipeline_rf_engine(self):
+        """The pipeline writes the same rows as a sequential ingestion"""
+        execution, suites, tests, project = self.assert_same_rows()
+        self.assertEqual([("nightly", 3, 1, 1, 0.0, 1, 0, 1, 1, 0)], execution)
+        self.assertEqual(3, len(tests))
+        self.assertEqual([(1, 33.33)], project)
+
+    def test_pipeline_stream_engine(self):
+        self.assert_same_rows(engine="stream")
+
+    def test_pipeline_stream_engine_combined_full_names(self):
+        """Full names of combined outputs are prefixed before the rows are sent"""
+        _, suites, tests, _ = self.assert_same_rows(
+            engine="stream", fullsuitename="True",
+            output="output_test_rf7.xml,output_test_rf6.xml")
+        self.assertEqual(6, len(tests))
+        self.assertTrue(all(test[1].startswith(suites[0][1].split(".")[0] + ".")
+                            for test in tests))
+
+    def test_pipeline_failure_rolls_back(self):
+        """A writer failure stops the ingestion and nothing is committed"""
+        database_file = os.path.join(self.workdir.name, "failed.db")
+        with patch("robotframework_historic_parser.pipeline.write_test_rows",
+                   side_effect=RuntimeError("lost connection")):
+            with self.assertRaises(RuntimeError):
+                self.ingest("failed.db", pipeline="True", engine="stream")
+        with sqlite3.connect(database_file) as connection:
+            self.assertEqual([(0,)], connection.execute(
+                "SELECT COUNT(*) FROM TB_EXECUTION").fetchall())
+
+    def test_pipeline_writer_chunks(self):
+        """Rows are handed to the writer thread in chunks and flushed on finish"""
+        batch_writer = Mock()
+        writer = PipelineWriter(batch_writer, "7", chunk_size=2)
+        records = PipelineRecords(writer)
+        writer.start()
+        for index, status in enumerate(("PASS", "FAIL", "SKIP")):
+            records.add_test("Test %s" % index, status, 1000, "", ["tag"])
+        writer.finish()
+
+        self.assertEqual((3, 1, 1, 1), records.test_totals())
+        self.assertEqual([], records.tests)
+        rows = [call.args for call in batch_writer.insert.call_args_list]
+        self.assertEqual(["Test 0", "Test 1", "Test 2"], [row[1][1] for row in rows])
+        batch_writer.close.assert_called_once()
+
+    def test_pipeline_writer_error_stops_parser(self):
+        """The parser fails fast once the writer thread has failed"""
+        batch_writer = Mock()
+        batch_writer.insert.side_effect = RuntimeError("lost connection")
+        writer = PipelineWriter(batch_writer, "7", chunk_size=1)
+        writer.start()
+        writer.add(("Test", "PASS", 0, "", ()))
+        for _ in range(500):
+            if writer.error is not None:
+                break
+            time.sleep(0.01)
+        with self.assertRaises(RuntimeError):
+            writer.add(("Test", "PASS", 0, "", ()))
+        writer.abort()
+        batch_writer.close.assert_not_called()
@@ -0,0 +1,46 @@
+"""Unit tests for the execution records shared by the parsers"""
+import unittest
+
+from robotframework_historic_parser.records import ExecutionRecords, combine_records, format_tags
+
+
+class TestRecords(unittest.TestCase):
+    """Unit Tests for records.py"""
+
+    def setUp(self):
+        self.first = ExecutionRecords("First", 1000)
+        self.first.add_suite("Suite", "PASS", 1, 1, 0, 1000, 0)
+        self.first.add_test("Suite - Test", "PASS", 1000, "", ["tag"])
+        self.second = ExecutionRecords("Second", 500)
+        self.second.add_suite("Other", "SKIP", 1, 0, 0, 500, 1)
+        self.second.add_test("Other - Test", "SKIP", 500, "skipped", [])
+
+    def test_totals(self):
+        """Totals are counted from suite and test rows"""
+        self.first.add_test("Suite - Failed", "FAIL", 0, "error", [])
+        self.assertEqual((2, 1, 1, 0), self.first.test_totals())
+        self.assertEqual((1, 1, 0, 0), self.first.suite_totals())
+        self.assertEqual((1, 0, 0, 1), self.second.suite_totals())
+
+    def test_combine_single(self):
+        """A single result is returned as is"""
+        self.assertIs(self.first, combine_records([self.first]))
+
+    def test_combine_short_names(self):
+        """Combining keeps short names and sums elapsed time"""
+        combined = combine_records([self.first, self.second])
+        self.assertEqual("First & Second", combined.name)
+        self.assertEqual(1500, combined.elapsedtime)
+        self.assertEqual(["Suite", "Other"], [suite[0] for suite in combined.suites])
+        self.assertEqual((2, 1, 0, 1), combined.test_totals())
+
+    def test_combine_full_names(self):
+        """Combining prefixes full names with the combined suite name"""
+        combined = combine_records([self.first, self.second], "True")
+        self.assertEqual("First & Second.Suite - Test", combined.tests[0][0])
+        self.assertEqual("First & Second.Other", combined.suites[1][0])
+
+    def test_format_tags(self):
+        """Tags are formatted like str(robot.model.Tags)"""
+        self.assertEqual("[]", format_tags(()))
+        self.assertEqual("[a, b]", format_tags(("a", "b")))
@@ -0,0 +1,115 @@
+"""Unit tests for the robot.api based output parser"""
+import os
+import unittest
+
+from robot.result import TestSuite as ResultSuite
+
+from robotframework_historic_parser.resultparser import ExecutionMetrics, parse_output_result
+from robotframework_historic_parser.streamparser import parse_output_stream
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+
+
+class TestResultParser(unittest.TestCase):
+    """Unit Tests for resultparser.py"""
+
+    def test_parse_output_result(self):
+        """Reads suite and test rows of an output file"""
+        records = parse_output_result([ROOT_PATH + "/test_files/output_test_rf7.xml"])
+        self.assertEqual("RFH Parser Test", records.name)
+        self.assertEqual(58, records.elapsedtime)
+        self.assertEqual([("RFH Parser Test", "FAIL", 3, 1, 1, 58, 1)], records.suites)
+        self.assertEqual((3, 1, 1, 1), records.test_totals())
+
+    def _build_suite(self, *statuses):
+        """Builds a result suite with one test per given status"""
+        suite = ResultSuite(name="My Suite")
+        for index, status in enumerate(statuses):
+            suite.tests.create(name="Test %s" % index, status=status, tags=["b", "a"],
+                               message="Failed: %s!" % index if status == "FAIL" else "")
+        return suite
+
+    def test_execution_metrics_passed_suite(self):
+        """Test ExecutionMetrics with passed status"""
+        metrics = ExecutionMetrics("False")
+        suite = self._build_suite("PASS", "PASS")
+        suite.visit(metrics)
+
+        self.assertEqual((1, 1, 0, 0), metrics.records.suite_totals())
+        self.assertEqual((2, 2, 0, 0), metrics.records.test_totals())
+        self.assertEqual([("My Suite", "PASS", 2, 2, 0, 0, 0)], metrics.records.suites)
+
+    def test_execution_metrics_skipped_suite(self):
+        """Test ExecutionMetrics with skipped status"""
+        metrics = ExecutionMetrics("False")
+        suite = self._build_suite("SKIP")
+        suite.visit(metrics)
+
+        self.assertEqual((1, 0, 0, 1), metrics.records.suite_totals())
+        self.assertEqual((1, 0, 0, 1), metrics.records.test_totals())
+
+    def test_execution_metrics_failed_suite(self):
+        """Test ExecutionMetrics with failed status"""
+        metrics = ExecutionMetrics("False")
+        suite = self._build_suite("PASS", "FAIL", "SKIP")
+        suite.visit(metrics)
+
+        self.assertEqual((1, 0, 1, 0), metrics.records.suite_totals())
+        self.assertEqual((3, 1, 1, 1), metrics.records.test_totals())
+        self.assertEqual([("My Suite", "FAIL", 3, 1, 1, 0, 1)], metrics.records.suites)
+        self.assertEqual(("My Suite - Test 1", "FAIL", 0, "Failed: 1!", ("a", "b")),
+                         metrics.records.tests[1])
+
+    def test_execution_metrics_empty_suite(self):
+        """Test ExecutionMetrics with empty suite (no tests)"""
+        metrics = ExecutionMetrics("False")
+        suite = ResultSuite(name="Empty")
+        suite.visit(metrics)
+
+        # Should not count empty suites
+        self.assertEqual([], metrics.records.suites)
+        self.assertEqual((0, 0, 0, 0), metrics.records.suite_totals())
+
+    def test_execution_metrics_nested_suites(self):
+        """Test ExecutionMetrics counts child suite tests in the parent statistics"""
+        metrics = ExecutionMetrics("True")
+        parent = self._build_suite("PASS")
+        parent.name = "Parent"
+        parent.suites.append(self._build_suite("FAIL", "SKIP"))
+        parent.visit(metrics)
+
+        self.assertEqual("Parent", metrics.records.name)
+        self.assertEqual(["Parent", "Parent.My Suite"],
+                         [suite[0] for suite in metrics.records.suites])
+        self.assertEqual(("FAIL", 3, 1, 1, 0, 1), metrics.records.suites[0][1:])
+        self.assertEqual(("FAIL", 2, 0, 1, 0, 1), metrics.records.suites[1][1:])
+
+    def test_execution_metrics_full_suite_name_true(self):
+        """Test ExecutionMetrics with full_suite_name=True"""
+        metrics = ExecutionMetrics("True")
+        project = ResultSuite(name="MyProject")
+        project.suites.append(self._build_suite("PASS"))
+        project.visit(metrics)
+
+        self.assertEqual("MyProject.My Suite", metrics.records.suites[0][0])
+        self.assertTrue(metrics.records.tests[0][0].startswith("MyProject.My Suite - "))
+
+    def test_execution_metrics_names_with_quotes(self):
+        """Names are read from the model, not from the repr of suites and tests"""
+        metrics = ExecutionMetrics("False")
+        suite = ResultSuite(name="It's a suite")
+        suite.tests.create(name="Don't ')fail", status="PASS")
+        suite.visit(metrics)
+
+        self.assertEqual("It's a suite", metrics.records.suites[0][0])
+        self.assertEqual("It's a suite - Don't ')fail", metrics.records.tests[0][0])
+
+    def test_parse_output_result_full_suite_name(self):
+        """Full names match the ones of the stream engine"""
+        output = ROOT_PATH + "/test_files/output_test_rf7.xml"
+        records = parse_output_result([output], "True")
+        expected = parse_output_stream(output, "True")
+        self.assertEqual(expected.suites, records.suites)
+        self.assertEqual(expected.tests, records.tests)
+        self.assertEqual("RFH Parser Test - Failing Test Case",
+                         [test[0] for test in records.tests if test[1] == "FAIL"][0])
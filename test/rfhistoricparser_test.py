@@ -2,23 +2,31 @@
 import json
 import os
 import sys
+import tempfile
 import unittest
 from unittest import mock
 from unittest.mock import patch, Mock, MagicMock, call
+from mysql.connector.errors import OperationalError, ProgrammingError
 from robotframework_historic_parser.rfhistoricparser import (
     get_time_in_min,
     rfhistoric_parser,
     remove_special_characters,
     process_statistics_report,
     insert_into_execution_table,
+    update_project_table,
+    get_pass_percentage,
+    hash_output_files,
+    check_ingestion,
     process_junit_report,
     process_allure_report,
+    parse_output_files,
     commit_and_close_db,
-    ExecutionResult,
+    insert_into_suite_table,
+    insert_into_test_table,
+    BatchWriter,
+    SUITE_INSERT_SQL,
+    TEST_INSERT_SQL,
     datetime,
-    SuiteStats,
-    SuiteResults,
-    TestMetrics,
 )
 from robotframework_historic_parser.parserargs import parse_options
 
@@ -52,15 +60,11 @@ class TestRFHistoricParser(unittest.TestCase):
         mock_print.assert_called_once_with("Ignoring execution results...")
 
     @patch("os.path.exists", return_value=False)
-    @patch("os.listdir", return_value=["test1.xml", "test2.xml"])
-    @patch("os.path.isfile", return_value=True)
     @patch("sys.exit")
-    def test_rfhistoric_parser_exits_on_missing_file(
-        self, mock_exit, mock_listdir, mock_exists, mock_isfile
-    ):
+    def test_rfhistoric_parser_exits_on_missing_file(self, mock_exit, mock_exists):
         opts = MockOpts(
             ignoreresult="False",
-            output="*.xml",
+            output="test1.xml,test2.xml",
             path="not/important",
             report_type="RF",
             host="localhost",
@@ -72,8 +76,11 @@ class TestRFHistoricParser(unittest.TestCase):
 
         with self.assertRaises(SystemExit) as cm:
             rfhistoric_parser(opts)
+        path = os.path.abspath("not/important")
         self.assertIn(
-            "output.xml file is missing: test1.xml, test2.xml", str(cm.exception)
+            "output.xml file is missing: {}, {}".format(
+                os.path.join(path, "test1.xml"), os.path.join(path, "test2.xml")),
+            str(cm.exception),
         )
 
     @patch("mysql.connector.connect")
@@ -145,7 +152,103 @@ class TestRFHistoricParser(unittest.TestCase):
         )
 
     @patch("mysql.connector.connect")
-    @patch("robotframework_historic_parser.rfhistoricparser.ExecutionResult")
+    @patch("robotframework_historic_parser.resultparser.ExecutionResult")
+    @patch(
+        "robotframework_historic_parser.rfhistoricparser.insert_into_execution_table"
+    )
+    def test_rfhistoric_parser_stream_engine(self, mock_insert, mock_result, mock_conn):
+        file_path = ROOT_PATH + "/" + "test_files/output_test_rf7.xml"
+        opts = MockOpts(
+            ignoreresult="False",
+            output=file_path,
+            path="",
+            report_type="RF",
+            engine="stream",
+            host="localhost",
+            port=3306,
+            username="superuser",
+            password="passw0rd",
+            projectname="test",
+            executionname="test_executionname",
+            fullsuitename="False",
+        )
+        mock_insert.return_value = "7"
+        rfhistoric_parser(opts)
+        mock_result.assert_not_called()
+        assert mock_insert.call_args.args[2:] == (
+            "test_executionname",
+            3,
+            1,
+            1,
+            0.0,
+            1,
+            0,
+            1,
+            1,
+            0,
+            "test",
+        )
+        mock_conn.return_value.cursor.assert_any_call(prepared=True)
+        cursor = mock_conn.return_value.cursor.return_value
+        suite_insert, test_insert, project_update = cursor.execute.call_args_list
+        self.assertIn("TB_PROJECT", project_update.args[0])
+        self.assertEqual(SUITE_INSERT_SQL, suite_insert.args[0])
+        self.assertEqual(["7", "RFH Parser Test", "FAIL", 3, 1, 1, 0.0, 1], suite_insert.args[1])
+        self.assertEqual(TEST_INSERT_SQL + (", (%s, %s, %s, %s, %s, %s)" * 2), test_insert.args[0])
+        self.assertEqual(["7", "RFH Parser Test - Failing Test Case", "FAIL", 0.0,
+                          "Goodbye World", "[]"], test_insert.args[1][6:12])
+        mock_conn.return_value.start_transaction.assert_called_once()
+        mock_conn.return_value.commit.assert_called_once()
+        mock_conn.return_value.rollback.assert_not_called()
+
+    @patch("builtins.print")
+    @patch("mysql.connector.connect")
+    @patch(
+        "robotframework_historic_parser.rfhistoricparser.insert_into_execution_table"
+    )
+    def test_rfhistoric_parser_rolls_back_on_failure(self, mock_insert, mock_conn, mock_print):
+        opts = MockOpts(
+            ignoreresult="False",
+            output=ROOT_PATH + "/test_files/output_test_rf7.xml",
+            path="",
+            report_type="RF",
+            engine="stream",
+            host="localhost",
+            port=3306,
+            username="superuser",
+            password="passw0rd",
+            projectname="test",
+            executionname="test_executionname",
+            fullsuitename="False",
+        )
+        mock_insert.return_value = "7"
+        mock_conn.return_value.cursor.return_value.execute.side_effect = RuntimeError("lost")
+        with self.assertRaises(RuntimeError):
+            rfhistoric_parser(opts)
+        mock_conn.return_value.commit.assert_not_called()
+        mock_conn.return_value.rollback.assert_called_once()
+        mock_conn.return_value.close.assert_called_once()
+
+    @patch("builtins.print")
+    @patch("mysql.connector.connect")
+    def test_rfhistoric_parser_stream_engine_rejects_non_xml(self, mock_conn, mock_print):
+        opts = MockOpts(
+            ignoreresult="False",
+            output=ROOT_PATH + "/test_files/empty.xml," + ROOT_PATH + "/test_files/__init__.py",
+            path="",
+            report_type="RF",
+            engine="stream",
+            host="localhost",
+            port=3306,
+            username="superuser",
+            password="passw0rd",
+            projectname="test",
+        )
+        with self.assertRaises(SystemExit):
+            rfhistoric_parser(opts)
+
+    @patch("mysql.connector.connect")
+    @patch("robotframework_historic_parser.resultparser.ExecutionResult")
     @patch(
         "robotframework_historic_parser.rfhistoricparser.insert_into_execution_table"
     )
@@ -168,7 +271,7 @@ class TestRFHistoricParser(unittest.TestCase):
         opts = Mock()
         opts.ignoreresult = "False"
         opts.path = "/some/path"
-        opts.output = "*.xml"
+        opts.output = "output.xml"
         opts.report_type = "RF"
         opts.host = "test_host"
         opts.port = "test_port"
@@ -177,15 +280,15 @@ class TestRFHistoricParser(unittest.TestCase):
         opts.projectname = "test_project"
         opts.executionname = "test_executionname"
         opts.fullsuitename = "test_fullsuitename"
+        opts.batch_size = 500
+        opts.engine = "rf"
+        opts.workers = 1
+        opts.cache_dir = None
+        opts.max_error_length = 0
+        opts.keep_unicode = "False"
 
         mock_result = mock_ExecutionResult.return_value
         mock_result.suite.elapsedtime = 1000  # assuming elapsed time in milliseconds
-        mock_test_stats = Mock()
-        mock_test_stats.total_suite = 10
-        mock_test_stats.passed_suite = 7
-        mock_test_stats.failed_suite = 2
-        mock_test_stats.skipped_suite = 1
-        mock_result.statistics.total.all = mock_test_stats
 
         with patch(
             "robotframework_historic_parser.rfhistoricparser.datetime"
@@ -196,11 +299,9 @@ class TestRFHistoricParser(unittest.TestCase):
             mock_gettime.return_value = 10
             rfhistoric_parser(opts)
 
-        mock_ExecutionResult.assert_called_once_with()
-        mock_result.configure.assert_called_once_with(
-            stat_config={"suite_stat_level": 2, "tag_stat_combine": "tagANDanother"}
-        )
-        self.assertEqual(3, mock_result.visit.call_count)
+        mock_ExecutionResult.assert_called_once_with("/some/path/output.xml")
+        # suite stats, suite rows and test rows are collected in one traversal
+        self.assertEqual(1, mock_result.visit.call_count)
         mock_commit_and_close_db.assert_called_once()
 
         expected_calls = [
@@ -211,41 +312,56 @@ class TestRFHistoricParser(unittest.TestCase):
 
         mock_print.assert_has_calls(expected_calls, any_order=True)
 
+    def test_parse_output_files_workers(self):
+        """Parsing files in worker processes matches parsing them together"""
+        output_names = [ROOT_PATH + "/test_files/output_test_rf6.xml",
+                        ROOT_PATH + "/test_files/output_test_rf7.xml"]
+        for engine in ("rf", "stream"):
+            serial = parse_output_files(
+                MockOpts(engine="rf", workers=1, fullsuitename="True"), output_names)
+            parallel = parse_output_files(
+                MockOpts(engine=engine, workers=2, fullsuitename="True"), output_names)
+            self.assertEqual(serial.name, parallel.name)
+            self.assertEqual(serial.elapsedtime, parallel.elapsedtime)
+            self.assertEqual(serial.suites, parallel.suites)
+            self.assertEqual(serial.tests, parallel.tests)
+
+    @patch("concurrent.futures.ProcessPoolExecutor")
+    def test_parse_output_files_single_file_skips_pool(self, mock_pool):
+        """A single output file is parsed in the current process"""
+        records = parse_output_files(
+            MockOpts(engine="stream", workers=4, fullsuitename="False"),
+            [ROOT_PATH + "/test_files/output_test_rf7.xml"])
+        mock_pool.assert_not_called()
+        self.assertEqual((3, 1, 1, 1), records.test_totals())
+
     @patch("robotframework_historic_parser.rfhistoricparser.process_junit_report")
-    @patch("os.listdir", return_value=["output.xml"])
     @patch("builtins.exit")
-    def test_rfhistoric_parser_junit(
-        self, mock_exit, mock_list, mock_process_junit_report
-    ):
-
-        opts = Mock()
-        opts.report_type = "junit"
-        opts.path = "/some/path"
-        opts.output = "*.xml"
-
-        with patch("builtins.print"):
-            rfhistoric_parser(opts)
-
-        mock_process_junit_report.assert_called_once_with(opts)
+    def test_rfhistoric_parser_junit(self, mock_exit, mock_process_junit_report):
+        """Globs match in the input path rather than in the working directory"""
+        with tempfile.TemporaryDirectory() as workdir:
+            for name in ("b.xml", "a.xml", "notes.txt"):
+                open(os.path.join(workdir, name), "w").close()
+            opts = Mock()
+            opts.report_type = "junit"
+            opts.path = workdir
+            opts.output = "*.xml"
+
+            with patch("builtins.print"):
+                rfhistoric_parser(opts)
+
+        mock_process_junit_report.assert_called_once_with(
+            opts, [os.path.join(workdir, "a.xml"), os.path.join(workdir, "b.xml")])
         mock_exit.assert_not_called()
 
-    @patch("robotframework_historic_parser.rfhistoricparser.process_allure_report")
-    @patch("os.listdir", return_value=["output.xml"])
-    @patch("builtins.exit")
-    def test_rfhistoric_parser_allure(
-        self, mock_exit, mock_list, mock_process_allure_report
-    ):
-
-        opts = Mock()
-        opts.report_type = "Allure"
-        opts.path = "/some/path"
-        opts.output = "*.xml"
-
-        with patch("builtins.print"):
-            rfhistoric_parser(opts)
-
-        mock_process_allure_report.assert_called_once_with(opts)
-        mock_exit.assert_not_called()
+    @patch("builtins.exit", side_effect=SystemExit)
+    def test_rfhistoric_parser_exits_on_unmatched_glob(self, mock_exit):
+        with tempfile.TemporaryDirectory() as workdir:
+            opts = MockOpts(ignoreresult="False", output="*.xml", path=workdir,
+                            report_type="JUnit")
+            with self.assertRaises(SystemExit):
+                rfhistoric_parser(opts)
+        mock_exit.assert_called_once_with("no result files match *.xml in " + workdir)
 
     @patch("robotframework_historic_parser.rfhistoricparser.process_allure_report")
     @patch("builtins.exit")
@@ -262,7 +378,7 @@ class TestRFHistoricParser(unittest.TestCase):
             rfhistoric_parser(opts)
 
         # Verify that process_allure_report was called with the correct arguments
-        mock_process_allure_report.assert_called_once_with(opts)
+        mock_process_allure_report.assert_called_once_with(opts, ["/some/path/sample.txt"])
 
         # Verify that exit was not called
         mock_exit.assert_not_called()
@@ -280,7 +396,7 @@ class TestRFHistoricParser(unittest.TestCase):
 
         rfhistoric_parser(opts)
 
-        mock_process_statistics_report.assert_called_once_with(opts)
+        mock_process_statistics_report.assert_called_once_with(opts, ["/some/path/sample.txt"])
         mock_exit.assert_not_called()
 
     @patch("builtins.exit")
@@ -300,8 +416,10 @@ class TestRFHistoricParser(unittest.TestCase):
     )
     @patch("builtins.print")
     @patch("xml.etree.ElementTree.parse")
+    @patch("builtins.open", new_callable=unittest.mock.mock_open)
     def test_process_allure_report_xml(
         self,
+        mock_open,
         mock_parse,
         mock_print,
         mock_insert_into_execution_table,
@@ -356,7 +474,7 @@ class TestRFHistoricParser(unittest.TestCase):
             10,
             1,
             2,
-            "0",
+            0,
             0,
             0,
             0,
@@ -426,6 +544,8 @@ class TestRFHistoricParser(unittest.TestCase):
         mock_conn.return_value.close.assert_called_once()
         mock_print.assert_called_with("INFO: Writing execution results")
         self.assertEqual(1, mock_insert.call_count)
+        # project and robothistoric tables share a single connection
+        self.assertEqual(1, mock_conn.call_count)
 
     @patch(
         "robotframework_historic_parser.rfhistoricparser.insert_into_execution_table"
@@ -499,134 +619,11 @@ class TestRFHistoricParser(unittest.TestCase):
         result = remove_special_characters("Remove these special characters!")
         self.assertEqual(result, "Remove these special characters")
 
+    def test_remove_special_characters_non_ascii(self):
+        result = remove_special_characters("Ünïcode ✓ text")
+        self.assertEqual(result, "ncode  text")
 
 
-    def test_suite_stats_passed_suite(self):
-        """Test SuiteStats with passed status"""
-        suite_stats = SuiteStats()
-        
-        # Create a mock suite with PASS status
-        mock_suite = Mock()
-        mock_suite.tests = [Mock()]  # Has tests
-        mock_suite.status = "PASS"
-        
-        suite_stats.start_suite(mock_suite)
-        
-        self.assertEqual(suite_stats.total_suite, 1)
-        self.assertEqual(suite_stats.passed_suite, 1)
-        self.assertEqual(suite_stats.failed_suite, 0)
-        self.assertEqual(suite_stats.skipped_suite, 0)
-
-    def test_suite_stats_skipped_suite(self):
-        """Test SuiteStats with skipped status"""
-        suite_stats = SuiteStats()
-        
-        # Create a mock suite with SKIP status
-        mock_suite = Mock()
-        mock_suite.tests = [Mock()]  # Has tests
-        mock_suite.status = "SKIP"
-        
-        suite_stats.start_suite(mock_suite)
-        
-        self.assertEqual(suite_stats.total_suite, 1)
-        self.assertEqual(suite_stats.passed_suite, 0)
-        self.assertEqual(suite_stats.failed_suite, 0)
-        self.assertEqual(suite_stats.skipped_suite, 1)
-
-    def test_suite_stats_failed_suite(self):
-        """Test SuiteStats with failed status"""
-        suite_stats = SuiteStats()
-        
-        # Create a mock suite with FAIL status
-        mock_suite = Mock()
-        mock_suite.tests = [Mock()]  # Has tests
-        mock_suite.status = "FAIL"
-        
-        suite_stats.start_suite(mock_suite)
-        
-        self.assertEqual(suite_stats.total_suite, 1)
-        self.assertEqual(suite_stats.passed_suite, 0)
-        self.assertEqual(suite_stats.failed_suite, 1)
-        self.assertEqual(suite_stats.skipped_suite, 0)
-
-    def test_suite_stats_empty_suite(self):
-        """Test SuiteStats with empty suite (no tests)"""
-        suite_stats = SuiteStats()
-        
-        # Create a mock suite with no tests
-        mock_suite = Mock()
-        mock_suite.tests = []  # Empty test list
-        mock_suite.status = "PASS"
-        
-        suite_stats.start_suite(mock_suite)
-        
-        # Should not count empty suites
-        self.assertEqual(suite_stats.total_suite, 0)
-        self.assertEqual(suite_stats.passed_suite, 0)
-        self.assertEqual(suite_stats.failed_suite, 0)
-        self.assertEqual(suite_stats.skipped_suite, 0)
-
-    def test_suite_results_empty_suite(self):
-        """Test SuiteResults with empty suite (no tests)"""
-        mock_db = Mock()
-        suite_results = SuiteResults(mock_db, "123", "False")
-        
-        # Create a mock suite with no tests
-        mock_suite = Mock()
-        mock_suite.tests = []  # Empty test list
-        
-        with patch("robotframework_historic_parser.rfhistoricparser.insert_into_suite_table") as mock_insert:
-            suite_results.start_suite(mock_suite)
-            # Should not insert empty suites
-            mock_insert.assert_not_called()
-
-    def test_suite_results_full_suite_name_true(self):
-        """Test SuiteResults with full_suite_name=True"""
-        mock_db = Mock()
-        suite_results = SuiteResults(mock_db, "123", "True")
-        
-        # Create a mock suite with longname
-        mock_suite = MagicMock()
-        mock_suite.tests = [Mock()]  # Has tests
-        mock_suite.longname = "MyProject.MySuite.MySubSuite"
-        mock_suite.status = "PASS"
-        
-        # Create a simple object to hold statistics
-        class Stats:
-            total = 10
-            passed = 5
-            failed = 3
-            skipped = 2
-        
-        mock_suite.statistics = Stats()
-        mock_suite.elapsedtime = 120000  # 2 minutes in milliseconds
-        
-        with patch("robotframework_historic_parser.rfhistoricparser.insert_into_suite_table") as mock_insert:
-            suite_results.start_suite(mock_suite)
-            # Verify insert was called with the full suite name
-            self.assertTrue(mock_insert.called)
-            # Check that longname was used (first call, argument index 2 is the suite name)
-            call_args = mock_insert.call_args[0]
-            self.assertEqual(call_args[2], "MyProject.MySuite.MySubSuite")
-
-    def test_suite_results_visit_test_full_suite_name_true(self):
-        """Test TestMetrics.visit_test with full_suite_name=True"""
-        from robotframework_historic_parser.rfhistoricparser import TestMetrics
-        
-        mock_db = Mock()
-        test_results = TestMetrics(mock_db, "123", "True")
-        
-        # Create a mock test with longname
-        mock_test = Mock()
-        mock_test.name = "MyTest"
-        mock_test.longname = "MyProject.MySuite.MyTest"
-        mock_test.status = "PASS"
-        mock_test.elapsedtime = 60000  # 1 minute in milliseconds
-        mock_test.message = "Test passed"
-        mock_test.tags = ["tag1", "tag2"]
-        
-        with patch("robotframework_historic_parser.rfhistoricparser.insert_into_test_table"):
-            test_results.visit_test(mock_test)
 
     @patch("mysql.connector.connect")
     def test_insert_into_execution_table_full_coverage(self, mock_connect):
@@ -639,11 +636,7 @@ class TestRFHistoricParser(unittest.TestCase):
         mock_con.cursor.return_value = mock_cursor
         mock_ocon.cursor.return_value = mock_root_cursor
         
-        # Mock the fetchone results
-        mock_cursor.fetchone.side_effect = [
-            (1, 5, 10),  # Execution_Id, Execution_Pass, Execution_Total
-            (100,)  # COUNT(*)
-        ]
+        mock_cursor.lastrowid = 1
         
         result = insert_into_execution_table(
             mock_con, mock_ocon, "Test Execution", 10, 5, 3, "2.5", 
@@ -653,35 +646,169 @@ class TestRFHistoricParser(unittest.TestCase):
         # Verify the execution ID is returned
         self.assertEqual(result, "1")
         
-        # Verify cursor operations
-        mock_cursor.execute.assert_called()
-        mock_con.commit.assert_called_once()
-        mock_root_cursor.execute.assert_called_once()
-        mock_ocon.commit.assert_called_once()
+        # Verify cursor operations, the id comes from lastrowid without further queries
+        mock_cursor.execute.assert_called_once()
+        mock_cursor.fetchone.assert_not_called()
+        # TB_PROJECT is updated by the caller once the execution is written
+        mock_root_cursor.execute.assert_not_called()
+        # the caller commits the whole execution
+        mock_con.commit.assert_not_called()
+        mock_ocon.commit.assert_not_called()
+
+    def test_update_project_table(self):
+        mock_ocon = Mock()
+        update_project_table(mock_ocon, "now", 5, 10, "TestProject")
+        statement, values = mock_ocon.cursor.return_value.execute.call_args.args
+        self.assertIn("UPDATE robothistoric.TB_PROJECT SET", statement)
+        self.assertIn("Total_Executions = COALESCE(Total_Executions, 0) + 1", statement)
+        self.assertEqual(("now", 50.0, "TestProject"), values)
+        mock_ocon.commit.assert_not_called()
+
+    def test_update_project_table_zero_total(self):
+        """Test update_project_table handles division by zero"""
+        mock_ocon = Mock()
+        update_project_table(mock_ocon, "now", 0, 0, "TestProject")
+        self.assertEqual(0, mock_ocon.cursor.return_value.execute.call_args.args[1][1])
 
+    @patch("builtins.print")
     @patch("mysql.connector.connect")
-    def test_insert_into_execution_table_zero_total(self, mock_connect):
-        """Test insert_into_execution_table handles division by zero"""
-        mock_con = Mock()
-        mock_ocon = Mock()
-        mock_cursor = Mock()
-        mock_root_cursor = Mock()
-        
-        mock_con.cursor.return_value = mock_cursor
-        mock_ocon.cursor.return_value = mock_root_cursor
-        
-        # Mock with zero total to test division by zero handling
-        mock_cursor.fetchone.side_effect = [
-            (1, 0, 0),  # Execution_Id, Execution_Pass=0, Execution_Total=0
-            (100,)  # COUNT(*)
-        ]
-        
-        result = insert_into_execution_table(
-            mock_con, mock_ocon, "Test Execution", 0, 0, 0, "0", 
-            0, 0, 0, 0, 0, "TestProject"
+    def test_rfhistoric_parser_updates_project_last(self, mock_conn, mock_print):
+        """The TB_PROJECT row is locked by the last statement before the commit"""
+        opts = MockOpts(
+            ignoreresult="False",
+            output=ROOT_PATH + "/test_files/output_test_rf7.xml",
+            path="",
+            report_type="RF",
+            host="localhost",
+            port=3306,
+            username="superuser",
+            password="passw0rd",
+            projectname="test",
+            executionname="test_executionname",
+            fullsuitename="False",
         )
-        
-        # Verify it doesn't crash and returns the execution ID
-        self.assertEqual(result, "1")
-        mock_con.commit.assert_called_once()
-        mock_ocon.commit.assert_called_once()
+        mock_db = mock_conn.return_value
+        rfhistoric_parser(opts)
+        statements = [c.args[0] for c in mock_db.cursor.return_value.mock_calls
+                      if c[0] in ("execute", "executemany")]
+        project_updates = [i for i, statement in enumerate(statements) if "TB_PROJECT" in statement]
+        test_inserts = [i for i, statement in enumerate(statements)
+                        if statement.startswith("INSERT INTO TB_TEST")]
+        self.assertEqual([len(statements) - 1], project_updates)
+        self.assertTrue(test_inserts)
+        self.assertLess(max(test_inserts), project_updates[0])
+        self.assertEqual([call.start_transaction(), call.commit()],
+                         [c for c in mock_db.mock_calls if c[0] in ("start_transaction", "commit")])
+
+    def test_get_pass_percentage(self):
+        self.assertEqual(33.33, get_pass_percentage(1, 3))
+        self.assertEqual(50.0, get_pass_percentage("5", "10"))
+        self.assertEqual(0, get_pass_percentage(0, 0))
+
+    def test_hash_output_files(self):
+        """Test the content hash depends on contents and report type, not file names"""
+        rf7 = ROOT_PATH + "/test_files/output_test_rf7.xml"
+        rf6 = ROOT_PATH + "/test_files/output_test_rf6.xml"
+        with patch("robotframework_historic_parser.rfhistoricparser.HASH_CHUNK_SIZE", 7):
+            chunked = hash_output_files("RF", [rf7])
+        self.assertEqual(chunked, hash_output_files("rf", [rf7]))
+        self.assertNotEqual(chunked, hash_output_files("JUnit", [rf7]))
+        self.assertNotEqual(chunked, hash_output_files("RF", [rf6]))
+        self.assertNotEqual(hash_output_files("RF", [rf7, rf6]),
+                            hash_output_files("RF", [rf6, rf7]))
+
+    def test_check_ingestion_disabled(self):
+        """Test duplicates are only looked up when asked for"""
+        mock_db = Mock()
+        opts = MockOpts(report_type="RF")
+        self.assertIsNone(check_ingestion(mock_db, opts, []))
+        mock_db.cursor.assert_not_called()
+
+    def test_check_ingestion_creates_table(self):
+        """Test the first lookup in a project database creates TB_INGESTION"""
+        mock_db = Mock()
+        cursor = mock_db.cursor.return_value
+        cursor.execute.side_effect = [
+            ProgrammingError("Table 'TB_INGESTION' doesn't exist", errno=1146), None]
+        opts = MockOpts(report_type="RF", skip_duplicates="True")
+        ingestion = check_ingestion(mock_db, opts, [ROOT_PATH + "/test_files/output_test_rf7.xml"])
+        self.assertFalse(ingestion.skip)
+        self.assertIn("CREATE TABLE IF NOT EXISTS TB_INGESTION", cursor.execute.call_args.args[0])
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_called_once()
+
+    def test_check_ingestion_lookup_error(self):
+        """Test lookup errors other than a missing table are raised, not taken as a new table"""
+        mock_db = Mock()
+        cursor = mock_db.cursor.return_value
+        cursor.execute.side_effect = OperationalError("Lost connection to MySQL server", errno=2013)
+        opts = MockOpts(report_type="RF", skip_duplicates="True")
+        with self.assertRaises(OperationalError):
+            check_ingestion(mock_db, opts, [ROOT_PATH + "/test_files/output_test_rf7.xml"])
+        self.assertEqual(1, cursor.execute.call_count)
+
+    def test_batch_writer_flushes_at_batch_size(self):
+        """Test BatchWriter sends one executemany per full batch"""
+        mock_db = Mock()
+        writer = BatchWriter(mock_db, 2)
+        for index in range(5):
+            insert_into_test_table(writer, "1", "Test %s" % index, "PASS", 0.0, "", "[]")
+
+        mock_db.cursor.assert_called_once()
+        cursor = mock_db.cursor.return_value
+        self.assertEqual(2, cursor.executemany.call_count)
+        self.assertEqual(TEST_INSERT_SQL, cursor.executemany.call_args_list[0].args[0])
+        self.assertEqual(2, len(cursor.executemany.call_args_list[0].args[1]))
+
+        writer.close()
+        self.assertEqual(3, cursor.executemany.call_count)
+        self.assertEqual([("1", "Test 4", "PASS", 0.0, "", "[]")],
+                         cursor.executemany.call_args.args[1])
+        cursor.close.assert_called_once()
+
+    def test_batch_writer_prepared(self):
+        """Test prepared BatchWriter binds full batches to one multi-row statement"""
+        mock_db = Mock()
+        writer = BatchWriter(mock_db, 2, prepared=True)
+        for index in range(5):
+            insert_into_test_table(writer, "1", "Test %s" % index, "PASS", 0.0, "", "[]")
+        writer.close()
+
+        cursor = mock_db.cursor.return_value
+        self.assertEqual([call(prepared=True), call(prepared=True)], mock_db.cursor.call_args_list)
+        cursor.executemany.assert_not_called()
+        statements = [execute.args[0] for execute in cursor.execute.call_args_list]
+        self.assertEqual([TEST_INSERT_SQL + ", (%s, %s, %s, %s, %s, %s)"] * 2 + [TEST_INSERT_SQL],
+                         statements)
+        # the same statement object is reused so it is only prepared once
+        self.assertIs(statements[0], statements[1])
+        self.assertEqual(["1", "Test 4", "PASS", 0.0, "", "[]"], cursor.execute.call_args.args[1])
+        self.assertEqual(2, cursor.close.call_count)
+
+    @patch("robotframework_historic_parser.rfhistoricparser.MAX_PREPARED_PARAMETERS", 12)
+    def test_batch_writer_prepared_parameter_limit(self):
+        """Test prepared BatchWriter splits batches above the placeholder limit"""
+        mock_db = Mock()
+        writer = BatchWriter(mock_db, 5, prepared=True)
+        for index in range(5):
+            insert_into_test_table(writer, "1", "Test %s" % index, "PASS", 0.0, "", "[]")
+        cursor = mock_db.cursor.return_value
+        self.assertEqual([12, 12, 6], [len(execute.args[1])
+                                       for execute in cursor.execute.call_args_list])
+
+    def test_batch_writer_keeps_statements_separate(self):
+        """Test BatchWriter buffers suite and test rows independently"""
+        mock_db = Mock()
+        writer = BatchWriter(mock_db, 100)
+        insert_into_suite_table(writer, "1", "Suite", "PASS", 1, 1, 0, 0.0, 0)
+        insert_into_test_table(writer, "1", "Suite - Test", "PASS", 0.0, "", "[]")
+        cursor = mock_db.cursor.return_value
+        cursor.executemany.assert_not_called()
+
+        writer.flush()
+        self.assertEqual(
+            [call(SUITE_INSERT_SQL, [("1", "Suite", "PASS", 1, 1, 0, 0.0, 0)]),
+             call(TEST_INSERT_SQL, [("1", "Suite - Test", "PASS", 0.0, "", "[]")])],
+            cursor.executemany.call_args_list)
+        writer.flush()
+        self.assertEqual(2, cursor.executemany.call_count)
@@ -0,0 +1,49 @@
+"""Unit tests for the test message sanitizer"""
+import re
+import unittest
+from argparse import Namespace
+
+from robotframework_historic_parser.sanitizer import MessageSanitizer, create_message_sanitizer
+
+
+class TestSanitizer(unittest.TestCase):
+    """Unit Tests for sanitizer.py"""
+
+    def test_matches_regular_expression(self):
+        """The default sanitizer removes what the former re.sub removed"""
+        sanitize = MessageSanitizer()
+        message = "Traceback:\n  File \"x.py\", line 1\tÄö ✓ _x_ [1, 2] != {'a': 3}\x00"
+        self.assertEqual(re.sub(r'[^a-zA-Z0-9 ]', '', message), sanitize(message))
+
+    def test_keep_unicode(self):
+        """Letters and digits of other scripts are kept on request"""
+        sanitize = MessageSanitizer(keep_unicode="True")
+        self.assertEqual("Ünïcode  テスト 失敗 ٣", sanitize("Ünïcode ✓ テスト: 失敗! ٣_"))
+        self.assertEqual("plain ascii", sanitize("plain, ascii!"))
+
+    def test_max_length(self):
+        """Messages are cut to max_length characters after cleaning"""
+        sanitize = MessageSanitizer(max_length=5)
+        self.assertEqual("abcde", sanitize("a.b.c.d.e.f.g.h"))
+        self.assertEqual("abc", sanitize("a!b!c"))
+        self.assertEqual("", sanitize("!!!!!!!!!!!!"))
+        self.assertEqual("ab", sanitize("!!!!!!!!ab!!"))
+
+    def test_max_length_long_message(self):
+        """Cutting long messages keeps the same characters as cleaning them whole"""
+        message = "Error: value 'x' != 'y'\n" * 5000
+        for length in (1, 7, 100, 4096):
+            expected = MessageSanitizer()(message)[:length]
+            self.assertEqual(expected, MessageSanitizer(max_length=length)(message))
+
+    def test_no_limit(self):
+        """A max_length of 0 keeps the whole message"""
+        message = "x" * 100000
+        self.assertEqual(message, MessageSanitizer(max_length=0)(message))
+
+    def test_create_message_sanitizer(self):
+        """Options configure the sanitizer, missing ones keep the defaults"""
+        sanitize = create_message_sanitizer(Namespace(max_error_length="3", keep_unicode="True"))
+        self.assertEqual("Äöü", sanitize("Ä-ö-ü-ß"))
+        sanitize = create_message_sanitizer(Namespace())
+        self.assertEqual("abc", sanitize("Äa-b-c"))
@@ -0,0 +1,211 @@
+"""Unit tests for the Robot Framework Historic Parser ingestion service"""
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from argparse import Namespace
+from unittest.mock import MagicMock, patch
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from mysql.connector.errors import PoolError
+
+from robotframework_historic_parser.rfhistoricparser import close_connection_pools
+from robotframework_historic_parser.server import IngestionService, create_server, serve
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+
+
+def make_opts(**kwargs):
+    options = dict(host='localhost', port=3306, username='superuser', password='passw0rd',
+                   projectname='project', executionname='execution', path='.',
+                   output='output.xml', report_type='RF', ignoreresult='False',
+                   fullsuitename='False', serve_host='127.0.0.1', serve_port=0, queue_size=2)
+    options.update(kwargs)
+    return Namespace(**options)
+
+
+class SingleConnectionPool:
+    """Pool holding one connection, exhausted until that connection is closed"""
+
+    def __init__(self, **config):
+        self.borrowed = False
+
+    def get_connection(self):
+        if self.borrowed:
+            raise PoolError("Failed getting connection; pool exhausted")
+        self.borrowed = True
+        connection = MagicMock()
+        connection.close.side_effect = self.release
+        return connection
+
+    def release(self):
+        self.borrowed = False
+
+    def _remove_connections(self):
+        pass
+
+
+def wait_for(service, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = service.status(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job %s did not finish" % job_id)
+
+
+class TestIngestionService(unittest.TestCase):
+    """Unit Tests for IngestionService"""
+
+    @patch('robotframework_historic_parser.server.rfhistoric_parser')
+    def test_submit_runs_job_with_pooled_options(self, parser_mock):
+        """Jobs use the serve options, the upload overrides and pooled connections"""
+        service = IngestionService(make_opts())
+        service.start()
+        job_id = service.submit({"output": "nightly.xml", "projectname": "other"})
+        job = wait_for(service, job_id)
+        service.stop()
+
+        self.assertEqual("done", job["status"])
+        opts = parser_mock.call_args.args[0]
+        self.assertEqual("nightly.xml", opts.output)
+        self.assertEqual("other", opts.projectname)
+        self.assertEqual("execution", opts.executionname)
+        self.assertEqual("True", opts.pool)
+
+    @patch('robotframework_historic_parser.server.rfhistoric_parser')
+    def test_failed_job_keeps_error(self, parser_mock):
+        """Exits and errors of a job are reported instead of stopping the worker"""
+        parser_mock.side_effect = [SystemExit("output.xml file is missing: x.xml"),
+                                   RuntimeError("lost connection"), None]
+        service = IngestionService(make_opts())
+        service.start()
+        jobs = [wait_for(service, service.submit({"output": name}))
+                for name in ("x.xml", "y.xml", "z.xml")]
+        service.stop()
+
+        self.assertEqual("output.xml file is missing: x.xml", jobs[0]["error"])
+        self.assertEqual("lost connection", jobs[1]["error"])
+        self.assertEqual("done", jobs[2]["status"])
+
+    @patch('mysql.connector.pooling.MySQLConnectionPool', SingleConnectionPool)
+    def test_failed_job_returns_connection(self):
+        """A job failing while it parses gives its pooled connection back for the next job"""
+        workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, workdir)
+        with open(os.path.join(workdir, "truncated.xml"), "w") as f:
+            f.write("<robot><suite name='cut'>")
+        shutil.copy(ROOT_PATH + "/test_files/output_test_rf7.xml", workdir)
+        service = IngestionService(make_opts(path=workdir, pool_size=1))
+        service.start()
+        with patch('builtins.print'):
+            jobs = [wait_for(service, service.submit({"output": output, "engine": engine}))
+                    for output, engine in (("truncated.xml", "rf"), ("truncated.xml", "stream"),
+                                           ("output_test_rf7.xml", "stream"))]
+        service.stop()
+        close_connection_pools()
+
+        self.assertEqual(["failed", "failed", "done"], [job["status"] for job in jobs])
+
+    def test_submit_rejects_unknown_options(self):
+        """Connection settings cannot be changed per upload"""
+        service = IngestionService(make_opts())
+        with self.assertRaisesRegex(ValueError, "unsupported options: password"):
+            service.submit({"password": "secret"})
+
+    def test_submit_full_queue(self):
+        """Uploads beyond the queue size are rejected"""
+        service = IngestionService(make_opts(), queue_size=1)
+        service.submit({})
+        with self.assertRaises(queue.Full):
+            service.submit({})
+        self.assertIsNone(service.status("2"))
+
+
+class TestServe(unittest.TestCase):
+    """Unit Tests for serve"""
+
+    @patch('robotframework_historic_parser.server.create_server')
+    @patch('robotframework_historic_parser.server.importlib')
+    def test_serve_loads_job_modules_first(self, importlib_mock, create_mock):
+        """The parsers and the MySQL driver are loaded before uploads are accepted"""
+        server = create_mock.return_value
+        server.server_address = ("127.0.0.1", 8765)
+        server.serve_forever.side_effect = KeyboardInterrupt
+        loaded = []
+        create_mock.side_effect = lambda opts: loaded.append(
+            importlib_mock.import_module.call_count) or server
+        with patch('builtins.print'):
+            serve(make_opts())
+        self.assertEqual(['.resultparser', '.streamparser', '.junitparser',
+                          'mysql.connector.pooling'],
+                         [call.args[0] for call in importlib_mock.import_module.call_args_list])
+        # every module was imported before the server was created
+        self.assertEqual([4], loaded)
+        server.service.stop.assert_called_once()
+
+
+class TestIngestionHandler(unittest.TestCase):
+    """Unit Tests for the HTTP front end"""
+
+    def setUp(self):
+        patcher = patch('robotframework_historic_parser.server.rfhistoric_parser')
+        self.parser_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = create_server(make_opts())
+        self.server.service.start()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.base_url = "http://127.0.0.1:%s" % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.service.stop()
+
+    def request(self, path, data=None):
+        try:
+            with urlopen(Request(self.base_url + path, data=data), timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_ingest(self):
+        """POST /ingest queues a job for the given options"""
+        code, body = self.request("/ingest", json.dumps({"output": "a.xml"}).encode())
+        self.assertEqual(202, code)
+        wait_for(self.server.service, body["id"])
+        code, job = self.request("/jobs/" + body["id"])
+        self.assertEqual((200, "done", "a.xml"), (code, job["status"], job["output"]))
+
+    def test_upload(self):
+        """POST /upload stores the body and removes it after ingestion"""
+        seen = {}
+
+        def parse(opts):
+            filename = os.path.join(opts.path, opts.output)
+            with open(filename) as f:
+                seen["content"] = f.read()
+            seen["path"] = opts.path
+        self.parser_mock.side_effect = parse
+
+        code, body = self.request("/upload?filename=../out.xml&executionname=run", b"<robot/>")
+        self.assertEqual(202, code)
+        wait_for(self.server.service, body["id"])
+        self.assertEqual("<robot/>", seen["content"])
+        self.assertFalse(os.path.exists(seen["path"]))
+        self.assertEqual("run", self.parser_mock.call_args.args[0].executionname)
+
+    def test_bad_requests(self):
+        """Invalid requests are answered with an error"""
+        self.assertEqual(400, self.request("/ingest", b"[1, 2]")[0])
+        self.assertEqual(400, self.request("/ingest", b'{"host": "elsewhere"}')[0])
+        self.assertEqual(404, self.request("/jobs/999")[0])
+        self.assertEqual(404, self.request("/unknown")[0])
+        self.assertEqual((200, {"status": "ok"}), self.request("/health"))
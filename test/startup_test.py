@@ -0,0 +1,96 @@
+"""Startup time benchmark of the rfhistoricparser command per report type"""
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+FILES_PATH = os.path.join(ROOT_PATH, "test_files")
+
+# Runs the console script in a fresh interpreter with the database calls stubbed and
+# reports how long importing and dispatching took and which heavy modules were loaded.
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from robotframework_historic_parser import parserargs, rfhistoricparser
+
+class Connection:
+    def close(self):
+        pass
+    def start_transaction(self):
+        pass
+    def commit(self):
+        pass
+    def rollback(self):
+        pass
+    def fetchone(self):
+        return None
+    def cursor(self, prepared=False):
+        return self
+    def execute(self, sql, params=()):
+        pass
+    def executemany(self, sql, rows):
+        pass
+
+rfhistoricparser.connect_to_project_db = lambda opts: Connection()
+rfhistoricparser.insert_into_execution_table = lambda *args: "1"
+sys.argv[1:] = json.loads(sys.argv[1])
+parserargs.main()
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed,
+                  "robot": "robot" in sys.modules,
+                  "mysql": "mysql" in sys.modules}))
+"""
+
+# Generous budgets in seconds, they catch heavy imports creeping back onto a path
+STARTUP_BUDGETS = {
+    "ignoreresult": 0.5,
+    "JUnit": 0.5,
+    "Allure": 0.5,
+    "Statistics": 0.5,
+    "RF stream": 0.75,
+    "RF": 3.0,
+}
+
+
+def measure_startup(args):
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, json.dumps(args)],
+                            check=True, capture_output=True, text=True,
+                            cwd=os.path.dirname(ROOT_PATH)).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+class TestStartup(unittest.TestCase):
+    """Startup time and import checks for every report type"""
+
+    def assert_startup(self, name, args, robot_loaded):
+        startup = measure_startup(args)
+        self.assertLess(startup["elapsed"], STARTUP_BUDGETS[name],
+                        "%s startup took %.3fs" % (name, startup["elapsed"]))
+        self.assertEqual(robot_loaded, startup["robot"], name)
+        self.assertFalse(startup["mysql"], name)
+
+    def test_startup_ignoreresult(self):
+        self.assert_startup("ignoreresult", ["-g", "True"], False)
+
+    def test_startup_junit(self):
+        self.assert_startup("JUnit", ["--report_type", "JUnit", "-o",
+                                      os.path.join(FILES_PATH, "junit_test.xml")], False)
+
+    def test_startup_allure(self):
+        self.assert_startup("Allure", ["--report_type", "Allure", "-o",
+                                       os.path.join(FILES_PATH, "allure_summary_test.json")],
+                            False)
+
+    def test_startup_statistics(self):
+        self.assert_startup("Statistics", ["--report_type", "Statistics", "-o",
+                                           os.path.join(FILES_PATH, "statistics_test.json")],
+                            False)
+
+    def test_startup_rf_stream(self):
+        self.assert_startup("RF stream", ["--engine", "stream", "-i", FILES_PATH,
+                                          "-o", "output_test_rf7.xml"], False)
+
+    def test_startup_rf(self):
+        self.assert_startup("RF", ["-i", FILES_PATH, "-o", "output_test_rf7.xml"], True)
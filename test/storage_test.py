@@ -0,0 +1,148 @@
+"""Unit tests for the storage backends of Robot Framework Historic Parser"""
+import os
+import sqlite3
+import tempfile
+import unittest
+from argparse import Namespace
+from unittest.mock import patch
+
+from robotframework_historic_parser.rfhistoricparser import rfhistoric_parser
+from robotframework_historic_parser.storage import (
+    get_backend,
+    translate_sql,
+    MySQLBackend,
+    SQLiteBackend,
+    SQLiteConnection,
+)
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+
+
+class TestStorage(unittest.TestCase):
+    """Unit Tests for storage.py"""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        self.database_file = os.path.join(self.workdir.name, "historic.db")
+
+    def make_opts(self, **kwargs):
+        options = dict(ignoreresult="False", path=ROOT_PATH + "/test_files",
+                       output="output_test_rf7.xml", report_type="RF", backend="sqlite",
+                       database_file=self.database_file, projectname="project",
+                       executionname="nightly", fullsuitename="False")
+        options.update(kwargs)
+        return Namespace(**options)
+
+    def query(self, sql):
+        with sqlite3.connect(self.database_file) as connection:
+            return connection.execute(sql).fetchall()
+
+    def test_get_backend(self):
+        """Backends are looked up by name with MySQL as the default"""
+        self.assertIsInstance(get_backend("sqlite"), SQLiteBackend)
+        self.assertIsInstance(get_backend("mysql"), MySQLBackend)
+        self.assertIsInstance(get_backend(None), MySQLBackend)
+
+    @patch("robotframework_historic_parser.rfhistoricparser.connect_to_project_mysql_db")
+    def test_mysql_backend(self, connect_mock):
+        """The MySQL backend uses the existing connection functions"""
+        opts = self.make_opts(backend="mysql")
+        self.assertIs(connect_mock.return_value, MySQLBackend().connect(opts))
+        connect_mock.assert_called_once_with(opts)
+
+    def test_translate_sql(self):
+        """MySQL placeholders and the robothistoric prefix are translated"""
+        self.assertEqual("UPDATE TB_PROJECT SET Total_Executions = ? WHERE Project_Name = ?",
+                         translate_sql("UPDATE robothistoric.TB_PROJECT SET Total_Executions "
+                                       "= %s WHERE Project_Name = %s"))
+
+    def test_sqlite_connection_creates_schema(self):
+        """The SQLite file is created in WAL mode with the project registered"""
+        connection = SQLiteConnection(self.database_file, "project")
+        connection.close()
+        SQLiteConnection(self.database_file, "project").close()
+        self.assertEqual([("project", 0)],
+                         self.query("SELECT Project_Name, Total_Executions FROM TB_PROJECT"))
+        self.assertEqual([("wal",)], self.query("PRAGMA journal_mode"))
+
+    def test_rfhistoric_parser_sqlite(self):
+        """RF results are ingested into the SQLite file"""
+        with patch("builtins.print"):
+            rfhistoric_parser(self.make_opts())
+            rfhistoric_parser(self.make_opts(engine="stream", executionname="second"))
+
+        self.assertEqual([(1, "nightly", 3, 1, 1, 1, 1), (2, "second", 3, 1, 1, 1, 1)],
+                         self.query("SELECT Execution_Id, Execution_Desc, Execution_Total, "
+                                    "Execution_Pass, Execution_Fail, Execution_Skip, "
+                                    "Execution_STotal FROM TB_EXECUTION"))
+        self.assertEqual([(1, "RFH Parser Test", "FAIL", 3), (2, "RFH Parser Test", "FAIL", 3)],
+                         self.query("SELECT Execution_Id, Suite_Name, Suite_Status, Suite_Total "
+                                    "FROM TB_SUITE"))
+        self.assertEqual(6, self.query("SELECT COUNT(*) FROM TB_TEST")[0][0])
+        self.assertEqual([("RFH Parser Test - Failing Test Case", "Goodbye World", "[]")],
+                         self.query("SELECT Test_Name, Test_Error, Test_Tag FROM TB_TEST "
+                                    "WHERE Test_Status = 'FAIL' AND Execution_Id = 2"))
+        self.assertEqual([(2, 33.33)],
+                         self.query("SELECT Total_Executions, Recent_Pass_Perc FROM TB_PROJECT"))
+
+    def test_rfhistoric_parser_sqlite_default_file(self):
+        """The SQLite file defaults to <projectname>.db in the working directory"""
+        cwd = os.getcwd()
+        os.chdir(self.workdir.name)
+        self.addCleanup(os.chdir, cwd)
+        with patch("builtins.print"):
+            rfhistoric_parser(self.make_opts(database_file=None, report_type="Statistics",
+                                             output=ROOT_PATH + "/test_files/statistics_test.json"))
+        self.assertTrue(os.path.exists(os.path.join(self.workdir.name, "project.db")))
+
+    def test_rfhistoric_parser_sqlite_rolls_back(self):
+        """A failed ingestion leaves no partial execution in the SQLite file"""
+        with patch("builtins.print"), \
+                patch("robotframework_historic_parser.rfhistoricparser.insert_into_test_table",
+                      side_effect=RuntimeError("failed")):
+            with self.assertRaises(RuntimeError):
+                rfhistoric_parser(self.make_opts(engine="stream"))
+        self.assertEqual([(0,)], self.query("SELECT COUNT(*) FROM TB_EXECUTION"))
+        self.assertEqual([(0,)], self.query("SELECT COUNT(*) FROM TB_SUITE"))
+        self.assertEqual([(0,)], self.query("SELECT Total_Executions FROM TB_PROJECT"))
+
+    def test_rfhistoric_parser_sqlite_skips_duplicates(self):
+        """Ingesting the same file again is skipped before parsing"""
+        with patch("builtins.print"):
+            rfhistoric_parser(self.make_opts(skip_duplicates="True"))
+        with patch("builtins.print") as mock_print, \
+                patch("robotframework_historic_parser.rfhistoricparser.parse_output_files") \
+                as mock_parse:
+            rfhistoric_parser(self.make_opts(skip_duplicates="True", executionname="retry"))
+        mock_parse.assert_not_called()
+        self.assertIn("already ingested as execution 1", mock_print.call_args.args[0])
+        self.assertEqual([(1, "nightly")],
+                         self.query("SELECT Execution_Id, Execution_Desc FROM TB_EXECUTION"))
+        self.assertEqual([(1,)], self.query("SELECT Total_Executions FROM TB_PROJECT"))
+
+    def test_rfhistoric_parser_sqlite_replace(self):
+        """--replace swaps the earlier execution for a new one"""
+        with patch("builtins.print"):
+            rfhistoric_parser(self.make_opts(skip_duplicates="True"))
+            rfhistoric_parser(self.make_opts(replace="True", executionname="retry",
+                                             pipeline="True"))
+        self.assertEqual([(2, "retry")],
+                         self.query("SELECT Execution_Id, Execution_Desc FROM TB_EXECUTION"))
+        self.assertEqual([(2, 1)], self.query("SELECT DISTINCT Execution_Id, COUNT(*) "
+                                              "FROM TB_SUITE"))
+        self.assertEqual([(2, 3)], self.query("SELECT DISTINCT Execution_Id, COUNT(*) "
+                                              "FROM TB_TEST"))
+        self.assertEqual([(2, "RF")], self.query("SELECT Execution_Id, Report_Type "
+                                                 "FROM TB_INGESTION"))
+        self.assertEqual([(1,)], self.query("SELECT Total_Executions FROM TB_PROJECT"))
+
+    def test_process_report_sqlite_skips_duplicates(self):
+        """Other report types are recognised by content and report type as well"""
+        opts = self.make_opts(skip_duplicates="True", report_type="Statistics",
+                              output=ROOT_PATH + "/test_files/statistics_test.json")
+        with patch("builtins.print"):
+            rfhistoric_parser(opts)
+            rfhistoric_parser(opts)
+        self.assertEqual([(1,)], self.query("SELECT COUNT(*) FROM TB_EXECUTION"))
+        self.assertEqual([(1,)], self.query("SELECT COUNT(*) FROM TB_INGESTION"))
@@ -0,0 +1,90 @@
+"""Unit tests for the streaming output.xml parser"""
+import io
+import os
+import unittest
+import xml.etree.ElementTree as ET
+
+from robotframework_historic_parser.streamparser import (
+    parse_output_stream,
+    get_elapsed_millis,
+    normalize_tags,
+)
+
+ROOT_PATH = os.path.abspath(os.path.dirname(__file__))
+
+NESTED_OUTPUT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<robot generator="Robot 7.0" rpa="false" schemaversion="5">
+<suite id="s1" name="Top">
+<suite id="s1-s1" name="Child">
+<test id="s1-s1-t1" name="First">
+<kw name="Log"><msg level="INFO">hello</msg><status status="PASS" elapsed="0.5"/></kw>
+<tag>smoke</tag>
+<tag>Smoke</tag>
+<tag>A_tag</tag>
+<status status="FAIL" start="2024-01-31T07:40:17.000000" elapsed="1.250">Boom!</status>
+</test>
+<status status="FAIL" elapsed="2.0"/>
+</suite>
+<test id="s1-t1" name="Second">
+<status status="PASS" elapsed="0.5"/>
+</test>
+<status status="FAIL" elapsed="3.0"/>
+</suite>
+<statistics>
+<suite><stat pass="1" fail="1" skip="0" id="s1" name="Top">Top</stat></suite>
+</statistics>
+</robot>
+"""
+
+
+class TestStreamParser(unittest.TestCase):
+    """Unit Tests for streamparser.py"""
+
+    def test_parse_rf7_output(self):
+        """Streaming engine reads suite and test rows of an RF 7 output"""
+        records = parse_output_stream(ROOT_PATH + "/test_files/output_test_rf7.xml")
+        self.assertEqual("RFH Parser Test", records.name)
+        self.assertEqual(58, records.elapsedtime)
+        self.assertEqual([("RFH Parser Test", "FAIL", 3, 1, 1, 58, 1)], records.suites)
+        self.assertEqual(("RFH Parser Test - Failing Test Case", "FAIL", 1, "Goodbye World!", ()),
+                         records.tests[1])
+        self.assertEqual((3, 1, 1, 1), records.test_totals())
+        self.assertEqual((1, 0, 1, 0), records.suite_totals())
+
+    def test_parse_rf6_output(self):
+        """Streaming engine reads starttime/endtime based RF 6 outputs"""
+        records = parse_output_stream(ROOT_PATH + "/test_files/output_test_rf6.xml")
+        self.assertEqual(162, records.elapsedtime)
+        self.assertEqual([("RFH Parser Test", "FAIL", 3, 1, 1, 162, 1)], records.suites)
+        self.assertEqual("Skip this world!", records.tests[2][3])
+
+    def test_parse_empty_output(self):
+        """Suites without tests are not recorded"""
+        records = parse_output_stream(ROOT_PATH + "/test_files/empty.xml")
+        self.assertEqual([], records.suites)
+        self.assertEqual([], records.tests)
+        self.assertEqual("WorkOrder", records.name)
+
+    def test_parse_nested_suites(self):
+        """Suite statistics include tests of child suites"""
+        records = parse_output_stream(io.BytesIO(NESTED_OUTPUT))
+        self.assertEqual([("Child", "FAIL", 1, 0, 1, 2000, 0),
+                          ("Top", "FAIL", 2, 1, 1, 3000, 0)], records.suites)
+        self.assertEqual([("Child - First", "FAIL", 1250, "Boom!", ("A_tag", "smoke")),
+                          ("Top - Second", "PASS", 500, "", ())], records.tests)
+
+    def test_parse_nested_suites_full_suite_name(self):
+        """Full suite names are built from the parent suites"""
+        records = parse_output_stream(io.BytesIO(NESTED_OUTPUT), "True")
+        self.assertEqual(["Top.Child", "Top"], [suite[0] for suite in records.suites])
+        self.assertEqual(["Top.Child - First", "Top - Second"],
+                         [test[0] for test in records.tests])
+
+    def test_get_elapsed_millis_not_available(self):
+        """Statuses without times have no elapsed time"""
+        status = ET.fromstring('<status status="FAIL" starttime="N/A" endtime="N/A"/>')
+        self.assertEqual(0, get_elapsed_millis(status))
+
+    def test_normalize_tags(self):
+        """Tags are de-duplicated and sorted ignoring case, spaces and underscores"""
+        self.assertEqual(["A", "b"], normalize_tags(["b", "A", "a_", "", "NONE"]))